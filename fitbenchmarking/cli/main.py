@@ -18,8 +18,11 @@ import fitbenchmarking
 from fitbenchmarking.cli.exception_handler import exception_handler
 from fitbenchmarking.core.fitting_benchmarking import fitbenchmark_group
 from fitbenchmarking.core.results_output import save_results
+from fitbenchmarking.parsing.expression_compiler import configure_plan_cache
+from fitbenchmarking.utils.checkpoint import Checkpoint
 from fitbenchmarking.utils.exceptions import OptionsError
 from fitbenchmarking.utils.options import Options
+from fitbenchmarking.utils.result_cache import ResultCache
 
 
 def get_parser():
@@ -34,7 +37,8 @@ def get_parser():
 
     $ fitbenchmarking examples/benchmark_problems/NIST/*
     $ fitbenchmarking -o examples/myoptions.ini \
-examples/benchmark_problems/simple_tests examples/benchmark_problems/Muon '''
+examples/benchmark_problems/simple_tests examples/benchmark_problems/Muon
+    $ fitbenchmarking --resume examples/benchmark_problems/NIST/* '''
 
     parser = argparse.ArgumentParser(
         prog='FitBenchmarking', add_help=True, epilog=epilog,
@@ -44,6 +48,14 @@ examples/benchmark_problems/simple_tests examples/benchmark_problems/Muon '''
                         metavar='OPTIONS_FILE',
                         default='',
                         help='The path to a %(prog)s options file')
+    parser.add_argument('-r', '--resume',
+                        action='store_true',
+                        help='Continue an interrupted run, reusing the fits '
+                             'recorded in its checkpoint file.')
+    parser.add_argument('--recompute',
+                        action='store_true',
+                        help='Run every fit, ignoring the results cached by '
+                             'previous runs.')
     parser.add_argument('problem_sets',
                         nargs='+',
                         help='Paths to directories containing problem sets.')
@@ -51,7 +63,7 @@ examples/benchmark_problems/simple_tests examples/benchmark_problems/Muon '''
     return parser
 
 @exception_handler
-def run(problem_sets, options_file=''):
+def run(problem_sets, options_file='', resume=False, recompute=False):
     """
     Run benchmarking for the problems sets and options file given.
     Opens a webbrowser to the results_index after fitting.
@@ -60,6 +72,12 @@ def run(problem_sets, options_file=''):
     :type problem_sets: list of str
     :param options_file: he path to an options file, defaults to ''
     :type options_file: str, optional
+    :param resume: Whether to reuse the fits recorded in the checkpoint file
+                   by a previous run, defaults to False
+    :type resume: bool, optional
+    :param recompute: Whether to run all fits even if the results are
+                      cached, defaults to False
+    :type recompute: bool, optional
     """
     # Find the options file
     current_path = os.path.abspath(os.path.curdir)
@@ -74,6 +92,20 @@ def run(problem_sets, options_file=''):
             options = Options(glob_options_file)
     else:
         options = Options()
+
+    checkpoint = Checkpoint(
+        file_name=os.path.join(options.results_dir, options.checkpoint_file),
+        resume=resume)
+
+    cache = None
+    if options.use_cache:
+        cache = ResultCache(
+            cache_dir=os.path.join(options.results_dir, options.cache_dir),
+            max_size=options.max_cache_size,
+            max_age=options.max_cache_age,
+            force_recompute=recompute)
+    configure_plan_cache(options)
+
     groups = []
     result_dir = []
     for sub_dir in problem_sets:
@@ -99,7 +131,9 @@ def run(problem_sets, options_file=''):
             label))
         results = fitbenchmark_group(group_name=label,
                                      options=options,
-                                     data_dir=data_dir)
+                                     data_dir=data_dir,
+                                     checkpoint=checkpoint,
+                                     cache=cache)
         print('\nProducing output for the {} problem set\n'.format(label))
         # Display the runtime and accuracy results in a table
         group_results_dir = save_results(group_name=label,
@@ -129,6 +163,9 @@ def run(problem_sets, options_file=''):
             groups=groups,
             group_link=group_links,
             zip=zip))
+    if cache is not None:
+        cache.evict()
+
     webbrowser.open_new(output_file)
 
 
@@ -144,7 +181,8 @@ def main():
 
     args = parser.parse_args(sys.argv[1:])
 
-    run(problem_sets=args.problem_sets, options_file=args.options_file)
+    run(problem_sets=args.problem_sets, options_file=args.options_file,
+        resume=args.resume, recompute=args.recompute)
 
 
 if __name__ == '__main__':
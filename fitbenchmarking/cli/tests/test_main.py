@@ -52,3 +52,19 @@ class TestMain(unittest.TestCase):
 
         self.assertEqual(args.options_file, options_file)
         self.assertEqual(args.problem_sets, problem_sets)
+        self.assertFalse(args.resume)
+        self.assertFalse(args.recompute)
+
+    def test_arg_parse_resume(self):
+        parser = main.get_parser()
+
+        args = parser.parse_args(['--resume', 'problems_1'])
+
+        self.assertTrue(args.resume)
+
+    def test_arg_parse_recompute(self):
+        parser = main.get_parser()
+
+        args = parser.parse_args(['--recompute', 'problems_1'])
+
+        self.assertTrue(args.recompute)
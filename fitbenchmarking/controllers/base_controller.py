@@ -70,6 +70,15 @@ class Controller:
             raise ControllerAttributeError('Either minimizer or parameter_set '
                                            'is set to None.')
 
+    def set_options(self, options):
+        """
+        Apply the options which change how the software is run.
+        By default there are none.
+
+        :param options: all the information specified by the user
+        :type options: fitbenchmarking.utils.options.Options
+        """
+
     def eval_chisq(self, params, x=None, y=None, e=None):
         """
         Computes the chisq value
@@ -104,7 +113,7 @@ class Controller:
                     'Attribute "{}" in the controller is not the expected '
                     'type. Expected "{}", got {}.'.format(
                         attr_name, attr_type, type(attr)))
-            valid_flags = [0, 1, 2, 3]
+            valid_flags = [0, 1, 2, 3, 4]
             if attr_name == 'flag' and attr not in valid_flags:
                 raise ControllerAttributeError(
                     'Attribute "flag" in the controller must be one of {}.'
@@ -9,9 +9,8 @@ import numpy as np
 from pygsl import multifit_nlin, multiminimize, errno
 from pygsl import _numobj as numx
 
-from scipy.optimize._numdiff import approx_derivative
-
 from fitbenchmarking.controllers.base_controller import Controller
+from fitbenchmarking.parsing.finite_difference import approx_jacobian
 from fitbenchmarking.utils.exceptions import UnknownMinimizerError
 
 
@@ -30,6 +29,7 @@ class GSLController(Controller):
         super(GSLController, self).__init__(problem)
 
         self._solver = None
+        self._residuals = None
         self._residual_methods = None
         self._function_methods_no_jac = None
         self._function_methods_with_jac = None
@@ -49,7 +49,7 @@ class GSLController(Controller):
         :return: result from problem.eval_r
         :rtype: numpy array
         """
-        return self.problem.eval_r(p)
+        return self.problem.eval_r(p, out=self._residuals)
 
     def _jac(self, p, data=None):
         """
@@ -75,8 +75,8 @@ class GSLController(Controller):
         :return: result from problem.eval_r and eval_j
         :rtype: (numpy array, numpy array)
         """
-        f = self.problem.eval_r(p)
-        df = self.problem.eval_j(p)
+        f = self.problem.eval_r(p, out=self._residuals)
+        df = self.problem.eval_j(p, f0=f)
         return f, df
 
     def _chi_squared(self, p, data=None):
@@ -92,7 +92,7 @@ class GSLController(Controller):
         """
         return self.problem.eval_r_norm(p)
 
-    def _jac_chi_squared(self, p, data=None):
+    def _jac_chi_squared(self, p, data=None, f0=None):
         """
         Utility function to get jacobian for problem.eval_r_norm
 
@@ -100,10 +100,13 @@ class GSLController(Controller):
         :type p: list
         :param data: x data, this is discarded as the defaults can be used.
         :type data: N/A
+        :param f0: problem.eval_r_norm at p, if it is already known
+        :type f0: float, optional
         :return: jacobian approximation for problem.eval_r_norm
         :rtype: numpy array
         """
-        j = approx_derivative(self.problem.eval_r_norm, p)
+        j = approx_jacobian(self.problem.eval_r_norm, p,
+                            method=self.problem.jacobian_method, f0=f0)
         return j
 
     def _chi_squared_fdf(self, p, data=None):
@@ -119,7 +122,7 @@ class GSLController(Controller):
         :rtype: (numpy array, numpy array)
         """
         f = self.problem.eval_r_norm(p)
-        df = self._jac_chi_squared(p)
+        df = self._jac_chi_squared(p, f0=f)
         return f, df
 
     def setup(self):
@@ -132,6 +135,9 @@ class GSLController(Controller):
         n = len(self.data_x)
         p = len(self.initial_params)
         pinit = numx.array(self.initial_params)
+        # pyGSL copies the residuals it is given, so they are evaluated into
+        # the same array each time
+        self._residuals = np.empty(n)
 
         self._residual_methods = ['lmsder',
                                   'lmder']
@@ -2,6 +2,9 @@
 Implements a controller for the Mantid fitting software.
 """
 
+import re
+import weakref
+
 from mantid import simpleapi as msapi
 from mantid.api import *
 from mantid.fitfunctions import *
@@ -9,6 +12,17 @@ import numpy as np
 
 from fitbenchmarking.controllers.base_controller import Controller
 
+# The functions in problem equations which muparser, and so Mantid's
+# UserFunction, evaluates in the same way as numpy
+MUPARSER_FUNCTIONS = ['exp', 'sin', 'cos', 'tan', 'atan', 'sqrt']
+
+# The input workspace of each problem, with the data it was created from, so
+# that it is shared by the controllers for each set of starting values
+_WORKSPACES = weakref.WeakKeyDictionary()
+
+# The problem which the function subscribed as fitFunction evaluates
+_SUBSCRIBED = {'problem': None}
+
 
 class MantidController(Controller):
     """
@@ -33,59 +47,145 @@ class MantidController(Controller):
         self._cost_function = 'Least squares' if self.data_e is not None \
             else 'Unweighted least squares'
 
-        data_obj = msapi.CreateWorkspace(DataX=self.data_x,
-                                         DataY=self.data_y,
-                                         DataE=self.data_e)
-
-        self._mantid_data = data_obj
+        self._mantid_data = self._get_workspace()
         self._mantid_function = None
         self._mantid_results = None
+        self._output_workspaces = True
+
+    def set_options(self, options):
+        """
+        Set whether Fit creates its output workspaces on every run.
+
+        :param options: all the information specified by the user
+        :type options: fitbenchmarking.utils.options.Options
+        """
+        self._output_workspaces = options.mantid_output_workspaces
+
+    def _get_workspace(self):
+        """
+        Get the workspace holding the data of the problem, which is only
+        created once for each problem. It is not added to the analysis data
+        service, so that it does not replace the workspaces of other
+        problems.
+
+        :return: The workspace
+        :rtype: mantid.api.MatrixWorkspace
+        """
+        data = (self.data_x, self.data_y, self.data_e)
+        cached = _WORKSPACES.get(self.problem)
+        if cached is not None \
+                and all(a is b for a, b in zip(cached[0], data)):
+            return cached[1]
+
+        data_obj = msapi.CreateWorkspace(DataX=self.data_x,
+                                         DataY=self.data_y,
+                                         DataE=self.data_e,
+                                         StoreInADS=False)
+        _WORKSPACES[self.problem] = (data, data_obj)
+        return data_obj
 
     def setup(self):
         """
         Setup problem ready to run with Mantid.
 
-        Adds a custom function to Mantid for calling in fit().
+        Problems with an equation that muparser can evaluate (e.g. NIST
+        problems) are fitted with a UserFunction, which Mantid evaluates
+        natively. Otherwise, adds a custom function to Mantid for calling in
+        fit(), unless it was already added for this problem.
         """
         if isinstance(self.problem.function, FunctionWrapper):
-            function_def = self.problem.function
-        else:
-            start_val_list = ['{0}={1}'.format(name, value)
-                              for name, value
-                              in zip(self._param_names, self.initial_params)]
+            self._mantid_function = self.problem.function
+            return
+
+        start_val_list = ['{0}={1}'.format(name, value)
+                          for name, value
+                          in zip(self._param_names, self.initial_params)]
 
-            start_val_str = ', '.join(start_val_list)
+        start_val_str = ', '.join(start_val_list)
+
+        formula = self._get_user_function_formula()
+        if formula is not None:
+            function_def = "name=UserFunction, Formula={0}, {1}".format(
+                formula, start_val_str)
+        else:
             function_def = "name=fitFunction, " + start_val_str
+            if _SUBSCRIBED['problem'] is not self.problem:
+                self._subscribe_function()
+
+        self._mantid_function = function_def
 
-            class fitFunction(IFunction1D):
-                def init(ff_self):
+    def _subscribe_function(self):
+        """
+        Add a custom function to Mantid, named fitFunction, which evaluates
+        the problem function. This replaces the function of any other
+        problem.
+        """
+        problem = self.problem
+        param_names = self._param_names
 
-                    for param in self._param_names:
-                        ff_self.declareParameter(param)
+        class fitFunction(IFunction1D):
+            def init(ff_self):
 
-                def function1D(ff_self, xdata):
+                for param in param_names:
+                    ff_self.declareParameter(param)
 
-                    fit_param = np.zeros(len(self._param_names))
-                    fit_param.setflags(write=1)
-                    for i, param in enumerate(self._param_names):
-                        fit_param[i] = ff_self.getParameterValue(param)
+            def function1D(ff_self, xdata):
 
-                    return self.problem.eval_f(x=xdata,
-                                               params=fit_param)
+                fit_param = np.zeros(len(param_names))
+                fit_param.setflags(write=1)
+                for i, param in enumerate(param_names):
+                    fit_param[i] = ff_self.getParameterValue(param)
 
-            FunctionFactory.subscribe(fitFunction)
+                return problem.eval_f(x=xdata,
+                                      params=fit_param)
 
-        self._mantid_function = function_def
+        FunctionFactory.subscribe(fitFunction)
+        _SUBSCRIBED['problem'] = problem
+
+    def _get_user_function_formula(self):
+        """
+        Get the equation of the problem as the formula of a Mantid
+        UserFunction. This is possible when the equation is in muparser
+        syntax, as produced by the NIST parser, and only uses x, the
+        parameters, pi and MUPARSER_FUNCTIONS.
+
+        :return: The formula, or None if the equation can not be evaluated
+                 by a UserFunction
+        :rtype: str or None
+        """
+        equation = self.problem.equation
+        if not isinstance(equation, str) \
+                or not re.match(r'^[\w\s.+\-*/^()]+$', equation):
+            return None
+
+        # Numbers are matched first so exponents are not taken as names
+        tokens = re.findall(r'(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+                            r'|[A-Za-z_]\w*', equation)
+        names = set(t for t in tokens if not t[0].isdigit() and t[0] != '.')
+        allowed = set(self._param_names) | set(MUPARSER_FUNCTIONS) \
+            | set(['x', 'pi'])
+        if not names.issubset(allowed):
+            return None
+
+        # muparser only defines pi as _pi
+        return re.sub(r'\bpi\b', repr(np.pi), equation)
 
     def fit(self):
         """
         Run problem with Mantid.
         """
-        fit_result = msapi.Fit(Function=self._mantid_function,
-                               InputWorkspace=self._mantid_data,
-                               Output='ws_fitting_test',
-                               Minimizer=self.minimizer,
-                               CostFunction=self._cost_function)
+        if self._output_workspaces:
+            fit_result = msapi.Fit(Function=self._mantid_function,
+                                   InputWorkspace=self._mantid_data,
+                                   Output='ws_fitting_test',
+                                   Minimizer=self.minimizer,
+                                   CostFunction=self._cost_function)
+        else:
+            fit_result = msapi.Fit(Function=self._mantid_function,
+                                   InputWorkspace=self._mantid_data,
+                                   CreateOutput=False,
+                                   Minimizer=self.minimizer,
+                                   CostFunction=self._cost_function)
 
         self._mantid_results = fit_result
         self._status = self._mantid_results.OutputStatus
@@ -102,7 +202,14 @@ class MantidController(Controller):
         else:
             self.flag = 2
 
-        ws = self._mantid_results.OutputWorkspace
-        self.results = ws.readY(1)
-        final_params = self._mantid_results.OutputParameters.column(1)
-        self.final_params = final_params[:len(self.initial_params)]
+        if self._output_workspaces:
+            ws = self._mantid_results.OutputWorkspace
+            self.results = ws.readY(1)
+            final_params = self._mantid_results.OutputParameters.column(1)
+            self.final_params = final_params[:len(self.initial_params)]
+        else:
+            function = self._mantid_results.Function
+            self.final_params = [function.getParameterValue(i)
+                                 for i in range(len(self.initial_params))]
+            self.results = self.problem.eval_f(params=self.final_params,
+                                               x=self.data_x)
@@ -40,11 +40,13 @@ class SasviewController(Controller):
         Creates a Sasview FitProblem for calling in fit()
         """
         # Bumps fails with the *args notation
+        # The model is evaluated through eval_f so that the evaluations are
+        # counted and timed
         param_name_str = ', '.join(self._param_names)
         wrapper = "def fitFunction(x, {}):\n".format(param_name_str)
-        wrapper += "    return func(x, {})".format(param_name_str)
+        wrapper += "    return func([{}], x=x)".format(param_name_str)
 
-        exec_dict = {'func': self.problem.function}
+        exec_dict = {'func': self.problem.eval_f}
         exec(wrapper, exec_dict)
 
         model = exec_dict['fitFunction']
@@ -31,9 +31,14 @@ class ScipyController(Controller):
         """
         Run problem with Scipy.
         """
+        # Use scipy's own finite differences unless the Jacobian is exact
+        jac = '2-point'
+        if self.problem.jacobian is not None:
+            jac = self.problem.eval_j
         self.result = least_squares(fun=self.problem.eval_r,
                                     x0=self.initial_params,
                                     method=self.minimizer,
+                                    jac=jac,
                                     max_nfev=500)
         self._popt = self.result.x
         self._status = self.result.status
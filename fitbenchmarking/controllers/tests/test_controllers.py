@@ -16,6 +16,7 @@ from fitbenchmarking.controllers.scipy_controller import ScipyController
 
 from fitbenchmarking.parsing.parser_factory import parse_problem_file
 from fitbenchmarking.utils import exceptions
+from fitbenchmarking.utils.options import Options
 
 
 def make_fitting_problem():
@@ -168,6 +169,37 @@ class ControllerTests(TestCase):
         controller._status = "Failed"
         self.check_diverged(controller)
 
+    def test_mantid_user_function(self):
+        """
+        MantidController: Test that muparser equations are fitted with a
+        UserFunction, and other equations with a python function
+        """
+        controller = MantidController(self.problem)
+        controller.minimizer = 'Levenberg-Marquardt'
+        controller.parameter_set = 0
+        controller.prepare()
+        assert controller._mantid_function.startswith(
+            'name=UserFunction, Formula=b1 + b2*x + b3*x^2 + b4*x^3, ')
+
+        self.problem.equation = 'b1 + b2*log(x) + b3 + b4'
+        controller.prepare()
+        assert controller._mantid_function.startswith('name=fitFunction, ')
+
+    def test_mantid_no_output_workspaces(self):
+        """
+        MantidController: Test for output shape without output workspaces,
+        and that the input workspace is shared between controllers
+        """
+        options = Options()
+        options.mantid_output_workspaces = False
+        controller = MantidController(self.problem)
+        controller.set_options(options)
+        controller.minimizer = 'Levenberg-Marquardt'
+        self.shared_testing(controller)
+
+        other = MantidController(self.problem)
+        assert other._mantid_data is controller._mantid_data
+
     def test_sasview(self):
         """
         SasviewController: Test for output shape
@@ -4,6 +4,8 @@ Fit benchmark one problem functions.
 
 from __future__ import absolute_import, division, print_function
 
+from collections import OrderedDict
+import multiprocessing
 import numpy as np
 import timeit
 import warnings
@@ -11,10 +13,25 @@ import warnings
 from fitbenchmarking.controllers.controller_factory import ControllerFactory
 from fitbenchmarking.utils import fitbm_result
 from fitbenchmarking.utils import output_grabber
-from fitbenchmarking.utils.exceptions import UnknownMinimizerError
+from fitbenchmarking.utils import timing
+from fitbenchmarking.utils.convergence_trace import ConvergenceTrace
+from fitbenchmarking.utils.exceptions import (FitTimeoutError,
+                                              UnknownMinimizerError)
+from fitbenchmarking.utils.logging_setup import logger
 
+# The controller attributes which are set by prepare, fit and cleanup, and
+# need to be copied back from a fit run in a child process.
+ISOLATED_FIT_ATTRIBUTES = ['initial_params', 'final_params', 'results',
+                           'flag']
 
-def fitbm_one_prob(problem, options):
+# The values recorded from the problem for each run of a fit (see
+# FittingProblem.eval_stats)
+EVAL_STATS = ['nfev', 'njev', 'model_time', 'jacobian_time',
+              'callback_time', 'residual_cache_hits',
+              'residual_cache_misses']
+
+
+def fitbm_one_prob(problem, options, checkpoint=None, cache=None):
     """
     Sets up the controller for a particular problem and fits the models
     provided in the problem object.
@@ -23,6 +40,12 @@ def fitbm_one_prob(problem, options):
     :type problem: FittingProblem
     :param options: all the information specified by the user
     :type options: fitbenchmarking.utils.options.Options
+    :param checkpoint: journal to record finished fits in, fits already in
+                       it are not repeated
+    :type checkpoint: fitbenchmarking.utils.checkpoint.Checkpoint
+    :param cache: results from previous runs, fits in it are not repeated
+                  and new results are added to it
+    :type cache: fitbenchmarking.utils.result_cache.ResultCache
 
     :return: nested array of result objects, per function definition
              containing the fit information
@@ -44,27 +67,153 @@ def fitbm_one_prob(problem, options):
 
         for s in software:
             print("        Software: {}".format(s.upper()))
-            try:
-                minimizers = options.minimizers[s]
-            except KeyError:
-                raise UnknownMinimizerError(
-                    'No minimizer given for software: {}'.format(s))
-
-            with grabbed_output:
-                controller_cls = ControllerFactory.create_controller(
-                    software=s)
-                controller = controller_cls(problem=problem)
-
-            controller.parameter_set = i
-            problem_result = benchmark(controller=controller,
-                                       minimizers=minimizers,
-                                       options=options)
-
-            results[i][s] = problem_result
+            minimizers = get_minimizers(options=options, software=s)
+
+            finished = {}
+            for minimizer in minimizers:
+                result, source = find_finished_result(
+                    problem=problem, parameter_set=i, software=s,
+                    minimizer=minimizer, options=options,
+                    checkpoint=checkpoint, cache=cache)
+                if result is not None:
+                    print("            Minimizer: {0} (from {1})".format(
+                        minimizer, source))
+                    finished[minimizer] = result
+            remaining = [m for m in minimizers if m not in finished]
+
+            if remaining:
+                with grabbed_output:
+                    controller = create_controller(problem=problem,
+                                                   software=s,
+                                                   options=options)
+
+                controller.parameter_set = i
+                problem_result = benchmark(controller=controller,
+                                           minimizers=remaining,
+                                           options=options,
+                                           checkpoint=checkpoint,
+                                           cache=cache,
+                                           software=s)
+                finished.update(zip(remaining, problem_result))
+
+            results[i][s] = [finished[m] for m in minimizers]
     return results
 
 
-def benchmark(controller, minimizers, options):
+def get_minimizers(options, software):
+    """
+    Get the minimizers selected for a software.
+
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+    :param software: the name of the software
+    :type software: str
+
+    :return: the minimizers to run for the software
+    :rtype: list of str
+    """
+    try:
+        return options.minimizers[software]
+    except KeyError:
+        raise UnknownMinimizerError(
+            'No minimizer given for software: {}'.format(software))
+
+
+def find_finished_result(problem, parameter_set, software, minimizer,
+                         options, checkpoint=None, cache=None):
+    """
+    Look for the result of a fit in the checkpoint of an interrupted run,
+    then in the cache of results from previous runs.
+
+    :param problem: a problem object containing information used in fitting
+    :type problem: FittingProblem
+    :param parameter_set: the index of the starting values
+    :type parameter_set: int
+    :param software: the name of the software
+    :type software: str
+    :param minimizer: the name of the minimizer
+    :type minimizer: str
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+    :param checkpoint: journal of finished fits
+    :type checkpoint: fitbenchmarking.utils.checkpoint.Checkpoint
+    :param cache: results from previous runs
+    :type cache: fitbenchmarking.utils.result_cache.ResultCache
+
+    :return: the result, or None if the fit has to be run, and where it was
+             found ('checkpoint' or 'cache')
+    :rtype: tuple(fitbenchmarking.utils.fitbm_result.FittingResult, str)
+    """
+    for source, store in [('checkpoint', checkpoint), ('cache', cache)]:
+        if store is None:
+            continue
+        result = store.get(problem=problem,
+                           parameter_set=parameter_set,
+                           software=software,
+                           minimizer=minimizer,
+                           options=options)
+        if result is not None:
+            # The runtimes may have been summarised with another timer or
+            # statistic
+            if result.timings:
+                set_runtime(result=result,
+                            timings=result.timings,
+                            options=options)
+            # Results stored by older versions have no eval_stats
+            eval_stats = getattr(result, 'eval_stats', None)
+            if eval_stats:
+                set_eval_stats(result=result, eval_stats=eval_stats)
+            return result, source
+    return None, None
+
+
+def record_result(parameter_set, software, result, checkpoint=None,
+                  cache=None):
+    """
+    Add the result of a fit to the checkpoint and the cache.
+
+    :param parameter_set: the index of the starting values
+    :type parameter_set: int
+    :param software: the name of the software
+    :type software: str
+    :param result: the result of the fit
+    :type result: fitbenchmarking.utils.fitbm_result.FittingResult
+    :param checkpoint: journal of finished fits
+    :type checkpoint: fitbenchmarking.utils.checkpoint.Checkpoint
+    :param cache: results from previous runs
+    :type cache: fitbenchmarking.utils.result_cache.ResultCache
+    """
+    for store in [checkpoint, cache]:
+        if store is not None:
+            store.add(parameter_set=parameter_set,
+                      software=software,
+                      result=result)
+
+
+def create_controller(problem, software, options=None):
+    """
+    Create a controller for a problem using the given software.
+
+    :param problem: a problem object containing information used in fitting
+    :type problem: FittingProblem
+    :param software: the name of the software
+    :type software: str
+    :param options: all the information specified by the user, applied to
+                    the controller if given
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: the controller for the problem
+    :rtype: Object derived from BaseSoftwareController
+    """
+    controller_cls = ControllerFactory.create_controller(software=software)
+    controller = controller_cls(problem=problem)
+    if options is not None:
+        controller.set_options(options)
+    return controller
+
+
+def benchmark(controller, minimizers, options, checkpoint=None, cache=None,
+              software=None):
     """
     Fit benchmark one problem, with one function definition and all
     the selected minimizers, using the chosen fitting software.
@@ -75,66 +224,330 @@ def benchmark(controller, minimizers, options):
     :type minimizers: list
     :param options: all the information specified by the user
     :type options: fitbenchmarking.utils.options.Options
+    :param checkpoint: journal to record each result in as it finishes
+    :type checkpoint: fitbenchmarking.utils.checkpoint.Checkpoint
+    :param cache: cache to store each result in
+    :type cache: fitbenchmarking.utils.result_cache.ResultCache
+    :param software: the name of the software, needed for the checkpoint
+                     and cache
+    :type software: str
 
     :return: results_problem nested array of result objects, per
              minimizer
     :rtype: list
     """
-    grabbed_output = output_grabber.OutputGrabber()
-
     results_problem = []
-    num_runs = options.num_runs
     for minimizer in minimizers:
         print("            Minimizer: {}".format(minimizer))
+        individual_result = benchmark_minimizer(controller=controller,
+                                                minimizer=minimizer,
+                                                options=options)
+        record_result(parameter_set=controller.parameter_set,
+                      software=software,
+                      result=individual_result,
+                      checkpoint=checkpoint,
+                      cache=cache)
+        results_problem.append(individual_result)
+
+    return results_problem
+
+
+def benchmark_minimizer(controller, minimizer, options):
+    """
+    Fit benchmark one problem, with one function definition and one
+    minimizer. This is the smallest independent unit of work.
+
+    :param controller: The software controller for the fitting, with the
+                       parameter_set already selected
+    :type controller: Object derived from BaseSoftwareController
+    :param minimizer: the minimizer used in fitting
+    :type minimizer: str
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: the result of the fit
+    :rtype: fitbenchmarking.utils.fitbm_result.FittingResult
+    """
+    grabbed_output = output_grabber.OutputGrabber()
+
+    controller.minimizer = minimizer
+    run_timings = []
+
+    try:
+        with grabbed_output:
+            if options.fit_timeout > 0:
+                run_timings = run_fit_isolated(controller=controller,
+                                               options=options)
+            else:
+                run_timings = run_fit(controller=controller,
+                                      options=options)
+    except FitTimeoutError as excp:
+        print(str(excp))
+        controller.flag = 4
+        controller.final_params = None
+    # Catching all exceptions as this means runtime cannot be calculated
+    # pylint: disable=broad-except
+    except Exception as excp:
+        print(str(excp))
+        controller.flag = 3
+        controller.final_params = None
+
+    controller.check_attributes()
+    init_function_params = controller.problem.get_function_params(
+        params=controller.initial_params)
+    fin_function_params = controller.problem.get_function_params(
+        params=controller.final_params)
+
+    timings = {name: [t[name] for t in run_timings]
+               for name in timing.TIMERS}
+    eval_stats = {name: [t[name] for t in run_timings]
+                  for name in EVAL_STATS}
+    runtime_list = timings[options.timer]
+
+    if controller.flag <= 2:
+        ratio = np.max(runtime_list) / np.min(runtime_list)
+        tol = 4
+        if ratio > tol:
+            warnings.warn('The ratio of the max time to the min is {0}'
+                          ' which is  larger than the tolerance of {1},'
+                          ' which may indicate that caching has occurred'
+                          ' in the timing results'.format(ratio, tol))
+        chi_sq = controller.eval_chisq(params=controller.final_params,
+                                       x=controller.data_x,
+                                       y=controller.data_y,
+                                       e=controller.data_e)
+    else:
+        chi_sq = np.inf
 
-        controller.minimizer = minimizer
+    problem = controller.problem
+    individual_result = fitbm_result.FittingResult(
+        options=options, problem=problem, chi_sq=chi_sq,
+        runtime=np.inf, minimizer=minimizer,
+        params=controller.final_params,
+        ini_function_params=init_function_params,
+        fin_function_params=fin_function_params,
+        error_flag=controller.flag)
+    if controller.flag <= 2:
+        set_runtime(result=individual_result,
+                    timings=timings,
+                    options=options)
+        set_eval_stats(result=individual_result, eval_stats=eval_stats)
+        if options.record_trace and problem.trace is not None:
+            individual_result.trace = problem.trace.copy()
 
+    return individual_result
+
+
+def set_runtime(result, timings, options):
+    """
+    Set the runtime of a result from the timings of its runs, using the
+    timer and statistic selected in the options.
+
+    :param result: the result to update
+    :type result: fitbenchmarking.utils.fitbm_result.FittingResult
+    :param timings: the time taken by each run for each timer, in seconds
+    :type timings: dict of list of float
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+    """
+    runtime_list = timings[options.timer]
+    result.timings = timings
+    result.runtimes = runtime_list
+    result.num_runs = len(runtime_list)
+    result.runtime = timing.summarise(runtime_list, options.runtime_statistic)
+    result.runtime_ci = timing.confidence_interval(runtime_list)
+
+
+def set_eval_stats(result, eval_stats):
+    """
+    Set the evaluation counts, residual cache statistics, model time and
+    overhead breakdown of a result from those of its runs. The counts are
+    taken from the last run.
+
+    The overhead breakdown splits the mean wall clock time of the runs into
+    the time spent evaluating the model, in eval_j other than evaluating the
+    model, in the rest of the calls from the minimizer to the problem
+    (harness), and in the minimizer itself (solver). The model time is the
+    model part of the breakdown. The mean is used, whatever the
+    runtime_statistic option, as it is the only statistic for which the
+    parts add up to the whole.
+
+    :param result: the result to update
+    :type result: fitbenchmarking.utils.fitbm_result.FittingResult
+    :param eval_stats: the values of each of EVAL_STATS for each run
+    :type eval_stats: dict of list
+    """
+    result.eval_stats = eval_stats
+    result.nfev = eval_stats['nfev'][-1]
+    result.njev = eval_stats['njev'][-1]
+    result.residual_cache_hits = eval_stats['residual_cache_hits'][-1]
+    result.residual_cache_misses = eval_stats['residual_cache_misses'][-1]
+    model = float(np.mean(eval_stats['model_time']))
+    jacobian = float(np.mean(eval_stats['jacobian_time']))
+    callbacks = float(np.mean(eval_stats['callback_time']))
+    wall = float(np.mean(result.timings['wall']))
+    result.model_time = model
+    # Clock resolution can make the differences slightly negative
+    result.overhead = OrderedDict([
+        ('model', model),
+        ('jacobian', jacobian),
+        ('harness', max(callbacks - model - jacobian, 0.0)),
+        ('solver', max(wall - callbacks, 0.0))])
+
+
+def run_fit(controller, options):
+    """
+    Run and time the fit until it has been repeated enough times (see
+    fitbenchmarking.utils.timing.runs_finished), then run the controller
+    cleanup.
+
+    :param controller: The software controller for the fitting
+    :type controller: Object derived from BaseSoftwareController
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: The time taken by each fit for each of the timers (see
+             fitbenchmarking.utils.timing.TIMERS) and its evaluation
+             counts and model time
+    :rtype: list of dict
+    """
+    run_timings = list(_timed_runs(controller=controller, options=options))
+    controller.cleanup()
+    return run_timings
+
+
+def _timed_runs(controller, options):
+    """
+    Generator which runs and times the fit until it has been repeated enough
+    times. If options.record_trace is set, the convergence trace of the
+    last run is left in the problem's trace.
+
+    :param controller: The software controller for the fitting
+    :type controller: Object derived from BaseSoftwareController
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: The time taken by each fit for each of the timers, and the
+             evaluation counts and model time of the fit (see
+             FittingProblem.eval_stats), as each fit finishes
+    :rtype: generator of dict
+    """
+    trace = None
+    if options.record_trace:
+        if controller.problem.trace is None:
+            controller.problem.trace = ConvergenceTrace()
+        trace = controller.problem.trace
+
+    runtime_list = []
+    start = timeit.default_timer()
+    while not timing.runs_finished(
+            runtime_list=runtime_list,
+            elapsed=timeit.default_timer() - start,
+            options=options):
+        controller.prepare()
+        controller.problem.reset_eval_stats()
+        if trace is not None:
+            trace.start()
         try:
-            with grabbed_output:
-                # Calls timeit repeat with repeat = num_runs and number = 1
-                runtime_list = \
-                    timeit.Timer(setup=controller.prepare,
-                                 stmt=controller.fit).repeat(num_runs, 1)
-                runtime = sum(runtime_list) / num_runs
-                controller.cleanup()
-        # Catching all exceptions as this means runtime cannot be calculated
-        # pylint: disable=broad-except
-        except Exception as excp:
-            print(str(excp))
-            runtime = np.inf
-            controller.flag = 3
-            controller.final_params = None
-
-        controller.check_attributes()
-        init_function_params = controller.problem.get_function_params(
-            params=controller.initial_params)
-        fin_function_params = controller.problem.get_function_params(
-            params=controller.final_params)
-
-        if controller.flag <= 2:
-            ratio = np.max(runtime_list) / np.min(runtime_list)
-            tol = 4
-            if ratio > tol:
-                warnings.warn('The ratio of the max time to the min is {0}'
-                              ' which is  larger than the tolerance of {1},'
-                              ' which may indicate that caching has occurred'
-                              ' in the timing results'.format(ratio, tol))
-            chi_sq = controller.eval_chisq(params=controller.final_params,
-                                           x=controller.data_x,
-                                           y=controller.data_y,
-                                           e=controller.data_e)
-        else:
-            chi_sq = np.inf
-
-        problem = controller.problem
-        individual_result = fitbm_result.FittingResult(
-            options=options, problem=problem, chi_sq=chi_sq,
-            runtime=runtime, minimizer=minimizer,
-            params=controller.final_params,
-            ini_function_params=init_function_params,
-            fin_function_params=fin_function_params,
-            error_flag=controller.flag)
+            fit_timings = timing.time_call(controller.fit)
+        finally:
+            if trace is not None:
+                trace.stop()
+        runtime_list.append(fit_timings[options.timer])
+        fit_timings.update(controller.problem.eval_stats())
+        yield fit_timings
 
-        results_problem.append(individual_result)
 
-    return results_problem
+def run_fit_isolated(controller, options):
+    """
+    Run and time the fit in a child process until it has been repeated
+    enough times, then run the controller cleanup. The child process is
+    killed if any single fit takes longer than options.fit_timeout.
+
+    The child is created by forking, so that the controller does not need to
+    be pickled. If fork is not available the fit is run without a timeout.
+
+    :param controller: The software controller for the fitting
+    :type controller: Object derived from BaseSoftwareController
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: The time taken by each fit for each of the timers (see
+             fitbenchmarking.utils.timing.TIMERS) and its evaluation
+             counts and model time
+    :rtype: list of dict
+    """
+    timeout = options.fit_timeout
+    try:
+        context = multiprocessing.get_context('fork')
+    except AttributeError:
+        # Python 2 always forks
+        context = multiprocessing
+    except ValueError:
+        logger.warning('Fit timeouts need the fork start method, which is not '
+                       'available. Running without a timeout.')
+        return run_fit(controller=controller, options=options)
+
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    child = context.Process(target=_isolated_fit_worker,
+                            args=(controller, options, child_conn))
+    child.start()
+    child_conn.close()
+
+    run_timings = []
+    try:
+        while True:
+            if not parent_conn.poll(timeout):
+                raise FitTimeoutError(
+                    'Fit with {0} did not finish within {1}s.'.format(
+                        controller.minimizer, timeout))
+            try:
+                message, value = parent_conn.recv()
+            except EOFError:
+                raise RuntimeError('The fit process exited unexpectedly '
+                                   '(exit code {}).'.format(child.exitcode))
+            if message == 'run':
+                run_timings.append(value)
+            elif message == 'error':
+                raise RuntimeError(value)
+            else:
+                attrs, controller.problem.trace = value
+                for attr, attr_value in attrs.items():
+                    setattr(controller, attr, attr_value)
+                break
+    finally:
+        parent_conn.close()
+        if child.is_alive():
+            child.terminate()
+        child.join()
+
+    return run_timings
+
+
+def _isolated_fit_worker(controller, options, conn):
+    """
+    Target for the child process created by run_fit_isolated.
+    Sends the timings of each fit through the pipe as it completes, followed
+    by the controller attributes set by the fit and the convergence trace.
+
+    :param controller: The software controller for the fitting
+    :type controller: Object derived from BaseSoftwareController
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+    :param conn: The sending end of the pipe to the parent process
+    :type conn: multiprocessing.connection.Connection
+    """
+    try:
+        for fit_timings in _timed_runs(controller=controller,
+                                       options=options):
+            conn.send(('run', fit_timings))
+        controller.cleanup()
+        attrs = {attr: getattr(controller, attr)
+                 for attr in ISOLATED_FIT_ATTRIBUTES}
+        conn.send(('done', (attrs, controller.problem.trace)))
+    # Any exception is passed back to be handled by the parent
+    # pylint: disable=broad-except
+    except Exception as excp:
+        conn.send(('error', str(excp)))
+    finally:
+        conn.close()
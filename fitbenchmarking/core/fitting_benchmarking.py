@@ -6,15 +6,21 @@ for a certain fitting software.
 
 from __future__ import (absolute_import, division, print_function)
 
+import os
+
 from fitbenchmarking.utils.logging_setup import logger
 
 from fitbenchmarking.parsing.parser_factory import parse_problem_file
 from fitbenchmarking.utils import misc
 from fitbenchmarking.utils import output_grabber
-from fitbenchmarking.core.fitbenchmark_one_problem import fitbm_one_prob
+from fitbenchmarking.utils.runtime_history import RuntimeHistory
+from fitbenchmarking.core import task_scheduler
+from fitbenchmarking.core.fitbenchmark_one_problem import (
+    find_finished_result, fitbm_one_prob)
 
 
-def fitbenchmark_group(group_name, options, data_dir):
+def fitbenchmark_group(group_name, options, data_dir, checkpoint=None,
+                       cache=None):
     """
     Gather the user input and list of paths. Call benchmarking on these.
 
@@ -29,6 +35,12 @@ def fitbenchmark_group(group_name, options, data_dir):
     :param data_dir: full path of a directory that holds a group of problem
                      definition files
     :type date_dir: str
+    :param checkpoint: journal to record finished fits in, fits already in
+                       it are not repeated
+    :type checkpoint: fitbenchmarking.utils.checkpoint.Checkpoint
+    :param cache: results from previous runs, fits in it are not repeated
+                  and new results are added to it
+    :type cache: fitbenchmarking.utils.result_cache.ResultCache
 
     :return: prob_results array of fitting results for
              the problem group and the location of the results
@@ -39,12 +51,18 @@ def fitbenchmark_group(group_name, options, data_dir):
     # Extract problem definitions
     problem_group = misc.get_problem_files(data_dir)
 
+    if checkpoint is not None:
+        checkpoint.start_group(group_name)
+
+    if options.num_workers > 1:
+        return _fitbenchmark_group_parallel(problem_group, options,
+                                            checkpoint, cache)
+
     results = []
     template_prob_name = " Running data from: {}"
     for i, p in enumerate(problem_group):
         with grabbed_output:
-            parsed_problem = parse_problem_file(p)
-            parsed_problem.correct_data(options.use_errors)
+            parsed_problem = _parse_and_correct(p, options)
 
         decorator = '#' * (len(template_prob_name) +
                            len(parsed_problem.name) + 4)
@@ -53,13 +71,144 @@ def fitbenchmark_group(group_name, options, data_dir):
                                                  i + 1, len(problem_group)))
 
         problem_results = fitbm_one_prob(problem=parsed_problem,
-                                         options=options)
+                                         options=options,
+                                         checkpoint=checkpoint,
+                                         cache=cache)
+        results.extend(_flatten_results(problem_results, options))
+
+    return results
+
+
+def _parse_and_correct(problem_file, options):
+    """
+    Parse a problem file and apply the data corrections and the Jacobian
+    scheme from the options.
+
+    :param problem_file: path to the problem definition file
+    :type problem_file: str
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: the parsed problem
+    :rtype: fitbenchmarking.parsing.fitting_problem.FittingProblem
+    """
+    parsed_problem = parse_problem_file(problem_file)
+    parsed_problem.correct_data(options.use_errors)
+    parsed_problem.jacobian_method = options.jacobian_method
+    return parsed_problem
+
+
+def _flatten_results(problem_results, options):
+    """
+    Convert the results for one problem from a list of dict (one dict per
+    starting value, keyed by software) to a list of list.
+
+    :param problem_results: results as returned by fitbm_one_prob
+    :type problem_results: list of dict
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: one list of results per starting value
+    :rtype: list of list of fitbenchmarking.utils.fitbm_result.FittingResult
+    """
+    flat_results = []
+    for r in problem_results:
+        tmp_result = []
+        for s in options.software:
+            tmp_result.extend(r[s])
+        flat_results.append(tmp_result)
+    return flat_results
+
+
+def _record_runtimes(history, problem, problem_results):
+    """
+    Add the runtimes for one problem to the runtime history.
+
+    :param history: the runtime history to update
+    :type history: fitbenchmarking.utils.runtime_history.RuntimeHistory
+    :param problem: the problem that was fitted
+    :type problem: fitbenchmarking.parsing.fitting_problem.FittingProblem
+    :param problem_results: results as returned by fitbm_one_prob
+    :type problem_results: list of dict
+    """
+    for r in problem_results:
+        for software, software_results in r.items():
+            for result in software_results:
+                history.add(problem_name=problem.name,
+                            software=software,
+                            minimizer=result.minimizer,
+                            runtime=result.runtime)
+
+
+def _fitbenchmark_group_parallel(problem_group, options, checkpoint=None,
+                                 cache=None):
+    """
+    Fit a group of problems using a pool of worker processes.
 
-        # Convert from list of dict to list of list and store
-        for r in problem_results:
-            tmp_result = []
-            for s in options.software:
-                tmp_result.extend(r[s])
-            results.append(tmp_result)
+    The fits are split into independent tasks, one per problem, starting
+    value, software and minimizer, so that long running combinations do not
+    hold up the rest of the group. The tasks are ordered using the runtimes
+    in the runtime history, which is updated with the new runtimes. The
+    results are returned in the same order as the serial path.
 
+    :param problem_group: paths to the problem definition files
+    :type problem_group: list of str
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+    :param checkpoint: journal to record finished fits in, fits already in
+                       it are not repeated
+    :type checkpoint: fitbenchmarking.utils.checkpoint.Checkpoint
+    :param cache: results from previous runs, fits in it are not repeated
+                  and new results are added to it
+    :type cache: fitbenchmarking.utils.result_cache.ResultCache
+
+    :return: prob_results array of fitting results for the problem group
+    :rtype: list of list of fitbenchmarking.utils.fitbm_result.FittingResult
+    """
+    grabbed_output = output_grabber.OutputGrabber()
+    history = RuntimeHistory(os.path.join(options.results_dir,
+                                          options.runtime_history))
+
+    # The problems are parsed here as well since the results need them for
+    # plotting and the support pages.
+    with grabbed_output:
+        problems = [_parse_and_correct(p, options) for p in problem_group]
+
+    tasks = task_scheduler.create_tasks(problem_files=problem_group,
+                                        problems=problems,
+                                        options=options)
+    task_results = [find_finished_result(problem=problems[t.problem_index],
+                                         parameter_set=t.parameter_set,
+                                         software=t.software,
+                                         minimizer=t.minimizer,
+                                         options=options,
+                                         checkpoint=checkpoint,
+                                         cache=cache)[0]
+                    for t in tasks]
+    remaining = [i for i, r in enumerate(task_results) if r is None]
+    if len(remaining) < len(tasks):
+        print("Skipping {0} tasks which finished in a previous run".format(
+            len(tasks) - len(remaining)))
+
+    if remaining:
+        new_results = task_scheduler.run_tasks(
+            tasks=[tasks[i] for i in remaining],
+            problems=problems,
+            options=options,
+            history=history,
+            checkpoint=checkpoint,
+            cache=cache)
+        for i, r in zip(remaining, new_results):
+            task_results[i] = r
+    problem_results = task_scheduler.assemble_results(
+        tasks=tasks,
+        task_results=task_results,
+        problems=problems,
+        options=options)
+
+    results = []
+    for problem, r in zip(problems, problem_results):
+        _record_runtimes(history, problem, r)
+        results.extend(_flatten_results(r, options))
+    history.save()
     return results
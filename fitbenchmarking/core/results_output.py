@@ -35,6 +35,8 @@ def save_results(options, results, group_name):
     _, group_dir, supp_dir, fig_dir = create_directories(options, group_name)
     best_results = preproccess_data(results)
     table_descriptions = create_table_descriptions(options)
+    if options.record_trace:
+        save_traces(results, group_name, group_dir)
     if options.make_plots:
         create_plots(options, results, best_results, group_name, fig_dir)
     support_page.create(options=options,
@@ -94,14 +96,51 @@ def preproccess_data(results_per_test):
 
         min_chi_sq = best_result.chi_sq
         min_runtime = min([r.runtime for r in results])
+        min_nfev = min([r.nfev for r in results])
+        min_model_time = min([r.model_time for r in results])
         for r in results:
             r.min_chi_sq = min_chi_sq
             r.min_runtime = min_runtime
+            r.min_nfev = min_nfev
+            r.min_model_time = min_model_time
+        # Setting min_chi_sq finds the time to reach it
+        min_time_to_target = min([r.time_to_target for r in results])
+        min_nfev_to_target = min([r.nfev_to_target for r in results])
+        for r in results:
+            r.min_time_to_target = min_time_to_target
+            r.min_nfev_to_target = min_nfev_to_target
             r.set_colour_scale()
         output.append(best_result)
     return output
 
 
+def save_traces(results_per_test, group_name, group_dir):
+    """
+    Write the convergence trace of each result to a csv file in the traces
+    directory.
+
+    :param results_per_test: results nested array of objects
+    :type results_per_test: list of list of
+                            fitbenchmarking.utils.fitbm_result.FittingResult
+    :param group_name: name of the problem group
+    :type group_name: str
+    :param group_dir: path to the group results directory
+    :type group_dir: str
+    """
+    traces_dir = create_dirs.traces(group_dir)
+    name_count = {}
+    for prob_results in results_per_test:
+        name = prob_results[0].problem.sanitised_name
+        name_count[name] = 1 + name_count.get(name, 0)
+        count = name_count[name]
+        for result in prob_results:
+            if result.trace is None:
+                continue
+            file_name = '{0}_{1}_{2}_{3}_trace.csv'.format(
+                group_name, name, count, result.minimizer).lower()
+            result.trace.save(os.path.join(traces_dir, file_name))
+
+
 def create_table_descriptions(options):
     """
     Create a descriptions of the tables and the comparison mode from the file
@@ -192,6 +231,14 @@ def create_plots(options, results, best_results, group_name, figures_dir):
                         'parameters'
                 result.start_figure_link = initial_guess_path
 
+        for result in prob_result:
+            if result.overhead is not None:
+                result.overhead_figure_link = plot.plot_overhead(
+                    result.minimizer, result.overhead)
+            if result.trace is not None and len(result.trace) > 0:
+                result.trace_figure_link = plot.plot_trace(
+                    result.minimizer, result.trace)
+
 
 def create_problem_level_index(options, table_names, group_name,
                                group_dir, table_descriptions):
@@ -0,0 +1,570 @@
+"""
+Split the fitting of a group of problems into independent tasks and run them
+across a pool of worker processes.
+
+A task is the fit of one problem, from one starting value, with one software
+and one minimizer.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+from collections import deque, OrderedDict
+import multiprocessing
+import pickle
+import sys
+try:
+    from queue import Empty
+except ImportError:
+    # python2
+    from Queue import Empty
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+import numpy as np
+
+from fitbenchmarking.core.fitbenchmark_one_problem import (benchmark_minimizer,
+                                                           create_controller,
+                                                           get_minimizers,
+                                                           record_result)
+from fitbenchmarking.parsing.expression_compiler import configure_plan_cache
+from fitbenchmarking.parsing.parser_factory import parse_problem_file
+from fitbenchmarking.utils import output_grabber
+from fitbenchmarking.utils.fitbm_result import FittingResult
+
+# Estimated time in seconds per data point and parameter for a single fit.
+# Used to order tasks for which there is no runtime history.
+ESTIMATED_COST_PER_POINT = 1e-6
+
+# The number of parsed problems (and their controllers) each worker keeps.
+# Tasks are not handed out in problem order, so a few problems are kept to
+# avoid parsing the same problem repeatedly.
+MAX_CACHED_PROBLEMS = 8
+
+# How often in seconds the main process checks that the workers are alive
+# while waiting for results, and how long a worker is given to exit when
+# stopped.
+WORKER_POLL_INTERVAL = 1.0
+
+# State held by each worker process.
+# 'problems' maps a problem file to the parsed problem and a dict of
+# controllers for it, keyed by software and starting value, in order of most
+# recent use.
+_WORKER_STATE = {'options': None,
+                 'problems': OrderedDict()}
+
+
+class FitTask(object):
+    """
+    Definition of a single fit to run.
+    """
+
+    def __init__(self, problem_index, problem_file, parameter_set, software,
+                 minimizer):
+        """
+        :param problem_index: index of the problem in the group
+        :type problem_index: int
+        :param problem_file: path to the problem definition file
+        :type problem_file: str
+        :param parameter_set: index of the starting values to use
+        :type parameter_set: int
+        :param software: the software to fit with
+        :type software: str
+        :param minimizer: the minimizer to fit with
+        :type minimizer: str
+        """
+        self.problem_index = problem_index
+        self.problem_file = problem_file
+        self.parameter_set = parameter_set
+        self.software = software
+        self.minimizer = minimizer
+
+    def __repr__(self):
+        return 'FitTask({0}, {1}, {2}, {3}, {4})'.format(
+            self.problem_index, self.problem_file, self.parameter_set,
+            self.software, self.minimizer)
+
+
+def create_tasks(problem_files, problems, options):
+    """
+    Create the tasks for a group of problems.
+
+    The tasks are ordered in the same way as the serial path runs them, i.e.
+    by problem, starting value, software, and then minimizer.
+
+    :param problem_files: paths to the problem definition files
+    :type problem_files: list of str
+    :param problems: the parsed problems, in the same order as problem_files
+    :type problems: list of FittingProblem
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: the tasks to run
+    :rtype: list of FitTask
+    """
+    software = options.software
+    if not isinstance(software, list):
+        software = [software]
+
+    tasks = []
+    for i, (problem_file, problem) in enumerate(zip(problem_files, problems)):
+        for j in range(len(problem.starting_values)):
+            for s in software:
+                for minimizer in get_minimizers(options=options, software=s):
+                    tasks.append(FitTask(problem_index=i,
+                                         problem_file=problem_file,
+                                         parameter_set=j,
+                                         software=s,
+                                         minimizer=minimizer))
+    return tasks
+
+
+def estimate_cost(task, problem, history, options):
+    """
+    Estimate how long a task will take to run.
+
+    The runtime recorded for the problem, software and minimizer in a
+    previous run is used if available, otherwise the cost is estimated from
+    the number of data points and parameters in the problem.
+
+    :param task: the task to estimate
+    :type task: FitTask
+    :param problem: the parsed problem for the task
+    :type problem: FittingProblem
+    :param history: runtimes from previous runs
+    :type history: fitbenchmarking.utils.runtime_history.RuntimeHistory
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: the estimated runtime in seconds
+    :rtype: float
+    """
+    runtime = None
+    if history is not None:
+        runtime = history.get(problem.name, task.software, task.minimizer)
+    if runtime is None:
+        runtime = ESTIMATED_COST_PER_POINT * len(problem.data_x) \
+            * len(problem.param_names)
+    return runtime * options.num_runs
+
+
+def run_tasks(tasks, problems, options, history=None, checkpoint=None,
+              cache=None):
+    """
+    Run the tasks across options.num_workers worker processes.
+
+    The most expensive tasks are handed out first, so that the last tasks to
+    finish are short ones.
+
+    If a worker dies while running a task (e.g. it crashes or is killed for
+    using too much memory) the task is retried once on a fresh worker. If it
+    fails again a failed result is recorded for it. A failed result is also
+    recorded for a task which raised an error, and the other tasks carry on.
+
+    :param tasks: the tasks to run
+    :type tasks: list of FitTask
+    :param problems: the parsed problems, the results are attached to these
+    :type problems: list of FittingProblem
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+    :param history: runtimes from previous runs, used to order the tasks
+    :type history: fitbenchmarking.utils.runtime_history.RuntimeHistory
+    :param checkpoint: journal to record each result in as it finishes
+    :type checkpoint: fitbenchmarking.utils.checkpoint.Checkpoint
+    :param cache: cache to store each result in
+    :type cache: fitbenchmarking.utils.result_cache.ResultCache
+
+    :return: the result for each task, in the same order as tasks
+    :rtype: list of fitbenchmarking.utils.fitbm_result.FittingResult
+    """
+    remaining = [0] * len(problems)
+    for task in tasks:
+        remaining[task.problem_index] += 1
+
+    costs = [estimate_cost(task=t,
+                           problem=problems[t.problem_index],
+                           history=history,
+                           options=options)
+             for t in tasks]
+    # Longest job first. sorted is stable so ties keep the serial order.
+    order = sorted(range(len(tasks)), key=lambda i: -costs[i])
+
+    print("Fitting {0} tasks from {1} problems using {2} worker "
+          "processes".format(len(tasks), len(problems), options.num_workers))
+
+    result_queue = multiprocessing.Queue()
+    workers = [_Worker(options, result_queue)
+               for _ in range(min(options.num_workers, len(tasks)))]
+
+    pending = deque(order)
+    attempts = [0] * len(tasks)
+    results = [None] * len(tasks)
+    # The worker running each unfinished task, by task index
+    running = {}
+    num_done = 0
+    try:
+        while num_done < len(tasks):
+            for w in workers:
+                if w.current is None and pending:
+                    i = pending.popleft()
+                    attempts[i] += 1
+                    running[i] = w
+                    w.run(i, tasks[i])
+
+            try:
+                messages = [result_queue.get(timeout=WORKER_POLL_INTERVAL)]
+            except Empty:
+                messages = []
+            # Workers are checked after every message, so that a dead worker
+            # is found while the others are still sending results. A worker
+            # may have sent its result just before it exited, so the results
+            # sent by dead workers are read before their tasks are counted as
+            # lost.
+            lost = [w for w in workers
+                    if w.current is not None and not w.process.is_alive()]
+            if lost:
+                for w in lost:
+                    w.process.join()
+                messages.extend(_get_all(result_queue))
+
+            for i, result, error, retiring in messages:
+                # Results for tasks which have already been recorded (e.g.
+                # the first attempt finished after the task was retried) are
+                # ignored.
+                worker = running.pop(i, None)
+                if worker is None:
+                    continue
+                worker.current = None
+                if retiring:
+                    worker.replace()
+                if error is not None:
+                    print("    Error while running {0}: {1}".format(tasks[i],
+                                                                   error))
+                    result = _failed_result(tasks[i], problems, options)
+                num_done += 1
+                _store_result(results, remaining, problems, options, tasks,
+                              i, result, checkpoint, cache)
+
+            for w in lost:
+                if w.current is None:
+                    continue
+                i = w.current
+                print("    Worker exited while running {0} (exit code "
+                      "{1})".format(tasks[i], w.process.exitcode))
+                del running[i]
+                w.current = None
+                w.replace()
+                if attempts[i] < 2:
+                    pending.appendleft(i)
+                else:
+                    num_done += 1
+                    _store_result(results, remaining, problems, options,
+                                  tasks, i, _failed_result(tasks[i], problems,
+                                                           options),
+                                  checkpoint, cache)
+    finally:
+        for w in workers:
+            w.stop()
+
+    return results
+
+
+def _get_all(queue):
+    """
+    Get the items which are in a queue without waiting for more.
+
+    :param queue: the queue to read
+    :type queue: multiprocessing.Queue
+
+    :return: the items in the queue
+    :rtype: list
+    """
+    items = []
+    while True:
+        try:
+            items.append(queue.get_nowait())
+        except Empty:
+            return items
+
+
+def _store_result(results, remaining, problems, options, tasks, index,
+                  result, checkpoint=None, cache=None):
+    """
+    Attach the problem and options to the result of a task and store it.
+    The result is also added to the checkpoint and cache, if there are any.
+
+    :param results: the results of all tasks, updated in place
+    :type results: list
+    :param remaining: the number of unfinished tasks for each problem,
+                      updated in place
+    :type remaining: list of int
+    :param problems: the parsed problems
+    :type problems: list of FittingProblem
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+    :param tasks: all of the tasks
+    :type tasks: list of FitTask
+    :param index: the index of the task the result is for
+    :type index: int
+    :param result: the result of the task
+    :type result: fitbenchmarking.utils.fitbm_result.FittingResult
+    :param checkpoint: journal to record the result in
+    :type checkpoint: fitbenchmarking.utils.checkpoint.Checkpoint
+    :param cache: cache to store the result in
+    :type cache: fitbenchmarking.utils.result_cache.ResultCache
+    """
+    task = tasks[index]
+    problem = problems[task.problem_index]
+    result.problem = problem
+    result.options = options
+    results[index] = result
+    record_result(parameter_set=task.parameter_set,
+                  software=task.software,
+                  result=result,
+                  checkpoint=checkpoint,
+                  cache=cache)
+
+    remaining[task.problem_index] -= 1
+    if remaining[task.problem_index] == 0:
+        print("    Completed {0} {1}/{2}".format(
+            problem.name, task.problem_index + 1, len(problems)))
+
+
+def _failed_result(task, problems, options):
+    """
+    Create the result for a task which raised an error or whose worker
+    exited before it finished.
+
+    :param task: the task that failed
+    :type task: FitTask
+    :param problems: the parsed problems
+    :type problems: list of FittingProblem
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: a result with error flag 3 and infinite chi_sq and runtime
+    :rtype: fitbenchmarking.utils.fitbm_result.FittingResult
+    """
+    problem = problems[task.problem_index]
+    initial_params = list(problem.starting_values[task.parameter_set].values())
+    return FittingResult(
+        options=options, problem=problem, chi_sq=np.inf, runtime=np.inf,
+        minimizer=task.minimizer,
+        ini_function_params=problem.get_function_params(initial_params),
+        fin_function_params=problem.get_function_params(None),
+        error_flag=3)
+
+
+def assemble_results(tasks, task_results, problems, options):
+    """
+    Reassemble the results of the tasks into the nested structure returned by
+    fitbm_one_prob for each problem.
+
+    :param tasks: the tasks that were run
+    :type tasks: list of FitTask
+    :param task_results: the result for each task
+    :type task_results: list of
+                        fitbenchmarking.utils.fitbm_result.FittingResult
+    :param problems: the parsed problems
+    :type problems: list of FittingProblem
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: for each problem, a list with a dict per starting value
+             containing the list of results for each software
+             e.g. results[problem][starting_value][software]
+    :rtype: list of list of dict
+    """
+    results = [[{s: [] for s in options.software}
+                for _ in p.starting_values]
+               for p in problems]
+    for task, result in zip(tasks, task_results):
+        results[task.problem_index][task.parameter_set][task.software].append(
+            result)
+    return results
+
+
+def memory_usage():
+    """
+    Get the memory used by the current process.
+
+    :return: the resident set size in MB, or 0 if it cannot be found
+    :rtype: float
+    """
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 1024.0**2
+    except (IOError, OSError, AttributeError):
+        pass
+    if resource is None:
+        return 0.0
+    # This is the peak usage, in bytes on macOS and kB elsewhere
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return max_rss / 1024.0**2
+    return max_rss / 1024.0
+
+
+class _Worker(object):
+    """
+    A worker process and the index of the task it is running.
+    Each worker has its own task queue so that the main process knows which
+    task was lost if the worker dies.
+    """
+
+    def __init__(self, options, result_queue):
+        """
+        :param options: all the information specified by the user
+        :type options: fitbenchmarking.utils.options.Options
+        :param result_queue: queue for the worker to put results in
+        :type result_queue: multiprocessing.Queue
+        """
+        self.options = options
+        self.result_queue = result_queue
+        self.current = None
+        self.task_queue = None
+        self.process = None
+        self._start()
+
+    def _start(self):
+        """
+        Start a new worker process.
+        The process is not daemonic so that it can run fits in child
+        processes when a fit timeout is set.
+        """
+        self.task_queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=_worker_loop,
+            args=(self.options, self.task_queue, self.result_queue))
+        self.process.start()
+
+    def run(self, index, task):
+        """
+        Send a task to the worker.
+
+        :param index: the index of the task
+        :type index: int
+        :param task: the task to run
+        :type task: FitTask
+        """
+        self.current = index
+        self.task_queue.put((index, task))
+
+    def replace(self):
+        """
+        Stop the worker process and start a fresh one.
+        """
+        self.stop()
+        self._start()
+
+    def stop(self):
+        """
+        Stop the worker process, terminating it if it does not exit.
+        """
+        if self.process.is_alive():
+            self.task_queue.put(None)
+            self.process.join(WORKER_POLL_INTERVAL)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+
+def _worker_loop(options, task_queue, result_queue):
+    """
+    Main function of a worker process.
+    Runs tasks from the task queue until a stop signal (None) is received.
+
+    The worker exits after options.max_tasks_per_worker tasks or once it uses
+    more than options.max_worker_memory MB, so that memory leaked by the
+    fitting software is returned to the system. It is replaced by the main
+    process.
+
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+    :param task_queue: queue of (index, task) pairs to run
+    :type task_queue: multiprocessing.Queue
+    :param result_queue: queue to put (index, result, error, retiring) tuples
+                         in
+    :type result_queue: multiprocessing.Queue
+    """
+    _WORKER_STATE['options'] = options
+    configure_plan_cache(options)
+    num_tasks = 0
+    while True:
+        indexed_task = task_queue.get()
+        if indexed_task is None:
+            break
+        num_tasks += 1
+        result, error = None, None
+        try:
+            _, result = _run_task(indexed_task)
+        # Errors are passed back to the main process, which records a
+        # failed result for the task
+        # pylint: disable=broad-except
+        except Exception as excp:
+            try:
+                pickle.dumps(excp)
+                error = excp
+            # pylint: disable=broad-except
+            except Exception:
+                error = RuntimeError(str(excp))
+
+        retiring = 0 < options.max_tasks_per_worker <= num_tasks \
+            or 0 < options.max_worker_memory <= memory_usage()
+        result_queue.put((indexed_task[0], result, error, retiring))
+        if retiring:
+            break
+
+
+def _run_task(indexed_task):
+    """
+    Run a single task in a worker process.
+
+    The problem and options are stripped from the result before it is
+    returned, as the problem function cannot be pickled and both are already
+    available in the main process.
+
+    :param indexed_task: the index of the task and the task to run
+    :type indexed_task: tuple(int, FitTask)
+
+    :return: the index of the task and the result of the fit
+    :rtype: tuple(int, fitbenchmarking.utils.fitbm_result.FittingResult)
+    """
+    index, task = indexed_task
+    options = _WORKER_STATE['options']
+    grabbed_output = output_grabber.OutputGrabber()
+
+    cached_problems = _WORKER_STATE['problems']
+    if task.problem_file in cached_problems:
+        problem, controllers = cached_problems.pop(task.problem_file)
+    else:
+        with grabbed_output:
+            problem = parse_problem_file(task.problem_file)
+            problem.correct_data(options.use_errors)
+            problem.jacobian_method = options.jacobian_method
+        controllers = {}
+        if len(cached_problems) >= MAX_CACHED_PROBLEMS:
+            cached_problems.popitem(last=False)
+    cached_problems[task.problem_file] = (problem, controllers)
+
+    # As in the serial path, a controller is only shared between the
+    # minimizers for one starting value
+    key = (task.software, task.parameter_set)
+    if key not in controllers:
+        with grabbed_output:
+            controller = create_controller(problem=problem,
+                                           software=task.software,
+                                           options=options)
+        controller.parameter_set = task.parameter_set
+        controllers[key] = controller
+
+    controller = controllers[key]
+    result = benchmark_minimizer(controller=controller,
+                                 minimizer=task.minimizer,
+                                 options=options)
+    result.problem = None
+    result.options = None
+    return index, result
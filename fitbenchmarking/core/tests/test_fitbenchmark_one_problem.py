@@ -1,7 +1,46 @@
 from __future__ import (absolute_import, division, print_function)
+import time
 import unittest
 
-import fitbenchmarking.core.fitbenchmark_one_problem
+import numpy as np
+
+from fitbenchmarking.core import fitbenchmark_one_problem
+from fitbenchmarking.parsing.fitting_problem import FittingProblem
+from fitbenchmarking.utils.exceptions import FitTimeoutError
+from fitbenchmarking.utils.fitbm_result import FittingResult
+from fitbenchmarking.utils.options import Options
+
+
+class DummyController(object):
+    """
+    Minimal controller used to test running fits in a child process.
+    """
+
+    def __init__(self, fit_time=0.0):
+        self.fit_time = fit_time
+        self.problem = FittingProblem()
+        self.problem.function = lambda x, a, b: a * x + b
+        # Approximate the Jacobian, so that it evaluates the model
+        self.problem.use_dual_numbers = False
+        self.problem.data_x = np.array([1.0, 2.0, 3.0])
+        self.problem.data_y = np.array([2.0, 4.0, 6.0])
+        self.minimizer = 'dummy'
+        self.initial_params = None
+        self.final_params = None
+        self.results = None
+        self.flag = None
+
+    def prepare(self):
+        self.initial_params = [1.0, 2.0]
+
+    def fit(self):
+        time.sleep(self.fit_time)
+        self.problem.eval_r(self.initial_params)
+        self.problem.eval_j(self.initial_params)
+
+    def cleanup(self):
+        self.final_params = [3.0, 4.0]
+        self.flag = 0
 
 
 class FitbmOneProbTests(unittest.TestCase):
@@ -12,5 +51,123 @@ class BenchmarkTests(unittest.TestCase):
     pass
 
 
+class RunFitTests(unittest.TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.options.num_runs = 3
+
+    def test_fixed_runs(self):
+        controller = DummyController()
+        runtimes = fitbenchmark_one_problem.run_fit(controller=controller,
+                                                    options=self.options)
+        self.assertEqual(len(runtimes), 3)
+        self.assertEqual(controller.final_params, [3.0, 4.0])
+
+    def test_eval_stats_per_run(self):
+        controller = DummyController()
+        runtimes = fitbenchmark_one_problem.run_fit(controller=controller,
+                                                    options=self.options)
+        # The counts are reset for each run
+        self.assertEqual(len(set(run['nfev'] for run in runtimes)), 1)
+        for run in runtimes:
+            # The residuals and at least one evaluation for the Jacobian
+            self.assertGreaterEqual(run['nfev'], 2)
+            self.assertEqual(run['njev'], 1)
+            self.assertGreater(run['model_time'], 0)
+
+    def test_adaptive_runs_max(self):
+        self.options.adaptive_runs = True
+        self.options.min_runs = 2
+        self.options.max_runs = 5
+        self.options.target_ci_width = 0.0
+        controller = DummyController()
+        runtimes = fitbenchmark_one_problem.run_fit(controller=controller,
+                                                    options=self.options)
+        self.assertEqual(len(runtimes), 5)
+
+    def test_adaptive_runs_budget(self):
+        self.options.adaptive_runs = True
+        self.options.min_runs = 10
+        self.options.timing_budget = 0.01
+        controller = DummyController(fit_time=0.02)
+        runtimes = fitbenchmark_one_problem.run_fit(controller=controller,
+                                                    options=self.options)
+        self.assertEqual(len(runtimes), 1)
+
+
+class SetEvalStatsTests(unittest.TestCase):
+
+    def test_overhead(self):
+        options = Options()
+        result = FittingResult(options=options)
+        result.timings = {'wall': [1.0, 2.0]}
+        eval_stats = {'nfev': [10, 12],
+                      'njev': [2, 2],
+                      'model_time': [0.4, 0.6],
+                      'jacobian_time': [0.1, 0.1],
+                      'callback_time': [0.6, 0.8],
+                      'residual_cache_hits': [1, 1],
+                      'residual_cache_misses': [9, 11]}
+        fitbenchmark_one_problem.set_eval_stats(result=result,
+                                                eval_stats=eval_stats)
+        self.assertEqual(result.nfev, 12)
+        self.assertEqual(result.njev, 2)
+        self.assertEqual(result.residual_cache_misses, 11)
+        self.assertEqual(list(result.overhead.keys()),
+                         ['model', 'jacobian', 'harness', 'solver'])
+        expected = [0.5, 0.1, 0.1, 0.8]
+        for value, e in zip(result.overhead.values(), expected):
+            self.assertAlmostEqual(value, e)
+        self.assertAlmostEqual(sum(result.overhead.values()), 1.5)
+
+    def test_model_time_mean(self):
+        """
+        The model time is the mean of the runs whatever the runtime statistic
+        """
+        options = Options()
+        options.runtime_statistic = 'iqr'
+        result = FittingResult(options=options)
+        result.timings = {'wall': [1.0]}
+        eval_stats = {'nfev': [10],
+                      'njev': [2],
+                      'model_time': [0.4],
+                      'jacobian_time': [0.1],
+                      'callback_time': [0.6],
+                      'residual_cache_hits': [1],
+                      'residual_cache_misses': [9]}
+        fitbenchmark_one_problem.set_eval_stats(result=result,
+                                                eval_stats=eval_stats)
+        self.assertAlmostEqual(result.model_time, 0.4)
+
+
+class RunFitIsolatedTests(unittest.TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.options.num_runs = 3
+        self.options.fit_timeout = 10
+
+    def test_attributes_copied_back(self):
+        controller = DummyController()
+        runtimes = fitbenchmark_one_problem.run_fit_isolated(
+            controller=controller, options=self.options)
+        self.assertEqual(len(runtimes), 3)
+        self.assertEqual(controller.initial_params, [1.0, 2.0])
+        self.assertEqual(controller.final_params, [3.0, 4.0])
+        self.assertEqual(controller.flag, 0)
+        self.assertEqual(runtimes[-1]['njev'], 1)
+
+    def test_timeout(self):
+        controller = DummyController(fit_time=30)
+        self.options.num_runs = 1
+        self.options.fit_timeout = 0.5
+        start = time.time()
+        with self.assertRaises(FitTimeoutError):
+            fitbenchmark_one_problem.run_fit_isolated(
+                controller=controller, options=self.options)
+        self.assertLess(time.time() - start, 10)
+
+
 if __name__ == "__main__":
     unittest.main()
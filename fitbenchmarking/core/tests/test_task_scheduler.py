@@ -0,0 +1,234 @@
+from __future__ import (absolute_import, division, print_function)
+from collections import OrderedDict
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from fitbenchmarking.core import task_scheduler
+from fitbenchmarking.parsing.fitting_problem import FittingProblem
+from fitbenchmarking.utils.exceptions import UnknownMinimizerError
+from fitbenchmarking.utils.options import Options
+from fitbenchmarking.utils.runtime_history import RuntimeHistory
+
+
+def make_problem(name, num_starting_values):
+    """
+    Create a minimal problem with the given number of starting values.
+    """
+    problem = FittingProblem()
+    problem.name = name
+    problem.starting_values = [OrderedDict([('p1', i)])
+                               for i in range(num_starting_values)]
+    return problem
+
+
+class DummyResult(object):
+    """
+    Picklable result which records the task it was created for.
+    """
+
+    def __init__(self, index, minimizer):
+        self.index = index
+        self.minimizer = minimizer
+        self.error_flag = 0
+
+
+# Set by RunTasksTests before the workers are started
+_DUMMY_TASK_STATE = {'crash_file': None,
+                     'finish_time': None,
+                     'error_index': None}
+
+
+def run_dummy_task(indexed_task):
+    """
+    Replacement for task_scheduler._run_task which does not fit anything.
+
+    The first time the first task is run the worker crashes at finish_time.
+    The second task finishes just after this, so that it finishes while the
+    main process is replacing the crashed worker.
+    The task at error_index raises an error.
+    """
+    index, task = indexed_task
+    if index == _DUMMY_TASK_STATE['error_index']:
+        raise ValueError('Task {} failed'.format(index))
+    if index in [0, 1]:
+        delay = _DUMMY_TASK_STATE['finish_time'] - time.time()
+        time.sleep(max(delay + 0.001 * index, 0))
+    if index == 0 and not os.path.exists(_DUMMY_TASK_STATE['crash_file']):
+        open(_DUMMY_TASK_STATE['crash_file'], 'w').close()
+        os._exit(1)
+    return index, DummyResult(index, task.minimizer)
+
+
+class CreateTasksTests(unittest.TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.options.software = ['scipy', 'minuit']
+        self.options.minimizers = {'scipy': ['lm-scipy', 'trf'],
+                                   'minuit': ['minuit']}
+        self.problems = [make_problem('a', 2), make_problem('b', 1)]
+        self.files = ['a.txt', 'b.txt']
+
+    def test_serial_order(self):
+        tasks = task_scheduler.create_tasks(self.files, self.problems,
+                                            self.options)
+        actual = [(t.problem_index, t.parameter_set, t.software, t.minimizer)
+                  for t in tasks]
+        expected = [(0, 0, 'scipy', 'lm-scipy'),
+                    (0, 0, 'scipy', 'trf'),
+                    (0, 0, 'minuit', 'minuit'),
+                    (0, 1, 'scipy', 'lm-scipy'),
+                    (0, 1, 'scipy', 'trf'),
+                    (0, 1, 'minuit', 'minuit'),
+                    (1, 0, 'scipy', 'lm-scipy'),
+                    (1, 0, 'scipy', 'trf'),
+                    (1, 0, 'minuit', 'minuit')]
+        self.assertEqual(actual, expected)
+
+    def test_unknown_software(self):
+        self.options.software = ['foo']
+        with self.assertRaises(UnknownMinimizerError):
+            task_scheduler.create_tasks(self.files, self.problems,
+                                        self.options)
+
+
+class AssembleResultsTests(unittest.TestCase):
+
+    def test_nested_structure(self):
+        options = Options()
+        options.software = ['scipy', 'minuit']
+        options.minimizers = {'scipy': ['lm-scipy', 'trf'],
+                              'minuit': ['minuit']}
+        problems = [make_problem('a', 2), make_problem('b', 1)]
+        tasks = task_scheduler.create_tasks(['a.txt', 'b.txt'], problems,
+                                            options)
+        task_results = list(range(len(tasks)))
+
+        results = task_scheduler.assemble_results(tasks, task_results,
+                                                  problems, options)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][0], {'scipy': [0, 1], 'minuit': [2]})
+        self.assertEqual(results[0][1], {'scipy': [3, 4], 'minuit': [5]})
+        self.assertEqual(results[1][0], {'scipy': [6, 7], 'minuit': [8]})
+
+
+class EstimateCostTests(unittest.TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.options.num_runs = 2
+        self.problem = make_problem('a', 1)
+        self.problem.data_x = np.zeros(1000)
+        self.task = task_scheduler.FitTask(0, 'a.txt', 0, 'scipy', 'trf')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.history = RuntimeHistory(os.path.join(self.tmp_dir, 'h.json'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_uses_history(self):
+        self.history.add('a', 'scipy', 'trf', 3.0)
+        cost = task_scheduler.estimate_cost(self.task, self.problem,
+                                            self.history, self.options)
+        self.assertEqual(cost, 6.0)
+
+    def test_estimate_without_history(self):
+        cost = task_scheduler.estimate_cost(self.task, self.problem,
+                                            self.history, self.options)
+        expected = task_scheduler.ESTIMATED_COST_PER_POINT * 1000 * 1 * 2
+        self.assertAlmostEqual(cost, expected)
+
+
+class FailedResultTests(unittest.TestCase):
+
+    def test_failed_result(self):
+        options = Options()
+        problem = make_problem('a', 2)
+        task = task_scheduler.FitTask(0, 'a.txt', 1, 'scipy', 'trf')
+
+        result = task_scheduler._failed_result(task, [problem], options)
+
+        self.assertEqual(result.error_flag, 3)
+        self.assertEqual(result.minimizer, 'trf')
+        self.assertEqual(result.chi_sq, np.inf)
+        self.assertEqual(result.runtime, np.inf)
+        self.assertEqual(result.ini_function_params, 'p1=1')
+        self.assertEqual(result.fin_function_params, 'p1=None')
+
+
+class RunTasksTests(unittest.TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.options.software = ['scipy']
+        self.options.minimizers = {'scipy': ['lm-scipy', 'trf', 'dogbox']}
+        self.options.num_workers = 2
+        self.problems = [make_problem('a', 2), make_problem('b', 1)]
+        for problem in self.problems:
+            problem.data_x = np.zeros(10)
+        self.tasks = task_scheduler.create_tasks(['a.txt', 'b.txt'],
+                                                 self.problems, self.options)
+        self.tmp_dir = tempfile.mkdtemp()
+        _DUMMY_TASK_STATE['crash_file'] = os.path.join(self.tmp_dir, 'crash')
+        _DUMMY_TASK_STATE['finish_time'] = time.time() + 0.5
+        _DUMMY_TASK_STATE['error_index'] = None
+        self.run_task = task_scheduler._run_task
+        self.poll_interval = task_scheduler.WORKER_POLL_INTERVAL
+        task_scheduler._run_task = run_dummy_task
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+        task_scheduler._run_task = self.run_task
+        task_scheduler.WORKER_POLL_INTERVAL = self.poll_interval
+
+    def test_retiring_workers(self):
+        """
+        Workers which exit after each task do not have their results
+        counted as lost or assigned to another task, including when they
+        exit while a crashed worker is being replaced
+        """
+        self.options.max_tasks_per_worker = 1
+        # Check for dead workers as often as possible
+        task_scheduler.WORKER_POLL_INTERVAL = 0
+
+        results = task_scheduler.run_tasks(self.tasks, self.problems,
+                                           self.options)
+
+        self.assertEqual([r.index for r in results],
+                         list(range(len(self.tasks))))
+        self.assertEqual([r.minimizer for r in results],
+                         [t.minimizer for t in self.tasks])
+        self.assertTrue(all(r.error_flag == 0 for r in results))
+
+    def test_task_error(self):
+        """
+        A task which raises an error is recorded as failed, and the other
+        tasks are still run
+        """
+        _DUMMY_TASK_STATE['error_index'] = 2
+
+        results = task_scheduler.run_tasks(self.tasks, self.problems,
+                                           self.options)
+
+        self.assertEqual(results[2].error_flag, 3)
+        self.assertEqual(results[2].minimizer, self.tasks[2].minimizer)
+        for i, result in enumerate(results):
+            if i != 2:
+                self.assertEqual(result.index, i)
+                self.assertEqual(result.error_flag, 0)
+
+
+class MemoryUsageTests(unittest.TestCase):
+
+    def test_memory_usage(self):
+        self.assertGreater(task_scheduler.memory_usage(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Functions for reading the data points of problems from text.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import warnings
+
+import numpy as np
+
+from fitbenchmarking.utils.exceptions import ParsingError
+
+# The number of lines parsed together when some lines of a file can not be
+# parsed by numpy
+BLOCK_SIZE = 1000
+
+
+def find_first_data_line(lines):
+    """
+    Find the first line of data, i.e. the first line which starts with a
+    number, so that any header before it can be skipped.
+
+    :param lines: The lines of the data file
+    :type lines: list of str
+
+    :return: The index of the first line of data
+    :rtype: int
+    """
+    for idx, line in enumerate(lines):
+        values = line.split()
+        if not values:
+            continue
+        try:
+            float(values[0])
+        except ValueError:
+            continue
+        return idx
+    raise ParsingError('Could not find data points')
+
+
+def read_data_points(lines, skip_invalid=False):
+    """
+    Read lines of whitespace separated numbers into an array with a row for
+    each line, ignoring blank lines. Values such as '-1.#IND' are not
+    numbers, so '#' does not start a comment.
+
+    The lines are parsed in bulk by numpy. Blocks of BLOCK_SIZE lines which
+    numpy can not parse are parsed one line at a time, to find the lines
+    with values which are not numbers.
+
+    :param lines: The lines of data
+    :type lines: list of str
+    :param skip_invalid: If True, lines with values which are not numbers
+                         are read as rows of nan, otherwise they raise an
+                         error
+    :type skip_invalid: bool
+
+    :return: The data points
+    :rtype: numpy array
+    """
+    try:
+        return _load_block(lines)
+    except ValueError:
+        pass
+
+    blocks = []
+    for start in range(0, len(lines), BLOCK_SIZE):
+        block = lines[start:start + BLOCK_SIZE]
+        try:
+            points = _load_block(block)
+        except ValueError:
+            points = _read_lines(block, skip_invalid)
+        if points.size:
+            blocks.append(points)
+
+    dims = set(points.shape[1] for points in blocks)
+    if len(dims) > 1:
+        raise ParsingError('Expected the same number of values in each line '
+                           'of data, got {}'.format(sorted(dims)))
+    if not blocks:
+        return np.zeros((0, 0))
+    return np.vstack(blocks)
+
+
+def _load_block(lines):
+    """
+    Parse lines of numbers with numpy.
+
+    :param lines: The lines of data
+    :type lines: list of str
+
+    :return: The data points
+    :rtype: numpy array
+    """
+    with warnings.catch_warnings():
+        # Blocks of blank lines are expected
+        warnings.simplefilter('ignore', UserWarning)
+        return np.loadtxt(lines, dtype=np.float64, comments=None, ndmin=2)
+
+
+def _read_lines(lines, skip_invalid):
+    """
+    Parse lines of numbers one at a time.
+
+    :param lines: The lines of data
+    :type lines: list of str
+    :param skip_invalid: If True, lines with values which are not numbers
+                         are read as rows of nan, otherwise they raise an
+                         error
+    :type skip_invalid: bool
+
+    :return: The data points
+    :rtype: numpy array
+    """
+    rows = []
+    dim = None
+    for line in lines:
+        values = line.split()
+        if not values:
+            continue
+        if dim is None:
+            dim = len(values)
+        elif len(values) != dim:
+            raise ParsingError('Expected {0} values in each line of data, '
+                               'got: {1}'.format(dim, line.strip()))
+        try:
+            rows.append([float(v) for v in values])
+        except ValueError:
+            if not skip_invalid:
+                raise ParsingError('Could not read the data point: '
+                                   '{}'.format(line.strip()))
+            rows.append([np.nan] * dim)
+
+    return np.array(rows, dtype=np.float64).reshape(len(rows), dim or 0)
@@ -0,0 +1,255 @@
+"""
+Forward mode automatic differentiation of numpy expressions with dual
+numbers, which carry the derivatives with respect to each parameter
+alongside their values.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+from fitbenchmarking.utils.exceptions import FittingProblemError
+
+
+class DualArray(NDArrayOperatorsMixin):
+    """
+    An array of values with the derivatives of each value with respect to p
+    variables.
+
+    The derivatives are stored in an array of shape (p,) + value.shape, with
+    a lane for each variable, so each operation updates all of the
+    derivatives with one vectorised numpy call. Arithmetic operators and the
+    ufuncs in UFUNC_RULES are supported.
+    """
+
+    def __init__(self, value, derivatives):
+        """
+        Create a dual array.
+
+        :param value: The values
+        :type value: array_like
+        :param derivatives: The derivatives, of shape (p,) + value.shape or
+                            a shape which broadcasts to it
+        :type derivatives: numpy array
+        """
+        #: *numpy array* The values
+        self.value = np.asarray(value)
+        #: *numpy array* The derivatives, with a lane for each variable
+        self.derivatives = np.asarray(derivatives)
+
+    def __repr__(self):
+        return 'DualArray({!r}, {!r})'.format(self.value, self.derivatives)
+
+    @property
+    def shape(self):
+        """
+        :return: The shape of the values
+        :rtype: tuple
+        """
+        return self.value.shape
+
+    def lanes(self, ndim):
+        """
+        Get the derivatives with the values' dimensions expanded to ndim, so
+        that they broadcast against plain arrays of up to ndim dimensions.
+
+        :param ndim: The number of dimensions of the values to broadcast to
+        :type ndim: int
+
+        :return: The derivatives
+        :rtype: numpy array
+        """
+        d = self.derivatives
+        missing = ndim - (d.ndim - 1)
+        if missing <= 0:
+            return d
+        return d.reshape(d.shape[:1] + (1,) * missing + d.shape[1:])
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """
+        Apply a numpy ufunc, differentiating it with the chain rule.
+        """
+        rule = UFUNC_RULES.get(ufunc)
+        if method != '__call__' or rule is None or kwargs:
+            return NotImplemented
+        for i in inputs:
+            if not isinstance(i, (DualArray, np.ndarray, int, float, complex,
+                                  np.number)):
+                return NotImplemented
+        values = [i.value if isinstance(i, DualArray) else np.asarray(i)
+                  for i in inputs]
+        ndim = np.broadcast(*values).ndim
+        lanes = [i.lanes(ndim) if isinstance(i, DualArray) else None
+                 for i in inputs]
+        return rule(values, lanes)
+
+
+def _value(value, derivatives):
+    """
+    Create the result of an operation, which is a plain array if none of
+    the inputs had derivatives.
+    """
+    if derivatives is None:
+        return value
+    return DualArray(value, derivatives)
+
+
+def _sum(a, b):
+    """
+    Add derivatives, either of which can be None for zero.
+    """
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a + b
+
+
+def _scale(d, factor):
+    """
+    Multiply derivatives, which can be None for zero, by a factor.
+    """
+    if d is None:
+        return None
+    return d * factor
+
+
+def _unary(function, derivative):
+    """
+    Create a rule for a function of one argument from the function and its
+    derivative.
+    """
+    def rule(values, lanes):
+        a, = values
+        da, = lanes
+        return _value(function(a), _scale(da, derivative(a)))
+    return rule
+
+
+def _add(values, lanes):
+    return _value(values[0] + values[1], _sum(*lanes))
+
+
+def _subtract(values, lanes):
+    return _value(values[0] - values[1],
+                  _sum(lanes[0], _scale(lanes[1], -1.0)))
+
+
+def _multiply(values, lanes):
+    a, b = values
+    da, db = lanes
+    return _value(a * b, _sum(_scale(da, b), _scale(db, a)))
+
+
+def _divide(values, lanes):
+    a, b = values
+    da, db = lanes
+    v = a / b
+    # d(a / b) = (da - v * db) / b
+    return _value(v, _scale(_sum(da, _scale(db, -v)), 1.0 / b))
+
+
+def _power(values, lanes):
+    a, b = values
+    da, db = lanes
+    v = a ** b
+    d = None
+    if da is not None:
+        d = da * (b * a ** (b - 1))
+    if db is not None:
+        d = _sum(d, db * (v * np.log(a)))
+    return _value(v, d)
+
+
+def _negative(values, lanes):
+    return _value(-values[0], _scale(lanes[0], -1.0))
+
+
+def _positive(values, lanes):
+    return _value(+values[0], lanes[0])
+
+
+#: The ufuncs which can be applied to DualArrays, and the rule for each
+UFUNC_RULES = {
+    np.add: _add,
+    np.subtract: _subtract,
+    np.multiply: _multiply,
+    np.true_divide: _divide,
+    np.power: _power,
+    np.negative: _negative,
+    np.positive: _positive,
+    np.exp: _unary(np.exp, np.exp),
+    np.log: _unary(np.log, lambda a: 1.0 / a),
+    np.sqrt: _unary(np.sqrt, lambda a: 0.5 / np.sqrt(a)),
+    np.sin: _unary(np.sin, np.cos),
+    np.cos: _unary(np.cos, lambda a: -np.sin(a)),
+    np.tan: _unary(np.tan, lambda a: 1.0 / np.cos(a) ** 2),
+    np.arctan: _unary(np.arctan, lambda a: 1.0 / (1.0 + a ** 2)),
+}
+# np.divide is np.true_divide in python 3, but not in python 2
+UFUNC_RULES.setdefault(np.divide, _divide)
+
+
+def variables(values):
+    """
+    Create a dual number for each of a set of variables, with derivative 1
+    with respect to itself and 0 with respect to the others.
+
+    :param values: The values of the variables
+    :type values: list of float
+
+    :return: The variables
+    :rtype: list of DualArray
+    """
+    seeds = np.eye(len(values))
+    return [DualArray(v, seed) for v, seed in zip(values, seeds)]
+
+
+def dual_jacobian(function):
+    """
+    Create a callable for the Jacobian of a model function with respect to
+    its parameters, which evaluates the function once with the parameters
+    as dual numbers.
+
+    The function must only use the arithmetic operators and UFUNC_RULES on
+    its parameters, otherwise the Jacobian raises a FittingProblemError.
+
+    :param function: The model function, called as function(x, \\*params)
+    :type function: callable
+
+    :return: callable, called as jacobian(x, \\*params), returning an array
+             of shape (len(x), len(params))
+    :rtype: callable
+    """
+    def jacobian(x, *params):
+        """
+        Evaluate the Jacobian of the function with respect to the parameters.
+
+        :param x: x data values
+        :type x: numpy array
+        :param params: parameter values
+        :type params: list
+
+        :return: the Jacobian, with a column for each parameter
+        :rtype: numpy array
+        """
+        x = np.asarray(x)
+        try:
+            result = function(x, *variables(params))
+        except (TypeError, ValueError, AttributeError) as e:
+            raise FittingProblemError('The function could not be evaluated '
+                                      'with dual numbers: {}'.format(e))
+        if not isinstance(result, DualArray):
+            # Dual numbers stored in numpy arrays lose their derivatives
+            if np.asarray(result).dtype == object:
+                raise FittingProblemError('The function converted the dual '
+                                          'numbers to an array')
+            # The function does not depend on the parameters
+            return np.zeros(x.shape + (len(params),))
+        derivatives = result.lanes(x.ndim)
+        derivatives = np.broadcast_to(derivatives,
+                                      (len(params),) + x.shape)
+        return np.moveaxis(derivatives, 0, -1).copy()
+
+    return jacobian
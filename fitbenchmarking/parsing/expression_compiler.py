@@ -0,0 +1,760 @@
+"""
+Compiler for the equations of NIST problems.
+
+An equation is parsed once into a graph of operations in which repeated
+subexpressions are only evaluated once, including those shared by the
+function and its derivatives (for example exp(-b2*x) in b1*exp(-b2*x)).
+The graph is evaluated with numpy ufuncs writing into buffers which are
+reused between calls, so evaluating the function only allocates the array
+which is returned.
+
+Compiled plans are kept in memory, and on disk if a plan cache directory is
+set, keyed by the equation, so later runs skip the compile step.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import ast
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from fitbenchmarking.parsing.dual_numbers import dual_jacobian
+from fitbenchmarking.parsing.nist_data_functions import (format_function_scipy,
+                                                         is_safe)
+from fitbenchmarking.utils.exceptions import ParsingError
+from fitbenchmarking.utils.logging_setup import logger
+
+try:
+    _NUMBER_NODE = ast.Constant
+except AttributeError:
+    # python < 3.8
+    _NUMBER_NODE = ast.Num
+
+# Increase this when the format of the plans changes, so that old plans on
+# disk are not used
+PLAN_VERSION = 1
+
+# The name of the directory in the cache directory which plans are saved in
+PLAN_CACHE_SUBDIR = 'expressions'
+
+_BINARY_OPERATIONS = {ast.Add: 'add', ast.Sub: 'sub', ast.Mult: 'mul',
+                      ast.Div: 'div', ast.Pow: 'pow'}
+
+_FUNCTIONS = {'np.exp': 'exp', 'np.sin': 'sin', 'np.cos': 'cos',
+              'np.tan': 'tan'}
+
+# The number of arguments of each operation which can be in a plan, other
+# than 'x', 'param' and 'const'
+_OPERATION_ARITY = {'add': 2, 'sub': 2, 'mul': 2, 'div': 2, 'pow': 2,
+                    'neg': 1, 'exp': 1, 'log': 1, 'sin': 1, 'cos': 1,
+                    'tan': 1}
+
+
+# The directory plans are saved in, or None to only keep them in memory
+_PLAN_CACHE = {'dir': None}
+
+# Plans which have been compiled or loaded by this process
+_PLANS = {}
+
+
+def set_plan_cache_dir(cache_dir):
+    """
+    Set the directory compiled plans are saved in.
+
+    :param cache_dir: The directory, or None to not save plans
+    :type cache_dir: str or None
+    """
+    _PLAN_CACHE['dir'] = cache_dir
+
+
+def configure_plan_cache(options):
+    """
+    Save compiled plans in the results cache directory if the cache is
+    used.
+
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+    """
+    cache_dir = None
+    if options.use_cache:
+        cache_dir = os.path.join(options.results_dir, options.cache_dir,
+                                 PLAN_CACHE_SUBDIR)
+    set_plan_cache_dir(cache_dir)
+
+
+class _GraphBuilder(object):
+    """
+    Builds a graph of operations, in which each distinct operation only
+    appears once.
+
+    Nodes are tuples of the operation name and its arguments, which are the
+    indices of earlier nodes, except for ('x',), ('param', index) and
+    ('const', value).
+    """
+
+    def __init__(self, param_names):
+        self.param_names = list(param_names)
+        self.nodes = []
+        self._index = {}
+
+    def add(self, node):
+        """
+        Get the index of a node, adding it if it is new. Operations on
+        constants are evaluated.
+
+        :param node: The node
+        :type node: tuple
+
+        :return: The index of the node
+        :rtype: int
+        """
+        op, args = node[0], node[1:]
+        if op not in ['x', 'param', 'const'] \
+                and all(self.nodes[a][0] == 'const' for a in args):
+            values = [np.float64(self.nodes[a][1]) for a in args]
+            node = ('const', float(_apply_scalar(op, values)))
+        if node not in self._index:
+            self._index[node] = len(self.nodes)
+            self.nodes.append(node)
+        return self._index[node]
+
+    def const(self, value):
+        return self.add(('const', float(value)))
+
+    def is_const(self, index, value):
+        node = self.nodes[index]
+        return node[0] == 'const' and node[1] == value
+
+    def op(self, name, *args):
+        """
+        Add an operation, simplifying operations with 0 and 1.
+        """
+        if name == 'add':
+            a, b = args
+            if self.is_const(a, 0.0):
+                return b
+            if self.is_const(b, 0.0):
+                return a
+        elif name == 'sub':
+            a, b = args
+            if self.is_const(b, 0.0):
+                return a
+            if self.is_const(a, 0.0):
+                return self.op('neg', b)
+        elif name == 'mul':
+            a, b = args
+            if self.is_const(a, 0.0) or self.is_const(b, 0.0):
+                return self.const(0.0)
+            if self.is_const(a, 1.0):
+                return b
+            if self.is_const(b, 1.0):
+                return a
+        elif name == 'div':
+            a, b = args
+            if self.is_const(a, 0.0):
+                return a
+            if self.is_const(b, 1.0):
+                return a
+        elif name == 'neg':
+            a, = args
+            if self.is_const(a, 0.0):
+                return a
+        return self.add((name,) + tuple(args))
+
+    def from_ast(self, node):
+        """
+        Add the nodes of a parsed expression.
+
+        :param node: The expression
+        :type node: ast.AST
+
+        :return: The index of the expression
+        :rtype: int
+        """
+        if isinstance(node, ast.Name):
+            if node.id == 'x':
+                return self.add(('x',))
+            if node.id in self.param_names:
+                return self.add(('param', self.param_names.index(node.id)))
+            raise ParsingError('Unknown variable in the equation: ' + node.id)
+        if isinstance(node, _NUMBER_NODE):
+            return self.const(getattr(node, 'value', getattr(node, 'n', 0)))
+        if isinstance(node, ast.Attribute) and _name(node) == 'np.pi':
+            return self.const(np.pi)
+        if isinstance(node, ast.UnaryOp):
+            if isinstance(node.op, ast.USub):
+                return self.add(('neg', self.from_ast(node.operand)))
+            if isinstance(node.op, ast.UAdd):
+                return self.from_ast(node.operand)
+        if isinstance(node, ast.BinOp) \
+                and type(node.op) in _BINARY_OPERATIONS:
+            return self.add((_BINARY_OPERATIONS[type(node.op)],
+                             self.from_ast(node.left),
+                             self.from_ast(node.right)))
+        if isinstance(node, ast.Call) and _name(node.func) in _FUNCTIONS \
+                and len(node.args) == 1 and not node.keywords:
+            return self.add((_FUNCTIONS[_name(node.func)],
+                             self.from_ast(node.args[0])))
+        raise ParsingError('Unexpected element in the equation: '
+                           + type(node).__name__)
+
+    def derivative(self, index, param, memo):
+        """
+        Add the nodes of the derivative of a node with respect to a
+        parameter.
+
+        :param index: The index of the node
+        :type index: int
+        :param param: The index of the parameter
+        :type param: int
+        :param memo: The derivatives found so far, by node index
+        :type memo: dict
+
+        :return: The index of the derivative
+        :rtype: int
+        """
+        if index in memo:
+            return memo[index]
+        node = self.nodes[index]
+        op, args = node[0], node[1:]
+        if op == 'param':
+            d = self.const(1.0 if args[0] == param else 0.0)
+        elif op in ['x', 'const']:
+            d = self.const(0.0)
+        else:
+            da = [self.derivative(a, param, memo) for a in args]
+            d = self._chain_rule(index, op, args, da)
+        memo[index] = d
+        return d
+
+    def _chain_rule(self, index, op, args, da):
+        """
+        Add the derivative of an operation given the derivatives of its
+        arguments.
+        """
+        if all(self.is_const(d, 0.0) for d in da):
+            return self.const(0.0)
+        if op in ['add', 'sub']:
+            return self.op(op, *da)
+        if op == 'neg':
+            return self.op('neg', da[0])
+        if op == 'mul':
+            a, b = args
+            return self.op('add', self.op('mul', da[0], b),
+                           self.op('mul', a, da[1]))
+        if op == 'div':
+            # d(a / b) = da / b - (a / b) * db / b
+            a, b = args
+            return self.op('sub', self.op('div', da[0], b),
+                           self.op('div', self.op('mul', index, da[1]), b))
+        if op == 'pow':
+            # d(a**b) = b * a**(b - 1) * da + a**b * log(a) * db
+            a, b = args
+            d = self.op('mul',
+                        self.op('mul', b,
+                                self.op('pow', a,
+                                        self.op('sub', b, self.const(1.0)))),
+                        da[0])
+            if not self.is_const(da[1], 0.0):
+                d = self.op('add', d,
+                            self.op('mul',
+                                    self.op('mul', index,
+                                            self.op('log', a)),
+                                    da[1]))
+            return d
+        a, = args
+        if op == 'exp':
+            outer = index
+        elif op == 'sin':
+            outer = self.op('cos', a)
+        elif op == 'cos':
+            outer = self.op('neg', self.op('sin', a))
+        elif op == 'tan':
+            cos_a = self.op('cos', a)
+            outer = self.op('div', self.const(1.0),
+                            self.op('mul', cos_a, cos_a))
+        elif op == 'log':
+            outer = self.op('div', self.const(1.0), a)
+        else:
+            raise ParsingError('Can not differentiate ' + op)
+        return self.op('mul', outer, da[0])
+
+
+def _name(node):
+    """
+    Get the dotted name of a name or attribute node.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return _name(node.value) + '.' + node.attr
+    return None
+
+
+def _apply_scalar(op, values):
+    """
+    Apply an operation to scalars.
+    """
+    return _UFUNC_NAMES[op](*values)
+
+
+def _plan_key(equation, param_names):
+    """
+    Get the key of the plan for an equation.
+    """
+    definition = [PLAN_VERSION, equation, list(param_names)]
+    return hashlib.sha256(repr(definition).encode('utf-8')).hexdigest()
+
+
+def compile_plan(equation, param_names):
+    """
+    Compile an equation into a plan: the graph of the function and its
+    derivatives with respect to each parameter.
+
+    :param equation: The equation of a NIST problem
+    :type equation: str
+    :param param_names: names of the parameters in the equation
+    :type param_names: list
+
+    :return: The plan, with the nodes of the graph ('nodes'), the index of
+             the function ('function') and of the derivative with respect
+             to each parameter ('jacobian')
+    :rtype: dict
+    """
+    function_scipy_format = format_function_scipy(equation)
+    if not is_safe(function_scipy_format):
+        raise ParsingError('Error while sanitizing input')
+    try:
+        tree = ast.parse(function_scipy_format.strip(), mode='eval').body
+    except SyntaxError:
+        raise ParsingError('Could not parse the equation: ' + equation)
+
+    builder = _GraphBuilder(param_names)
+    function = builder.from_ast(tree)
+    jacobian = [builder.derivative(function, i, {})
+                for i in range(len(builder.param_names))]
+    return {'version': PLAN_VERSION,
+            'equation': equation,
+            'param_names': builder.param_names,
+            'nodes': [list(n) for n in builder.nodes],
+            'function': function,
+            'jacobian': jacobian}
+
+
+def load_plan(equation, param_names):
+    """
+    Get the plan for an equation, from memory or the plan cache directory if
+    it has been compiled before.
+
+    :param equation: The equation of a NIST problem
+    :type equation: str
+    :param param_names: names of the parameters in the equation
+    :type param_names: list
+
+    :return: The plan
+    :rtype: dict
+    """
+    param_names = list(param_names)
+    key = _plan_key(equation, param_names)
+    if key in _PLANS:
+        return _PLANS[key]
+
+    cache_dir = _PLAN_CACHE['dir']
+    file_name = None
+    plan = None
+    if cache_dir is not None:
+        file_name = os.path.join(cache_dir, key + '.json')
+        try:
+            with open(file_name, 'r') as f:
+                plan = json.load(f)
+        except (IOError, OSError):
+            pass
+        except ValueError:
+            logger.warning('Ignoring the unreadable plan %s.', file_name)
+        if plan is not None and not _is_valid_plan(plan, equation,
+                                                   param_names):
+            # Plans are turned into code, so anything which was not written
+            # by compile_plan is compiled again
+            logger.warning('Ignoring the invalid plan %s.', file_name)
+            plan = None
+        if plan is not None:
+            # Mark the plan as recently used for the cache eviction
+            try:
+                os.utime(file_name, None)
+            except (IOError, OSError):
+                pass
+
+    if plan is None:
+        plan = compile_plan(equation, param_names)
+        if file_name is not None:
+            _save_plan(plan, file_name)
+
+    _PLANS[key] = plan
+    return plan
+
+
+def _is_valid_plan(plan, equation, param_names):
+    """
+    Check that a plan read from a file is one compile_plan could have
+    created for an equation: every operation is known, has the right
+    number of arguments and only uses earlier nodes, and every constant is
+    a number.
+
+    :param plan: The plan
+    :type plan: object
+    :param equation: The equation of a NIST problem
+    :type equation: str
+    :param param_names: names of the parameters in the equation
+    :type param_names: list
+
+    :return: Whether the plan can be used
+    :rtype: bool
+    """
+    if not isinstance(plan, dict) \
+            or plan.get('version') != PLAN_VERSION \
+            or plan.get('equation') != equation \
+            or plan.get('param_names') != param_names:
+        return False
+    nodes = plan.get('nodes')
+    if not isinstance(nodes, list):
+        return False
+
+    def is_index(value, end):
+        # bool is a subclass of int
+        return type(value) is int and 0 <= value < end
+
+    for i, node in enumerate(nodes):
+        if not isinstance(node, list) or not node \
+                or not isinstance(node[0], str):
+            return False
+        op, args = node[0], node[1:]
+        if op == 'x':
+            valid = not args
+        elif op == 'param':
+            valid = len(args) == 1 and is_index(args[0], len(param_names))
+        elif op == 'const':
+            valid = len(args) == 1 and type(args[0]) in (int, float)
+        elif op in _OPERATION_ARITY:
+            valid = len(args) == _OPERATION_ARITY[op] \
+                and all(is_index(a, i) for a in args)
+        else:
+            valid = False
+        if not valid:
+            return False
+
+    jacobian = plan.get('jacobian')
+    return is_index(plan.get('function'), len(nodes)) \
+        and isinstance(jacobian, list) \
+        and len(jacobian) == len(param_names) \
+        and all(is_index(j, len(nodes)) for j in jacobian)
+
+
+def _save_plan(plan, file_name):
+    """
+    Write a plan to a file, ignoring errors as the plan can be compiled
+    again.
+    """
+    try:
+        cache_dir = os.path.dirname(file_name)
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        # Write to a temporary file first so that a partly written plan is
+        # never read
+        tmp_file_name = '{0}.{1}.tmp'.format(file_name, os.getpid())
+        with open(tmp_file_name, 'w') as f:
+            json.dump(plan, f)
+        # os.rename does not overwrite on Windows, os.replace is python3 only
+        getattr(os, 'replace', os.rename)(tmp_file_name, file_name)
+    except (IOError, OSError) as e:
+        logger.warning('Could not save the plan %s: %s', file_name, e)
+
+
+class _Schedule(object):
+    """
+    The operations needed to evaluate some outputs of a plan, with the
+    buffer each operation on arrays writes into, generated as straight-line
+    python code.
+    """
+
+    def __init__(self, nodes, outputs, fresh_output):
+        """
+        :param nodes: The nodes of the plan
+        :type nodes: list
+        :param outputs: The indices of the outputs
+        :type outputs: list of int
+        :param fresh_output: Whether the single output is written into a new
+                             array rather than a buffer
+        :type fresh_output: bool
+        """
+        needed = set()
+        stack = list(outputs)
+        while stack:
+            i = stack.pop()
+            if i not in needed:
+                needed.add(i)
+                if nodes[i][0] not in ['x', 'param', 'const']:
+                    stack.extend(nodes[i][1:])
+
+        #: *list of bool* Whether each node depends on x, and so is an
+        #: array rather than a scalar
+        self.is_array = [False] * len(nodes)
+        for i, node in enumerate(nodes):
+            if node[0] == 'x':
+                self.is_array[i] = True
+            elif node[0] not in ['param', 'const']:
+                self.is_array[i] = any(self.is_array[a] for a in node[1:])
+
+        order = sorted(needed)
+        # Parameters used in operations on scalars are converted to numpy
+        # scalars, so that they follow numpy's rules (e.g. for division by
+        # zero)
+        scalar_args = set()
+        for i in order:
+            if nodes[i][0] not in ['x', 'param', 'const'] \
+                    and not self.is_array[i]:
+                scalar_args.update(nodes[i][1:])
+        last_use = {}
+        for i in order:
+            if nodes[i][0] not in ['x', 'param', 'const']:
+                for a in nodes[i][1:]:
+                    last_use[a] = i
+        for i in outputs:
+            last_use[i] = len(nodes)
+
+        # Give each array operation a buffer, reusing buffers of values
+        # which are no longer needed
+        free = []
+        buffers = {}
+        self.num_buffers = 0
+        self.constants = []
+        lines = []
+        for i in order:
+            op, args = nodes[i][0], nodes[i][1:]
+            if op == 'x':
+                lines.append('v{} = x'.format(i))
+                continue
+            if op == 'param':
+                convert = '_float' if i in scalar_args else ''
+                lines.append('v{} = {}(params[{}])'.format(i, convert,
+                                                           args[0]))
+                continue
+            if op == 'const':
+                lines.append('v{} = _c[{}]'.format(i, len(self.constants)))
+                self.constants.append(np.float64(args[0]))
+                continue
+
+            if not self.is_array[i] and op in _SCALAR_OPERATORS:
+                # Operators on numpy scalars are quicker than ufuncs
+                lines.append('v{} = {}'.format(i, _SCALAR_OPERATORS[op].format(
+                    *['v{}'.format(a) for a in args])))
+                continue
+
+            out = ''
+            if self.is_array[i] and not (fresh_output and i == outputs[0]):
+                if free:
+                    buffer = free.pop()
+                else:
+                    buffer = self.num_buffers
+                    self.num_buffers += 1
+                buffers[i] = buffer
+                out = ', out=b{}'.format(buffer)
+            name = _ufunc_name(op, args, nodes, self.is_array)
+            inputs = args[:1] if name in ['_square', '_sqrt',
+                                          '_reciprocal'] else args
+            lines.append('v{} = {}({}{})'.format(
+                i, name, ', '.join('v{}'.format(a) for a in inputs), out))
+            # Arguments used for the last time release their buffers after
+            # this operation, so an operation never writes into the buffer
+            # of one of its arguments
+            for a in set(args):
+                if last_use.get(a) == i and a in buffers:
+                    free.append(buffers[a])
+
+        lines.append('return ({},)'.format(
+            ', '.join('v{}'.format(i) for i in outputs)))
+        unpack = ''.join('b{}, '.format(b) for b in range(self.num_buffers))
+        if unpack:
+            lines.insert(0, '{}= buffers'.format(unpack))
+        self.source = 'def evaluate(x, params, buffers):\n' \
+            + ''.join('    {}\n'.format(line) for line in lines)
+
+    def compile(self):
+        """
+        Compile the generated code.
+
+        :return: The function, called as evaluate(x, params, buffers) and
+                 returning a tuple of the outputs
+        :rtype: callable
+        """
+        # The source only contains generated names, indices and ufuncs
+        # pylint: disable=exec-used
+        global_dict = {'__builtins__': {}, '_float': np.float64,
+                       '_c': self.constants}
+        global_dict.update(('_' + name, ufunc)
+                           for name, ufunc in _UFUNC_NAMES.items())
+        local_dict = {}
+        exec(self.source, global_dict, local_dict)
+        return local_dict['evaluate']
+
+
+# Operations on scalars which are written as python operators
+_SCALAR_OPERATORS = {'add': '{} + {}', 'sub': '{} - {}', 'mul': '{} * {}',
+                     'div': '{} / {}', 'pow': '{} ** {}', 'neg': '-{}'}
+
+# The ufuncs which generated code can call, by name
+_UFUNC_NAMES = {'add': np.add, 'sub': np.subtract, 'mul': np.multiply,
+                'div': np.true_divide, 'neg': np.negative, 'exp': np.exp,
+                'log': np.log, 'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+                'pow': np.power, 'square': np.square, 'sqrt': np.sqrt,
+                'reciprocal': np.reciprocal}
+
+
+def _ufunc_name(op, args, nodes, is_array):
+    """
+    Get the name of the ufunc for an operation. Arrays raised to the
+    constant powers which numpy treats specially are evaluated in the same
+    way as numpy does.
+    """
+    if op == 'pow' and is_array[args[0]] and nodes[args[1]][0] == 'const':
+        special = {2.0: 'square', 0.5: 'sqrt', -1.0: 'reciprocal'}
+        op = special.get(nodes[args[1]][1], op)
+    return '_' + op
+
+
+class CompiledExpression(object):
+    """
+    A NIST model function evaluated from a compiled plan, with a jacobian
+    method for its exact derivatives.
+
+    Evaluation reuses buffers held by the instance, so an instance should
+    not be called from several threads at once. Parameters which are arrays
+    (as used by FittingProblem.eval_f_batch) or not real are passed to the
+    fallback function instead.
+    """
+
+    #: Parameters may be arrays which broadcast against x
+    vectorised = True
+    #: Parameters may be dual numbers, which are passed to the fallback
+    supports_dual_numbers = True
+
+    def __init__(self, plan, fallback):
+        """
+        :param plan: The plan from compile_plan or load_plan
+        :type plan: dict
+        :param fallback: The model function as plain numpy code, called as
+                         fallback(x, \\*params)
+        :type fallback: callable
+        """
+        self.plan = plan
+        self.fallback = fallback
+        self._fallback_jacobian = None
+        nodes = [tuple(n) for n in plan['nodes']]
+        self._function_schedule = _Schedule(nodes, [plan['function']],
+                                            fresh_output=True)
+        self._jacobian_schedule = _Schedule(nodes, list(plan['jacobian']),
+                                            fresh_output=False)
+        self._function = self._function_schedule.compile()
+        self._jacobian = self._jacobian_schedule.compile()
+        self._function_returns_array = \
+            self._function_schedule.is_array[plan['function']]
+        # The buffers for each schedule and the shape and type of x they
+        # were allocated for
+        self._buffers = {}
+
+    @classmethod
+    def from_equation(cls, equation, param_names, fallback):
+        """
+        Create the compiled expression for an equation, compiling it if
+        there is no plan for it.
+
+        :param equation: The equation of a NIST problem
+        :type equation: str
+        :param param_names: names of the parameters in the equation
+        :type param_names: list
+        :param fallback: The model function as plain numpy code
+        :type fallback: callable
+
+        :return: The compiled expression
+        :rtype: CompiledExpression
+        """
+        return cls(load_plan(equation, param_names), fallback)
+
+    def __call__(self, x, *params):
+        """
+        Evaluate the function.
+
+        :param x: x data values
+        :type x: numpy array
+        :param params: parameter values
+        :type params: list
+
+        :return: The function values, in a new array
+        :rtype: numpy array
+        """
+        if not _scalar_params(params):
+            return self.fallback(x, *params)
+        x = np.asarray(x)
+        result, = self._function(
+            x, params, self._get_buffers(self._function_schedule, x))
+        if not self._function_returns_array:
+            return np.full(x.shape, result)
+        if result is x:
+            return np.array(x, dtype=np.float64)
+        return result
+
+    def jacobian(self, x, *params):
+        """
+        Evaluate the derivatives of the function with respect to each
+        parameter.
+
+        :param x: x data values
+        :type x: numpy array
+        :param params: parameter values
+        :type params: list
+
+        :return: the Jacobian, with a column for each parameter
+        :rtype: numpy array
+        """
+        if not _scalar_params(params):
+            if self._fallback_jacobian is None:
+                self._fallback_jacobian = dual_jacobian(self.fallback)
+            return self._fallback_jacobian(x, *params)
+        x = np.asarray(x)
+        outputs = self._jacobian(
+            x, params, self._get_buffers(self._jacobian_schedule, x))
+        columns = np.empty((len(params),) + x.shape)
+        for column, value in zip(columns, outputs):
+            column[...] = value
+        return columns.T
+
+    def _get_buffers(self, schedule, x):
+        """
+        Get the buffers for a schedule, allocating them when the shape or
+        type of x changes.
+        """
+        key, buffers = self._buffers.get(schedule, (None, None))
+        if key != (x.shape, x.dtype):
+            dtype = np.result_type(x, np.float64)
+            buffers = [np.empty(x.shape, dtype=dtype)
+                       for _ in range(schedule.num_buffers)]
+            self._buffers[schedule] = ((x.shape, x.dtype), buffers)
+        return buffers
+
+
+def _scalar_params(params):
+    """
+    Check whether all parameters are real scalars.
+    """
+    for p in params:
+        # The type is checked first as it is much quicker than isinstance
+        if type(p) not in _REAL_TYPES \
+                and not isinstance(p, (int, float, np.integer, np.floating)):
+            return False
+    return True
+
+
+# The usual types of real parameters
+_REAL_TYPES = frozenset([float, int, np.float64])
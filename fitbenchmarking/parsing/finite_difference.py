@@ -0,0 +1,168 @@
+"""
+Finite difference approximations of Jacobians, which evaluate all of the
+perturbed parameter vectors in one call when the function supports it.
+
+The step sizes are those used by scipy.optimize.approx_derivative (without
+bounds), so the approximations are the same as scipy's.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import numpy as np
+
+from fitbenchmarking.utils.exceptions import FittingProblemError
+
+# The finite difference schemes, and the power of the machine epsilon used as
+# the relative step for each
+FD_METHODS = {'forward': 1 / 2,
+              'central': 1 / 3,
+              'complex_step': 1 / 2}
+
+
+def relative_step(x_dtype, f_dtype, method):
+    """
+    Get the relative step for a finite difference scheme, which is based on
+    the precision of the parameters and function values.
+
+    :param x_dtype: The type of the parameters
+    :type x_dtype: numpy dtype
+    :param f_dtype: The type of the function values
+    :type f_dtype: numpy dtype
+    :param method: The scheme, one of FD_METHODS
+    :type method: str
+
+    :return: The relative step
+    :rtype: float
+    """
+    eps = np.finfo(np.float64).eps
+    if np.issubdtype(x_dtype, np.inexact):
+        eps = np.finfo(x_dtype).eps
+        # The least precise of the parameters and function values is used
+        if np.issubdtype(f_dtype, np.inexact) \
+                and np.dtype(f_dtype).itemsize < np.dtype(x_dtype).itemsize:
+            eps = np.finfo(f_dtype).eps
+    return eps ** FD_METHODS[method]
+
+
+def absolute_step(x0, f_dtype, method):
+    """
+    Get the step for each parameter, which is the relative step scaled by the
+    size of the parameter if it is larger than 1. Steps are positive for
+    parameters which are 0.
+
+    :param x0: The parameters
+    :type x0: numpy array
+    :param f_dtype: The type of the function values
+    :type f_dtype: numpy dtype
+    :param method: The scheme, one of FD_METHODS
+    :type method: str
+
+    :return: The step for each parameter
+    :rtype: numpy array
+    """
+    sign_x0 = (x0 >= 0).astype(float) * 2 - 1
+    return relative_step(x0.dtype, f_dtype, method) * sign_x0 \
+        * np.maximum(1.0, np.abs(x0))
+
+
+def approx_jacobian(func, x0, method='forward', f0=None, batch_func=None,
+                    kwargs=None, func_accepts_out=False):
+    """
+    Approximate the Jacobian of a function with finite differences.
+
+    The perturbed parameter vectors are built as the rows of a matrix. If
+    batch_func is given they are evaluated with a single call to it,
+    otherwise func is called for each row.
+
+    :param func: The function, called as func(x, \\**kwargs) for a parameter
+                 vector x and returning a scalar or 1D array
+    :type func: callable
+    :param x0: The parameters to find the Jacobian at
+    :type x0: array_like
+    :param method: The scheme, one of FD_METHODS. The complex step scheme
+                   needs func to accept complex parameters.
+    :type method: str
+    :param f0: The value of func at x0 if it is already known. This is only
+               used by the forward scheme.
+    :type f0: numpy array, optional
+    :param batch_func: A function called as batch_func(X, \\**kwargs) for a
+                       matrix of parameter vectors X, returning the values of
+                       func at each row as the rows of a 2D array
+    :type batch_func: callable, optional
+    :param kwargs: Keyword arguments to pass to func and batch_func
+    :type kwargs: dict, optional
+    :param func_accepts_out: Whether func can be called as
+                             func(x, out=row, \\**kwargs) to write its
+                             values into an array, so that the values at each
+                             row are written straight into the matrix of
+                             values rather than into new arrays
+    :type func_accepts_out: bool, optional
+
+    :return: The Jacobian, of shape (len(f), len(x0)), or (len(x0),) if func
+             returns a scalar or array with 1 element
+    :rtype: numpy array
+    """
+    if method not in FD_METHODS:
+        raise FittingProblemError(
+            'Unknown finite difference method: {}. Choose from {}.'.format(
+                method, sorted(FD_METHODS)))
+    if kwargs is None:
+        kwargs = {}
+
+    x0 = np.atleast_1d(np.asarray(x0))
+    if not np.issubdtype(x0.dtype, np.floating):
+        x0 = x0.astype(np.float64)
+    if x0.ndim > 1:
+        raise FittingProblemError('The parameters must be a 1D array.')
+    n = x0.size
+
+    if method == 'forward' and f0 is None:
+        f0 = np.atleast_1d(func(x0, **kwargs))
+    # The step depends on the type of the function values, which are only
+    # known in advance if f0 is
+    f_dtype = np.float64 if f0 is None else np.asarray(f0).dtype
+    h = absolute_step(x0, f_dtype, method)
+
+    # The perturbed parameter vectors, one per row
+    diagonal = np.diag_indices(n)
+    if method == 'forward':
+        x_plus = np.tile(x0, (n, 1))
+        x_plus[diagonal] = x0 + h
+        x_matrix = x_plus
+        dx = (x0 + h) - x0
+    elif method == 'central':
+        x_minus = np.tile(x0, (n, 1))
+        x_minus[diagonal] = x0 - h
+        x_plus = np.tile(x0, (n, 1))
+        x_plus[diagonal] = x0 + h
+        x_matrix = np.concatenate([x_minus, x_plus])
+        dx = (x0 + h) - (x0 - h)
+    else:
+        x_matrix = np.tile(x0.astype(complex), (n, 1))
+        x_matrix[diagonal] += h * 1.j
+
+    if batch_func is not None:
+        f_matrix = np.asarray(batch_func(x_matrix, **kwargs))
+    elif func_accepts_out:
+        # The size and type of the values are only known once func has been
+        # called
+        first = np.atleast_1d(func(x_matrix[0], **kwargs))
+        f_matrix = np.empty((len(x_matrix), first.size), dtype=first.dtype)
+        f_matrix[0] = first
+        for x, row in zip(x_matrix[1:], f_matrix[1:]):
+            func(x, out=row, **kwargs)
+    else:
+        f_matrix = np.array([np.atleast_1d(func(x, **kwargs))
+                             for x in x_matrix])
+    f_matrix = f_matrix.reshape(len(x_matrix), -1)
+
+    if method == 'forward':
+        jac = (f_matrix - np.atleast_1d(f0)).T / dx
+    elif method == 'central':
+        jac = (f_matrix[n:] - f_matrix[:n]).T / dx
+    else:
+        jac = f_matrix.imag.T / h
+
+    if jac.shape[0] == 1:
+        return np.ravel(jac)
+    return jac
@@ -10,6 +10,8 @@ from collections import OrderedDict
 import numpy as np
 
 from fitbenchmarking.parsing.base_parser import Parser
+from fitbenchmarking.parsing.data_loading import (find_first_data_line,
+                                                  read_data_points)
 from fitbenchmarking.parsing.fitting_problem import FittingProblem
 from fitbenchmarking.utils.exceptions import MissingSoftwareError, ParsingError
 from fitbenchmarking.utils.logging_setup import logger
@@ -345,30 +347,53 @@ class FitbenchmarkParser(Parser):
         """
         Creates callable function
 
+        The sasmodels kernel is loaded on the first evaluation, and the data
+        and the model wrappers are created again only when x changes, so
+        repeated evaluations (e.g. for finite difference Jacobians) only
+        update the parameter values.
+
         :return: the model
         :rtype: callable
         """
         equation = self._parsed_func[0]['name']
         starting_values = self._get_starting_values()
         value_ranges = self._parse_range('parameter_ranges')
-        param_names = starting_values[0].keys()
-
-        def fitFunction(x, *tmp_params):
+        param_names = list(starting_values[0].keys())
 
-            model = load_model(equation)
+        # The kernel, and the wrappers for the last x evaluated
+        cache = {'model': None,
+                 'x': None,
+                 'model_wrapper': None,
+                 'func_wrapper': None}
 
-            data = empty_data1D(x)
-            param_dict = {name: value
-                          for name, value
-                          in zip(param_names, tmp_params)}
+        def fitFunction(x, *tmp_params):
 
-            model_wrapper = Model(model, **param_dict)
-            if value_ranges is not None:
-                for name, values in value_ranges.items():
-                    model_wrapper.__dict__[name].range(values[0], values[1])
-            func_wrapper = Experiment(data=data, model=model_wrapper)
+            if cache['model'] is None:
+                cache['model'] = load_model(equation)
+
+            if cache['x'] is None or not np.array_equal(x, cache['x']):
+                data = empty_data1D(x)
+                param_dict = {name: value
+                              for name, value
+                              in zip(param_names, tmp_params)}
+
+                model_wrapper = Model(cache['model'], **param_dict)
+                if value_ranges is not None:
+                    for name, values in value_ranges.items():
+                        model_wrapper.__dict__[name].range(values[0],
+                                                           values[1])
+                cache['x'] = np.array(x, copy=True)
+                cache['model_wrapper'] = model_wrapper
+                cache['func_wrapper'] = Experiment(data=data,
+                                                   model=model_wrapper)
+            else:
+                model_wrapper = cache['model_wrapper']
+                for name, value in zip(param_names, tmp_params):
+                    model_wrapper.__dict__[name].value = value
+                # Clear the theory stored for the previous parameters
+                cache['func_wrapper'].update()
 
-            return func_wrapper.theory()
+            return cache['func_wrapper'].theory()
 
         return fitFunction
 
@@ -385,37 +410,13 @@ class FitbenchmarkParser(Parser):
         with open(data_file_path, 'r') as f:
             data_text = f.readlines()
 
-        # Find the line where data starts
-        # i.e. the first line with a float on it
-        first_row = 0
+        # Skip the header, i.e. the lines before the first line which starts
+        # with a number
+        first_row = find_first_data_line(data_text)
 
-        # Loop until break statement
-        while True:
-            try:
-                line = data_text[first_row].strip()
-            except IndexError:
-                raise ParsingError('Could not find data points')
-            if line != '':
-                x_val = line.split()[0]
-                try:
-                    _ = float(x_val)
-                except ValueError:
-                    pass
-                else:
-                    break
-            first_row += 1
-
-        dim = len(data_text[first_row].split())
-        data_points = np.zeros((len(data_text)-first_row, dim))
-
-        for idx, line in enumerate(data_text[first_row:]):
-            point_text = line.split()
-            # Skip any values that can't be represented
-            try:
-                point = [float(val) for val in point_text]
-            except ValueError:
-                point = [np.nan for val in point_text]
-            data_points[idx, :] = point
+        # Any values that can't be represented are read as np.nan
+        data_points = read_data_points(data_text[first_row:],
+                                       skip_invalid=True)
 
         # Strip all np.nan entries
         data_points = data_points[~np.isnan(data_points[:, 0]), :]
@@ -5,15 +5,70 @@ parsed into before being passed to the controllers
 
 from __future__ import (absolute_import, division, print_function)
 
+from collections import OrderedDict
+import functools
 try:
     from itertools import izip_longest
 except ImportError:
     # python3
     from itertools import zip_longest as izip_longest
+import timeit
+
 import numpy as np
-from scipy.optimize._numdiff import approx_derivative
 
+from fitbenchmarking.parsing.dual_numbers import dual_jacobian
+from fitbenchmarking.parsing.finite_difference import approx_jacobian
 from fitbenchmarking.utils.exceptions import FittingProblemError
+from fitbenchmarking.utils.logging_setup import logger
+
+# The methods which are counted and timed
+INSTRUMENTED_METHODS = ['eval_f', 'eval_r', 'eval_r_norm', 'eval_j',
+                        'eval_f_batch', 'eval_r_batch']
+
+# The methods whose results are recorded in the convergence trace
+TRACED_METHODS = ['eval_r', 'eval_r_norm']
+
+# The default number of residual vectors kept by each problem for repeated
+# evaluations at the same parameters
+RESIDUAL_CACHE_SIZE = 4
+
+
+def _instrumented(method):
+    """
+    Decorator which counts the calls to a FittingProblem method and adds the
+    time spent in it to the problem's eval_counts and eval_times.
+    The time spent in calls which are not made from another instrumented
+    method is added to the problem's callback_time, and if the problem has a
+    trace the chi squared value of these calls to the TRACED_METHODS is
+    recorded.
+
+    :param method: The method to instrument
+    :type method: callable
+
+    :return: The instrumented method
+    :rtype: callable
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        outermost = self._eval_depth == 0
+        self._eval_depth += 1
+        start = timeit.default_timer()
+        try:
+            value = method(self, *args, **kwargs)
+        finally:
+            elapsed = timeit.default_timer() - start
+            self._eval_depth -= 1
+            self.eval_times[name] += elapsed
+            self.eval_counts[name] += 1
+            if outermost:
+                self.callback_time += elapsed
+        if outermost and self.trace is not None and name in TRACED_METHODS:
+            chi_sq = value if name == 'eval_r_norm' else np.dot(value, value)
+            self.trace.append(self.eval_counts['eval_f'], chi_sq)
+        return value
+    return wrapper
 
 
 class FittingProblem:
@@ -40,6 +95,10 @@ class FittingProblem:
         #: *string* Equation (function or model) to fit against data
         self.equation = None
 
+        # The function string of a Mantid problem, including the ties, which
+        # is not all in equation. Set by the FitBenchmark parser.
+        self._mantid_equation = None
+
         #: *float* The start of the range to fit model data over
         #: (if different from entire range)
         self.start_x = None
@@ -75,6 +134,27 @@ class FittingProblem:
         #: Callable function
         self.function = None
 
+        #: *callable* The Jacobian of function with respect to the
+        #: parameters if it is known exactly, called in the same way as
+        #: function and returning an array of shape (len(x), len(params)).
+        #: If it is None, eval_j differentiates function with dual numbers
+        #: if use_dual_numbers is set and function has a true
+        #: ``supports_dual_numbers`` attribute, and uses finite differences
+        #: otherwise.
+        self.jacobian = None
+
+        #: *bool* Whether eval_j tries to differentiate function with dual
+        #: numbers (see fitbenchmarking.parsing.dual_numbers) when jacobian
+        #: is None. Only functions known to be numpy expressions, which the
+        #: parsers mark with a true ``supports_dual_numbers`` attribute, are
+        #: differentiated, as other functions (e.g. from sasmodels or Mantid)
+        #: may store or reject the dual numbers.
+        self.use_dual_numbers = True
+
+        # The function differentiated with dual numbers and the callable for
+        # its Jacobian, or None if it could not be evaluated with them
+        self._dual_jacobian = (None, None)
+
         self._param_names = None
 
         # the sanitised name strips out commas and white spaces which is used
@@ -84,6 +164,71 @@ class FittingProblem:
         # The index for sorting the data (used in plotting)
         self.sorted_index = None
 
+        #: *dict* The number of calls to each of the INSTRUMENTED_METHODS
+        #: since reset_eval_stats was called
+        self.eval_counts = None
+
+        #: *dict* The total time in seconds spent in each of the
+        #: INSTRUMENTED_METHODS since reset_eval_stats was called.
+        #: Calls are nested, e.g. the time in eval_r includes the time in
+        #: eval_f.
+        self.eval_times = None
+
+        #: *float* The total time in seconds spent in calls to the
+        #: INSTRUMENTED_METHODS from outside this class since
+        #: reset_eval_stats was called
+        self.callback_time = None
+
+        #: *float* The part of the time in eval_f which was spent in
+        #: eval_j (approximating the Jacobian)
+        self.jacobian_model_time = None
+
+        #: *str* The finite difference scheme used by eval_j, one of
+        #: 'forward', 'central' and 'complex_step'
+        #: (see fitbenchmarking.parsing.finite_difference)
+        self.jacobian_method = 'forward'
+
+        #: *ConvergenceTrace* If set, the chi squared value of each call
+        #: to eval_r and eval_r_norm is recorded in this while it is
+        #: recording (see fitbenchmarking.utils.convergence_trace)
+        self.trace = None
+
+        #: *int* The number of residual vectors kept for repeated
+        #: evaluations of eval_r at the same parameters, 0 to disable this
+        self.residual_cache_size = RESIDUAL_CACHE_SIZE
+
+        #: *int* The number of evaluations of eval_r which were found in the
+        #: residual cache since reset_eval_stats was called
+        self.residual_cache_hits = None
+
+        #: *int* The number of evaluations of eval_r which were not found in
+        #: the residual cache since reset_eval_stats was called
+        self.residual_cache_misses = None
+
+        # The cached residuals, keyed by the dtype and bytes of the
+        # parameters, with the most recently used last
+        self._residual_cache = OrderedDict()
+        # The data the cached residuals were calculated for
+        self._residual_cache_data = None
+
+        #: *numpy array* 1 / data_e, set by correct_data and recalculated
+        #: if data_e is replaced
+        self.inv_data_e = None
+        # The data_e that inv_data_e was calculated from
+        self._inv_data_e_source = None
+
+        # Reused by eval_r_norm to calculate the residuals in
+        self._norm_buffer = None
+
+        # The number of instrumented methods currently being evaluated
+        self._eval_depth = 0
+
+        # Whether residuals are being evaluated at the perturbed parameters
+        # of a finite difference approximation, which are not cached
+        self._approximating_jacobian = False
+
+        self.reset_eval_stats()
+
     @property
     def param_names(self):
         """
@@ -118,6 +263,7 @@ class FittingProblem:
     def sanitised_name(self, value):
         raise FittingProblemError('sanitised_name should not be edited')
 
+    @_instrumented
     def eval_f(self, params, x=None):
         """
         Function evaluation method
@@ -137,7 +283,76 @@ class FittingProblem:
             x = self.data_x
         return self.function(x, *params)
 
-    def eval_r(self, params, x=None, y=None, e=None):
+    @_instrumented
+    def eval_f_batch(self, params_matrix, x=None):
+        """
+        Evaluate the function at several parameter vectors in one call.
+
+        Functions with a true ``vectorised`` attribute, such as those created
+        for NIST problems, are evaluated once with each parameter as a column
+        array which broadcasts against x. Other functions are evaluated for
+        each parameter vector in turn.
+
+        Each parameter vector is counted as a function evaluation.
+
+        :param params_matrix: The parameter vectors, one per row
+        :type params_matrix: numpy array of shape (k, p)
+        :param x: x data values or None, if None this uses self.data_x
+        :type x: numpy array
+
+        :return: The function values for each parameter vector, one per row
+        :rtype: numpy array of shape (k, len(x))
+        """
+        if self.function is None:
+            raise FittingProblemError('Cannot call function before setting '
+                                      'function.')
+        if x is None:
+            x = self.data_x
+        params_matrix = np.atleast_2d(params_matrix)
+        k = params_matrix.shape[0]
+
+        start = timeit.default_timer()
+        try:
+            if getattr(self.function, 'vectorised', False):
+                columns = [params_matrix[:, [i]]
+                           for i in range(params_matrix.shape[1])]
+                values = self.function(np.asarray(x)[np.newaxis, :], *columns)
+                # Expressions which do not use every parameter or x may not
+                # broadcast to the full shape
+                values = np.broadcast_to(values, (k, len(x)))
+            else:
+                values = np.array([self.function(x, *params)
+                                   for params in params_matrix])
+        finally:
+            # The model is evaluated k times as far as the statistics go
+            self.eval_counts['eval_f'] += k
+            self.eval_times['eval_f'] += timeit.default_timer() - start
+        return values
+
+    @_instrumented
+    def eval_r_batch(self, params_matrix, x=None, y=None, e=None):
+        """
+        Calculate the weighted residuals at several parameter vectors in one
+        call, using eval_f_batch. The residual cache is not used.
+
+        :param params_matrix: The parameter vectors, one per row
+        :type params_matrix: numpy array of shape (k, p)
+        :param x: x data points, defaults to self.data_x
+        :type x: numpy array, optional
+        :param y: y data points, defaults to self.data_y
+        :type y: numpy array, optional
+        :param e: error at each data point, defaults to self.data_e
+        :type e: numpy array, optional
+
+        :return: The residuals for each parameter vector, one per row
+        :rtype: numpy array of shape (k, len(y))
+        """
+        x, y, e = self._data_or_default(x, y, e)
+        return self._weighted_residuals(
+            f=self.eval_f_batch(params_matrix=params_matrix, x=x), y=y, e=e)
+
+    @_instrumented
+    def eval_r(self, params, x=None, y=None, e=None, out=None):
         """
         Calculate residuals and weight them if using errors
 
@@ -149,28 +364,44 @@ class FittingProblem:
         :type y: numpy array, optional
         :param e: error at each data point, defaults to self.data_e
         :type e: numpy array, optional
+        :param out: array to write the residuals into, which must have the
+                    shape of y and a floating point type. By default a new
+                    array is returned.
+        :type out: numpy array, optional
 
         :return: The residuals for the datapoints at the given parameters
         :rtype: numpy array
         """
-
-        if x is None and y is None and e is None:
-            x = self.data_x
-            y = self.data_y
-            e = self.data_e
-        elif x is None or y is None:
-            raise FittingProblemError('Residuals could not be computed with '
-                                      'only one of x and y.')
-
-        result = y - self.eval_f(params=params, x=x)
-        if e is not None:
-            result = result / e
+        x, y, e = self._data_or_default(x, y, e)
+
+        key = self._residual_cache_key(params, x, y, e)
+        if key is not None:
+            cached = self._residual_cache.pop(key, None)
+            if cached is not None:
+                self._residual_cache[key] = cached
+                self.residual_cache_hits += 1
+                # Copy so that the caller cannot change the cached value
+                if out is None:
+                    return cached.copy()
+                out[...] = cached
+                return out
+            self.residual_cache_misses += 1
+
+        result = self._weighted_residuals(
+            f=self.eval_f(params=params, x=x), y=y, e=e, out=out)
+
+        if key is not None:
+            self._cache_residuals(key, result)
         return result
 
+    @_instrumented
     def eval_r_norm(self, params, x=None, y=None, e=None):
         """
         Evaluate the square of the L2 norm of the residuals
 
+        The residuals are calculated in a buffer which is reused between
+        calls, so no arrays are allocated other than by the model.
+
         :param params: The parameters to calculate residuals for
         :type params: list
         :param x: x data points, defaults to self.data_x
@@ -184,26 +415,291 @@ class FittingProblem:
                  given parameters
         :rtype: numpy array
         """
-        r = self.eval_r(params=params, x=x, y=y, e=e)
+        x, y, e = self._data_or_default(x, y, e)
+
+        key = self._residual_cache_key(params, x, y, e)
+        if key is not None and key in self._residual_cache:
+            self.residual_cache_hits += 1
+            r = self._residual_cache[key]
+            return np.dot(r, r)
+
+        f = self.eval_f(params=params, x=x)
+        shape = np.broadcast(y, f).shape
+        dtype = np.result_type(y, f, np.float64)
+        buffer = self._norm_buffer
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._norm_buffer = buffer
+        r = self._weighted_residuals(f=f, y=y, e=e, out=buffer)
+        if key is not None:
+            self.residual_cache_misses += 1
+            self._cache_residuals(key, r)
         return np.dot(r, r)
 
-    def eval_j(self, params, func=None, **kwargs):
+    def _data_or_default(self, x, y, e):
+        """
+        Use the problem's data if none of x, y and e are given.
+
+        :param x: x data points
+        :type x: numpy array or None
+        :param y: y data points
+        :type y: numpy array or None
+        :param e: error at each data point
+        :type e: numpy array or None
+
+        :return: x, y and e
+        :rtype: tuple
+        """
+        if x is None and y is None and e is None:
+            return self.data_x, self.data_y, self.data_e
+        if x is None or y is None:
+            raise FittingProblemError('Residuals could not be computed with '
+                                      'only one of x and y.')
+        return x, y, e
+
+    def _weighted_residuals(self, f, y, e, out=None):
+        """
+        Calculate (y - f) / e with in-place operations, using the inverse
+        errors precomputed by correct_data when e is self.data_e.
+
+        :param f: The model values
+        :type f: numpy array
+        :param y: y data points
+        :type y: numpy array
+        :param e: error at each data point, or None for no weighting
+        :type e: numpy array or None
+        :param out: array to write the residuals into
+        :type out: numpy array, optional
+
+        :return: The residuals
+        :rtype: numpy array
+        """
+        if out is None:
+            out = np.empty(np.broadcast(y, f).shape,
+                           dtype=np.result_type(y, f, np.float64))
+        np.subtract(y, f, out=out)
+        if e is not None:
+            if e is self.data_e:
+                np.multiply(out, self._inverse_data_e(), out=out)
+            else:
+                np.divide(out, e, out=out)
+        return out
+
+    def _inverse_data_e(self):
+        """
+        Get 1 / data_e, recalculating it if data_e has been replaced since
+        it was calculated.
+
+        :return: The inverse of the errors
+        :rtype: numpy array
+        """
+        if self._inv_data_e_source is not self.data_e:
+            self.inv_data_e = 1.0 / self.data_e
+            self._inv_data_e_source = self.data_e
+        return self.inv_data_e
+
+    def _cache_residuals(self, key, residuals):
+        """
+        Store a copy of residuals in the residual cache, reusing the array of
+        the least recently used entry if the cache is full.
+
+        :param key: The key from _residual_cache_key
+        :type key: tuple
+        :param residuals: The residuals
+        :type residuals: numpy array
+        """
+        stored = None
+        while len(self._residual_cache) >= self.residual_cache_size:
+            _, stored = self._residual_cache.popitem(last=False)
+        if stored is not None and stored.shape == residuals.shape \
+                and stored.dtype == residuals.dtype:
+            stored[...] = residuals
+        else:
+            stored = residuals.copy()
+        self._residual_cache[key] = stored
+
+    def _residual_cache_key(self, params, x, y, e):
         """
-        Approximate the Jacobian using scipy for a given function at a given
-        point.
+        Get the key of parameters in the residual cache.
+
+        :param params: The parameters
+        :type params: list
+        :param x: x data points
+        :type x: numpy array
+        :param y: y data points
+        :type y: numpy array
+        :param e: error at each data point
+        :type e: numpy array or None
+
+        :return: The key, or None if the residuals are not cached
+        :rtype: tuple or None
+        """
+        # Only residuals of the problem's own data are cached
+        if self.residual_cache_size <= 0 or self._approximating_jacobian \
+                or x is not self.data_x or y is not self.data_y \
+                or e is not self.data_e:
+            return None
+        # Clear the cache if the data has been replaced
+        cached_data = self._residual_cache_data
+        if cached_data is None or any(
+                a is not b for a, b in zip(cached_data, (x, y, e))):
+            self._residual_cache.clear()
+            self._residual_cache_data = (x, y, e)
+        p = np.asarray(params)
+        return (p.dtype.str, p.tobytes())
+
+    @_instrumented
+    def eval_j(self, params, func=None, f0=None, **kwargs):
+        """
+        Calculate the Jacobian for a given function at a given point.
+
+        If func is not given, the Jacobian of the residuals is calculated
+        exactly from self.jacobian if it is set, or else with dual numbers if
+        self.use_dual_numbers is set and the function supports them.
+        Otherwise it is approximated with finite differences, using the
+        scheme in self.jacobian_method.
+        The residuals at the perturbed parameters are evaluated with a
+        single call to eval_r_batch if func is not given and the function
+        can be broadcast, otherwise func is called for each of them, writing
+        the residuals straight into the matrix of values if func is not
+        given.
 
         :param params: The parameter values to find the Jacobian at
         :type params: list
         :param func: Function to find the Jacobian for, defaults to self.eval_r
         :type func: Callable, optional
+        :param f0: The value of func at params, if it is already known. This
+                   is only used by the forward scheme.
+        :type f0: numpy array, optional
 
         :return: Approximation of the Jacobian
         :rtype: numpy array
         """
+        batch_func = None
+        func_accepts_out = False
         if func is None:
+            if self.jacobian is not None:
+                return self._eval_analytic_j(self.jacobian, params, **kwargs)
+            jacobian = self._get_dual_jacobian()
+            if jacobian is not None:
+                try:
+                    return self._eval_analytic_j(jacobian, params, **kwargs)
+                except FittingProblemError as e:
+                    logger.info('Finite differences will be used for the '
+                                'Jacobian of %s: %s', self.name, e)
+                    self._dual_jacobian = (self.function, None)
             func = self.eval_r
+            func_accepts_out = True
+            if getattr(self.function, 'vectorised', False):
+                batch_func = self.eval_r_batch
+
+        model_time = self.eval_times['eval_f']
+        try:
+            if self.jacobian_method == 'forward' and f0 is None:
+                # The residuals at params may be in the cache
+                f0 = func(params, **kwargs)
+            # The residuals at the perturbed parameters are not used again,
+            # so they are kept out of the cache
+            self._approximating_jacobian = True
+            return approx_jacobian(func, params,
+                                   method=self.jacobian_method,
+                                   f0=f0,
+                                   batch_func=batch_func,
+                                   kwargs=kwargs,
+                                   func_accepts_out=func_accepts_out)
+        finally:
+            self._approximating_jacobian = False
+            self.jacobian_model_time += self.eval_times['eval_f'] - model_time
+
+    def _get_dual_jacobian(self):
+        """
+        Get the callable for the Jacobian of self.function using dual
+        numbers.
 
-        return approx_derivative(func, params, kwargs=kwargs)
+        :return: The Jacobian, or None if use_dual_numbers is not set or the
+                 function does not support or could not be evaluated with
+                 dual numbers
+        :rtype: callable or None
+        """
+        if not (self.use_dual_numbers
+                and getattr(self.function, 'supports_dual_numbers', False)):
+            return None
+        function, jacobian = self._dual_jacobian
+        if function is not self.function:
+            jacobian = dual_jacobian(self.function)
+            self._dual_jacobian = (self.function, jacobian)
+        return jacobian
+
+    def _eval_analytic_j(self, jacobian, params, x=None, y=None, e=None):
+        """
+        Calculate the Jacobian of the residuals from the Jacobian of the
+        function.
+
+        :param jacobian: The Jacobian of the function, called in the same
+                         way as self.jacobian
+        :type jacobian: callable
+        :param params: The parameter values to find the Jacobian at
+        :type params: list
+        :param x: x data points, defaults to self.data_x
+        :type x: numpy array, optional
+        :param y: y data points, defaults to self.data_y
+        :type y: numpy array, optional
+        :param e: error at each data point, defaults to self.data_e
+        :type e: numpy array, optional
+
+        :return: The Jacobian of the residuals
+        :rtype: numpy array
+        """
+        x, y, e = self._data_or_default(x, y, e)
+        # The residuals are (y - f) / e
+        jac = jacobian(x, *params)
+        jac = np.negative(jac, dtype=np.result_type(jac, np.float64))
+        if e is not None:
+            if e is self.data_e:
+                jac *= self._inverse_data_e()[:, np.newaxis]
+            else:
+                jac /= np.asarray(e)[:, np.newaxis]
+        return jac
+
+    def reset_eval_stats(self):
+        """
+        Set the counts and times of the evaluation methods to zero, and
+        clear the residual cache so that each fit starts without cached
+        values.
+        """
+        self._residual_cache.clear()
+        self.residual_cache_hits = 0
+        self.residual_cache_misses = 0
+        self.eval_counts = {name: 0 for name in INSTRUMENTED_METHODS}
+        self.eval_times = {name: 0.0 for name in INSTRUMENTED_METHODS}
+        self.callback_time = 0.0
+        self.jacobian_model_time = 0.0
+
+    def eval_stats(self):
+        """
+        Summarise the evaluations since reset_eval_stats was called.
+
+        Function evaluations made while approximating the Jacobian are
+        included in the number of function evaluations and the model time.
+
+        :return: The number of function evaluations ('nfev'), the number
+                 of Jacobian evaluations ('njev'), the time in seconds
+                 spent evaluating the model ('model_time'), the time spent
+                 in eval_j other than evaluating the model
+                 ('jacobian_time'), the total time spent in calls from
+                 the minimizer ('callback_time'), and the number of hits
+                 and misses of the residual cache ('residual_cache_hits',
+                 'residual_cache_misses')
+        :rtype: dict
+        """
+        return {'nfev': self.eval_counts['eval_f'],
+                'njev': self.eval_counts['eval_j'],
+                'model_time': self.eval_times['eval_f'],
+                'jacobian_time': (self.eval_times['eval_j']
+                                  - self.jacobian_model_time),
+                'callback_time': self.callback_time,
+                'residual_cache_hits': self.residual_cache_hits,
+                'residual_cache_misses': self.residual_cache_misses}
 
     def eval_starting_params(self, param_set):
         """
@@ -295,3 +791,14 @@ class FittingProblem:
 
         # Stores the indices of the sorted data
         self.sorted_index = np.argsort(self.data_x)
+
+        # Cached residuals are for the uncorrected data
+        self._residual_cache.clear()
+
+        # Precompute the weights, so that the residuals are multiplied by
+        # them instead of divided by the errors
+        if self.data_e is not None:
+            self.inv_data_e = 1.0 / self.data_e
+        else:
+            self.inv_data_e = None
+        self._inv_data_e_source = self.data_e
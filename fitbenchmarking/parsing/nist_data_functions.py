@@ -5,11 +5,23 @@ into the right format for SciPy.
 
 from __future__ import (absolute_import, division, print_function)
 
+import ast
+
 # This import is needed for dynamic scipy function def
 import numpy as np
 
 from fitbenchmarking.utils.exceptions import ParsingError
 
+try:
+    _NUMBER_NODE = ast.Constant
+except AttributeError:
+    # python < 3.8
+    _NUMBER_NODE = ast.Num
+
+_BINARY_OPERATORS = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*',
+                     ast.Div: '/', ast.Pow: '**'}
+
+
 def nist_func_definition(function, param_names):
     """
     Processing a function plus different set of starting values as specified in
@@ -38,7 +50,206 @@ def nist_func_definition(function, param_names):
     exec("def fitting_function(x, " + ','.join(param_names) + "): return "
          + function_scipy_format, global_dict, local_dict)
 
-    return local_dict['fitting_function']
+    fitting_function = local_dict['fitting_function']
+    # The expression only uses arithmetic and numpy ufuncs, so the parameters
+    # can be arrays which broadcast against x, or dual numbers
+    fitting_function.vectorised = True
+    fitting_function.supports_dual_numbers = True
+    return fitting_function
+
+
+def nist_jacobian_definition(function, param_names):
+    """
+    Create a callable for the Jacobian of a function specified in a NIST
+    problem definition file, by differentiating the expression with respect
+    to each parameter.
+
+    :param function: function string as defined in a NIST problem definition
+                     file
+    :type function: str
+    :param param_names: names of the parameters in the function
+    :type param_names: list
+
+    :return: callable returning the derivatives of the function at x with
+             respect to each parameter, as an array of shape
+             (len(x), len(param_names))
+    :rtype: callable
+    """
+    param_names = list(param_names)
+    function_scipy_format = format_function_scipy(function)
+    if not is_safe(function_scipy_format):
+        raise ParsingError('Error while sanitizing input')
+
+    try:
+        tree = ast.parse(function_scipy_format.strip(), mode='eval').body
+    except SyntaxError:
+        raise ParsingError('Could not parse the function: ' + function)
+    derivatives = [_differentiate(tree, name) for name in param_names]
+
+    # The derivatives are built from the sanitised function, so exec use is
+    # valid
+    # pylint: disable=exec-used
+    local_dict = {}
+    global_dict = {'__builtins__': {}, 'np': np}
+    exec("def derivatives(x, " + ','.join(param_names) + "): return ("
+         + ''.join(d + ', ' for d in derivatives) + ")",
+         global_dict, local_dict)
+    derivatives_function = local_dict['derivatives']
+
+    def jacobian(x, *params):
+        """
+        Evaluate the Jacobian of the function with respect to the parameters.
+
+        :param x: x data values
+        :type x: numpy array
+        :param params: parameter values
+        :type params: list
+
+        :return: the Jacobian, with a column for each parameter
+        :rtype: numpy array
+        """
+        x = np.asarray(x)
+        columns = derivatives_function(x, *params)
+        # Derivatives which do not depend on x are scalars
+        return np.column_stack([np.broadcast_to(c, x.shape)
+                                for c in columns])
+
+    return jacobian
+
+
+def _differentiate(node, name):
+    """
+    Differentiate an expression with respect to a variable.
+
+    :param node: The expression
+    :type node: ast.AST
+    :param name: The variable to differentiate with respect to
+    :type name: str
+
+    :return: The derivative, as python source
+    :rtype: str
+    """
+    if isinstance(node, ast.Name):
+        return '1' if node.id == name else '0'
+    if isinstance(node, (_NUMBER_NODE, ast.Attribute)):
+        # Numbers and np.pi
+        return '0'
+    if isinstance(node, ast.UnaryOp):
+        d = _differentiate(node.operand, name)
+        if isinstance(node.op, ast.USub):
+            return _neg(d)
+        if isinstance(node.op, ast.UAdd):
+            return d
+    if isinstance(node, ast.BinOp):
+        a, b = _to_source(node.left), _to_source(node.right)
+        da = _differentiate(node.left, name)
+        db = _differentiate(node.right, name)
+        if isinstance(node.op, ast.Add):
+            return _add(da, db)
+        if isinstance(node.op, ast.Sub):
+            return _add(da, _neg(db))
+        if isinstance(node.op, ast.Mult):
+            return _add(_mul(da, b), _mul(a, db))
+        if isinstance(node.op, ast.Div):
+            return _add(_div(da, b),
+                        _neg(_div(_mul(a, db), '({} ** 2)'.format(b))))
+        if isinstance(node.op, ast.Pow):
+            # d(a**b) = b * a**(b - 1) * da + a**b * log(a) * db
+            power_rule = _mul(_mul(b, '({} ** ({} - 1))'.format(a, b)), da)
+            if db == '0':
+                return power_rule
+            return _add(power_rule,
+                        _mul(_mul(_to_source(node), 'np.log({})'.format(a)),
+                             db))
+    if isinstance(node, ast.Call) and not node.keywords \
+            and len(node.args) == 1:
+        function = _to_source(node.func)
+        u = _to_source(node.args[0])
+        du = _differentiate(node.args[0], name)
+        if du == '0':
+            return '0'
+        outer = {'np.exp': 'np.exp({})',
+                 'np.sin': 'np.cos({})',
+                 'np.cos': '(-np.sin({}))',
+                 'np.tan': '(1 / np.cos({}) ** 2)'}.get(function)
+        if outer is not None:
+            return _mul(outer.format(u), du)
+    raise ParsingError('Could not differentiate the expression: '
+                       + _to_source(node))
+
+
+def _to_source(node):
+    """
+    Convert an expression back to python source, with every operation in
+    brackets.
+
+    :param node: The expression
+    :type node: ast.AST
+
+    :return: The source
+    :rtype: str
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, _NUMBER_NODE):
+        return repr(getattr(node, 'value', getattr(node, 'n', None)))
+    if isinstance(node, ast.Attribute):
+        return '{}.{}'.format(_to_source(node.value), node.attr)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return '(-{})'.format(_to_source(node.operand))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+        return _to_source(node.operand)
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        return '({} {} {})'.format(_to_source(node.left),
+                                   _BINARY_OPERATORS[type(node.op)],
+                                   _to_source(node.right))
+    if isinstance(node, ast.Call):
+        return '{}({})'.format(_to_source(node.func),
+                               ', '.join(_to_source(a) for a in node.args))
+    raise ParsingError('Unexpected element in the expression: '
+                       + type(node).__name__)
+
+
+def _add(a, b):
+    """
+    Add two expressions, omitting zeros.
+    """
+    if a == '0':
+        return b
+    if b == '0':
+        return a
+    return '({} + {})'.format(a, b)
+
+
+def _neg(a):
+    """
+    Negate an expression, omitting zeros.
+    """
+    if a == '0':
+        return a
+    return '(-{})'.format(a)
+
+
+def _mul(a, b):
+    """
+    Multiply two expressions, omitting zeros and ones.
+    """
+    if a == '0' or b == '0':
+        return '0'
+    if a == '1':
+        return b
+    if b == '1':
+        return a
+    return '({} * {})'.format(a, b)
+
+
+def _div(a, b):
+    """
+    Divide two expressions, omitting zeros.
+    """
+    if a == '0':
+        return '0'
+    return '({} / {})'.format(a, b)
 
 
 def format_function_scipy(function):
@@ -9,8 +9,11 @@ import numpy as np
 import re
 
 from fitbenchmarking.parsing.base_parser import Parser
+from fitbenchmarking.parsing.data_loading import read_data_points
+from fitbenchmarking.parsing.expression_compiler import CompiledExpression
 from fitbenchmarking.parsing.fitting_problem import FittingProblem
-from fitbenchmarking.parsing.nist_data_functions import nist_func_definition
+from fitbenchmarking.parsing.nist_data_functions import \
+    nist_func_definition, nist_jacobian_definition
 from fitbenchmarking.utils.exceptions import ParsingError
 from fitbenchmarking.utils.logging_setup import logger
 
@@ -45,12 +48,49 @@ class NISTParser(Parser):
 
         fitting_problem.starting_values = starting_values
 
-        fitting_problem.function = \
-            nist_func_definition(function=fitting_problem.equation,
-                                 param_names=starting_values[0].keys())
+        param_names = list(starting_values[0].keys())
+        function = nist_func_definition(function=fitting_problem.equation,
+                                        param_names=param_names)
+        try:
+            expression = CompiledExpression.from_equation(
+                equation=fitting_problem.equation,
+                param_names=param_names,
+                fallback=function)
+        except ParsingError as e:
+            logger.info('The equation of %s could not be compiled: %s',
+                        name, e)
+            fitting_problem.function = function
+            fitting_problem.jacobian = self._get_jacobian(
+                fitting_problem.equation, param_names)
+        else:
+            fitting_problem.function = expression
+            fitting_problem.jacobian = expression.jacobian
 
         return fitting_problem
 
+    def _get_jacobian(self, equation, param_names):
+        """
+        Create the Jacobian of an equation which could not be compiled, by
+        differentiating the expression.
+
+        :param equation: The equation in muparser format
+        :type equation: str
+        :param param_names: names of the parameters in the equation
+        :type param_names: list
+
+        :return: callable returning the Jacobian, or None if the expression
+                 could not be differentiated, in which case eval_j uses dual
+                 numbers
+        :rtype: callable or None
+        """
+        try:
+            return nist_jacobian_definition(function=equation,
+                                            param_names=param_names)
+        except ParsingError as e:
+            logger.info('Automatic differentiation will be used for the '
+                        'Jacobian: %s', e)
+            return None
+
     def _parse_line_by_line(self):
         """
         Parses the NIST file one line at the time.
@@ -184,16 +224,7 @@ class NISTParser(Parser):
         if not data_text:
             return None
 
-        first = data_text[0].strip()
-        dim = len(first.split())
-        data_points = np.zeros((len(data_text), dim))
-
-        for idx, line in enumerate(data_text):
-            line = line.strip()
-            point_text = line.split()
-            point = [float(val) for val in point_text]
-            data_points[idx, :] = point
-
+        data_points = read_data_points(data_text)
         data_points = self._sort_data_from_x_data(data_points)
 
         return data_points
@@ -210,9 +241,10 @@ class NISTParser(Parser):
         :rtype: np.ndarray
         """
 
-        sorted_data_points = sorted(data_points, key=lambda x: x[1])
+        # A stable sort keeps points with equal x in the order of the file
+        order = np.argsort(data_points[:, 1], kind='mergesort')
 
-        return np.asarray(sorted_data_points)
+        return data_points[order]
 
     def _parse_equation(self, eq_text):
         """
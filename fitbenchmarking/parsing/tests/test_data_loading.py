@@ -0,0 +1,83 @@
+"""
+Tests for the data_loading.py file
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from unittest import TestCase
+
+import numpy as np
+
+from fitbenchmarking.parsing import data_loading
+from fitbenchmarking.parsing.data_loading import (find_first_data_line,
+                                                  read_data_points)
+from fitbenchmarking.utils.exceptions import ParsingError
+
+
+class FindFirstDataLineTests(TestCase):
+    """
+    Tests for find_first_data_line
+    """
+
+    def test_header(self):
+        """
+        Test that header lines and blank lines are skipped
+        """
+        lines = ['# X Y E\n', '\n', '<X> <Y>\n', '1.0 2.0 3.0\n']
+        self.assertEqual(find_first_data_line(lines), 3)
+
+    def test_no_data(self):
+        """
+        Test that an error is raised if there is no data
+        """
+        self.assertRaises(ParsingError, find_first_data_line,
+                          ['# X Y E\n', '\n'])
+
+
+class ReadDataPointsTests(TestCase):
+    """
+    Tests for read_data_points
+    """
+
+    def test_numbers(self):
+        """
+        Test that lines of numbers are read, ignoring blank lines
+        """
+        lines = ['1.0 2.0\n', '  3e1\t-4.5E0 \n', '\n', 'nan 6\n']
+        expected = np.array([[1.0, 2.0], [30.0, -4.5], [np.nan, 6.0]])
+        np.testing.assert_array_equal(read_data_points(lines), expected)
+
+    def test_invalid_skipped(self):
+        """
+        Test that lines with values which are not numbers are read as nan
+        when skip_invalid is set, including when they are in the middle of
+        blocks which can be read
+        """
+        lines = ['{0} {0}\n'.format(i) for i in range(25)]
+        lines[0] = '0 -1.#IND\n'
+        lines[12] = '12 twelve\n'
+        expected = np.array([[i, i] for i in range(25)], dtype=float)
+        expected[0] = np.nan
+        expected[12] = np.nan
+
+        block_size = data_loading.BLOCK_SIZE
+        data_loading.BLOCK_SIZE = 10
+        try:
+            points = read_data_points(lines, skip_invalid=True)
+        finally:
+            data_loading.BLOCK_SIZE = block_size
+        np.testing.assert_array_equal(points, expected)
+
+    def test_invalid_error(self):
+        """
+        Test that lines with values which are not numbers raise an error
+        when skip_invalid is not set
+        """
+        self.assertRaises(ParsingError, read_data_points,
+                          ['1 2\n', '3 four\n'])
+
+    def test_inconsistent_lines(self):
+        """
+        Test that lines with different numbers of values raise an error
+        """
+        self.assertRaises(ParsingError, read_data_points,
+                          ['1 2\n', '3 4 5\n'], True)
@@ -0,0 +1,99 @@
+"""
+Tests for the dual_numbers.py file
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from unittest import TestCase
+
+import numpy as np
+
+from fitbenchmarking.parsing.dual_numbers import (DualArray, dual_jacobian,
+                                                  variables)
+from fitbenchmarking.utils.exceptions import FittingProblemError
+
+
+class DualArrayTests(TestCase):
+    """
+    Tests for DualArray
+    """
+
+    def setUp(self):
+        self.x = np.array([0.5, 1.0, 2.0])
+
+    def test_arithmetic(self):
+        """
+        Test the derivatives of the arithmetic operators, with dual numbers
+        on either side
+        """
+        a, b = variables([3.0, 2.0])
+        x = self.x
+        result = (a * x + b) / (x - a) ** 2 - x ** b + 1 / a
+        expected_value = (3 * x + 2) / (x - 3) ** 2 - x ** 2 + 1 / 3
+        da = x / (x - 3) ** 2 + 2 * (3 * x + 2) / (x - 3) ** 3 - 1 / 9
+        db = 1 / (x - 3) ** 2 - x ** 2 * np.log(x)
+        self.assertIsInstance(result, DualArray)
+        np.testing.assert_allclose(result.value, expected_value)
+        np.testing.assert_allclose(result.lanes(1), [da, db])
+
+    def test_ufuncs(self):
+        """
+        Test the derivatives of the supported ufuncs
+        """
+        a, = variables([0.3])
+        x = self.x
+        cases = [(np.exp, np.exp(0.3 * x) * x),
+                 (np.sin, np.cos(0.3 * x) * x),
+                 (np.cos, -np.sin(0.3 * x) * x),
+                 (np.tan, x / np.cos(0.3 * x) ** 2),
+                 (np.log, 1 / (0.3 * x) * x),
+                 (np.sqrt, 0.5 / np.sqrt(0.3 * x) * x),
+                 (np.arctan, x / (1 + (0.3 * x) ** 2))]
+        for ufunc, expected in cases:
+            result = ufunc(a * x)
+            np.testing.assert_allclose(result.value, ufunc(0.3 * x))
+            np.testing.assert_allclose(result.derivatives[0], expected,
+                                       err_msg=ufunc.__name__)
+
+    def test_unsupported_ufunc(self):
+        """
+        Test that ufuncs without a rule are not applied to dual numbers
+        """
+        a, = variables([0.3])
+        self.assertRaises(TypeError, np.floor, a)
+
+
+class DualJacobianTests(TestCase):
+    """
+    Tests for dual_jacobian
+    """
+
+    def setUp(self):
+        self.x = np.array([0.5, 1.0, 2.0, 4.0])
+
+    def test_jacobian(self):
+        """
+        Test the Jacobian of a model with vector valued operations
+        """
+        def model(x, b1, b2, b3):
+            return b1 * np.exp(-b2 * x) + b3 * np.pi
+
+        jacobian = dual_jacobian(model)(self.x, 2.0, 0.5, 1.0)
+        expected = np.column_stack([np.exp(-0.5 * self.x),
+                                    -2.0 * self.x * np.exp(-0.5 * self.x),
+                                    np.full(4, np.pi)])
+        np.testing.assert_allclose(jacobian, expected)
+
+    def test_constant(self):
+        """
+        Test that models which do not depend on the parameters have zero
+        Jacobians
+        """
+        jacobian = dual_jacobian(lambda x, b1: x ** 2)(self.x, 1.0)
+        np.testing.assert_array_equal(jacobian, np.zeros((4, 1)))
+
+    def test_unsupported(self):
+        """
+        Test that models which can not use dual numbers raise an error
+        """
+        jacobian = dual_jacobian(lambda x, b1: x * float(b1))
+        self.assertRaises(FittingProblemError, jacobian, self.x, 1.0)
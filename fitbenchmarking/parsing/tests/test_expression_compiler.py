@@ -0,0 +1,232 @@
+"""
+Tests for the expression_compiler.py file
+"""
+
+from __future__ import (absolute_import, division, print_function)
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from fitbenchmarking.parsing import expression_compiler
+from fitbenchmarking.parsing.dual_numbers import dual_jacobian
+from fitbenchmarking.parsing.expression_compiler import (CompiledExpression,
+                                                         compile_plan,
+                                                         load_plan,
+                                                         set_plan_cache_dir)
+from fitbenchmarking.parsing.fitting_problem import FittingProblem
+from fitbenchmarking.parsing.nist_data_functions import nist_func_definition
+from fitbenchmarking.utils.exceptions import ParsingError
+
+EQUATIONS = [('b1*(1-exp(-b2*x))', [240.0, 5e-4]),
+             ('b1*exp( -b2*x ) + b3*exp( -(x-b4)^2 / b2^2 )',
+              [98.0, 0.5, 100.0, 1.5]),
+             ('(b1 + b2*x + b3*x^2) /(1 + b2*x + b3*x^3)', [2.0, -0.1, 3e-3]),
+             ('b1 * (b2+x)^(-1/b3)', [0.2, 5.0, 1.2]),
+             ('b1 + b2*cos( 2*pi*x/12 ) + b3*sin( 2*pi*x/12 )',
+              [10.0, 3.0, 0.5]),
+             ('b1*tan(b2*x) + x^0.5 - b3', [1.0, 0.1, 4.0]),
+             ('b1', [2.0])]
+
+
+def _compile(equation, param_names):
+    return CompiledExpression(compile_plan(equation, param_names),
+                              nist_func_definition(equation, param_names))
+
+
+class CompiledExpressionTests(TestCase):
+    """
+    Tests for CompiledExpression
+    """
+
+    def setUp(self):
+        self.x = np.linspace(0.5, 10.0, 20)
+
+    def test_matches_numpy(self):
+        """
+        Test that the compiled function and Jacobian match those evaluated
+        directly with numpy, differentiated with dual numbers
+        """
+        for equation, params in EQUATIONS:
+            names = ['b{}'.format(i + 1) for i in range(len(params))]
+            compiled = _compile(equation, names)
+            function = nist_func_definition(equation, names)
+            jacobian = dual_jacobian(function)
+            for _ in range(2):
+                np.testing.assert_allclose(compiled(self.x, *params),
+                                           function(self.x, *params),
+                                           rtol=1e-14, err_msg=equation)
+                np.testing.assert_allclose(compiled.jacobian(self.x, *params),
+                                           jacobian(self.x, *params),
+                                           rtol=1e-12, err_msg=equation)
+
+    def test_derivatives(self):
+        """
+        Test the derivatives of expressions using each of the supported
+        operations and functions
+        """
+        b1, b2 = 1.5, 0.25
+        x = self.x
+        cases = {
+            'b1 + b2*x': [np.ones_like(x), x],
+            'b1*(1-exp(-b2*x))': [1 - np.exp(-b2 * x),
+                                  b1 * x * np.exp(-b2 * x)],
+            'b1 / (b2 + x)': [1 / (b2 + x), -b1 / (b2 + x)**2],
+            'b1*x**b2': [x**b2, b1 * x**b2 * np.log(x)],
+            '(b1+x)**(-1/b2)': [-1 / b2 * (b1 + x)**(-1 / b2 - 1),
+                                (b1 + x)**(-1 / b2) * np.log(b1 + x)
+                                / b2**2],
+            'b1*cos(2*pi*x/12) + sin(b2*x)': [np.cos(2 * np.pi * x / 12),
+                                              x * np.cos(b2 * x)],
+            'tan(b1*x) - b2': [x / np.cos(b1 * x)**2, -np.ones_like(x)],
+        }
+        for equation, expected in cases.items():
+            compiled = _compile(equation, ['b1', 'b2'])
+            np.testing.assert_allclose(compiled.jacobian(x, b1, b2),
+                                       np.column_stack(expected),
+                                       err_msg=equation)
+
+    def test_unused_parameter(self):
+        """
+        Test that parameters which do not appear have zero derivatives
+        """
+        compiled = _compile('b1*x', ['b1', 'b2'])
+        np.testing.assert_array_equal(compiled.jacobian(self.x, 2.0, 3.0),
+                                      np.column_stack([self.x,
+                                                       np.zeros(20)]))
+
+    def test_eval_j(self):
+        """
+        Test that eval_j uses the exact Jacobian, weighted by the errors
+        """
+        compiled = _compile('b1*exp(-b2*x)', ['b1', 'b2'])
+        problem = FittingProblem()
+        problem.function = compiled
+        problem.jacobian = compiled.jacobian
+        problem.data_x = self.x
+        problem.data_y = np.zeros(20)
+        problem.data_e = np.linspace(0.5, 4.0, 20)
+        problem.correct_data(True)
+
+        jac = problem.eval_j([2.0, 0.5])
+        expected = -np.column_stack([np.exp(-0.5 * self.x),
+                                     -2.0 * self.x * np.exp(-0.5 * self.x)])
+        np.testing.assert_allclose(jac, expected / problem.data_e[:, None])
+        self.assertEqual(problem.eval_counts['eval_f'], 0)
+
+    def test_common_subexpressions(self):
+        """
+        Test that subexpressions shared by the function and its derivatives
+        are only in the plan once
+        """
+        plan = compile_plan('b1*exp(-b2*x) + exp(-b2*x)', ['b1', 'b2'])
+        nodes = [tuple(n) for n in plan['nodes']]
+        exp_nodes = [i for i, n in enumerate(nodes) if n[0] == 'exp']
+        self.assertEqual(len(exp_nodes), 1)
+        # The derivative with respect to b1 is the exponential itself
+        self.assertEqual(plan['jacobian'][0], exp_nodes[0])
+
+    def test_results_not_reused(self):
+        """
+        Test that each call returns a new array, although buffers are reused
+        """
+        compiled = _compile('b1*exp(-b2*x) + b1', ['b1', 'b2'])
+        first = compiled(self.x, 1.0, 2.0)
+        expected = first.copy()
+        second = compiled(self.x, 3.0, 4.0)
+        self.assertIsNot(first, second)
+        np.testing.assert_array_equal(first, expected)
+
+    def test_array_params(self):
+        """
+        Test that parameters which are arrays are evaluated with the
+        fallback, so that the function can be broadcast
+        """
+        compiled = _compile('b1*exp(-b2*x)', ['b1', 'b2'])
+        self.assertTrue(compiled.vectorised)
+        values = compiled(self.x[np.newaxis, :],
+                          np.array([[1.0], [2.0]]), np.array([[0.5], [0.5]]))
+        np.testing.assert_allclose(values[1], 2 * np.exp(-0.5 * self.x))
+
+    def test_unsafe(self):
+        """
+        Test that unsafe equations are not compiled
+        """
+        self.assertRaises(ParsingError, compile_plan, 'b1*x; import os',
+                          ['b1'])
+
+
+class PlanCacheTests(TestCase):
+    """
+    Tests for saving compiled plans
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        set_plan_cache_dir(self.cache_dir)
+        expression_compiler._PLANS.clear()
+
+    def tearDown(self):
+        set_plan_cache_dir(None)
+        expression_compiler._PLANS.clear()
+        shutil.rmtree(self.cache_dir)
+
+    def test_saved_and_loaded(self):
+        """
+        Test that plans are saved and loaded instead of compiled
+        """
+        plan = load_plan('b1*exp(-b2*x)', ['b1', 'b2'])
+        file_names = os.listdir(self.cache_dir)
+        self.assertEqual(len(file_names), 1)
+
+        file_name = os.path.join(self.cache_dir, file_names[0])
+        with open(file_name, 'r') as f:
+            saved = json.load(f)
+        self.assertEqual(saved, plan)
+
+        saved['loaded'] = True
+        with open(file_name, 'w') as f:
+            json.dump(saved, f)
+        expression_compiler._PLANS.clear()
+        self.assertTrue(load_plan('b1*exp(-b2*x)', ['b1', 'b2'])['loaded'])
+
+    def test_unreadable(self):
+        """
+        Test that unreadable plans are compiled again
+        """
+        load_plan('b1*x', ['b1'])
+        file_name = os.path.join(self.cache_dir,
+                                 os.listdir(self.cache_dir)[0])
+        with open(file_name, 'w') as f:
+            f.write('{')
+        expression_compiler._PLANS.clear()
+        plan = load_plan('b1*x', ['b1'])
+        self.assertEqual(plan, compile_plan('b1*x', ['b1']))
+
+    def test_invalid(self):
+        """
+        Test that plans with unknown operations or bad arguments are
+        compiled again and overwritten
+        """
+        expected = load_plan('b1*x', ['b1'])
+        file_name = os.path.join(self.cache_dir,
+                                 os.listdir(self.cache_dir)[0])
+        invalid_nodes = [
+            [['x'], ['param', 0], ['__import__("os")', 0, 1]],
+            [['x'], ['param', 0], ['mul', 0, 5]],
+            [['x'], ['param', 0], ['mul', 2, 1]],
+            [['x'], ['param', 0], ['mul', 0, '1']],
+            [['x'], ['param', 3], ['mul', 0, 1]],
+            [['x'], ['const', 'np'], ['mul', 0, 1]],
+            [['x'], ['param', 0], ['neg', 0, 1]],
+        ]
+        for nodes in invalid_nodes:
+            with open(file_name, 'w') as f:
+                json.dump(dict(expected, nodes=nodes), f)
+            expression_compiler._PLANS.clear()
+            self.assertEqual(load_plan('b1*x', ['b1']), expected)
+            with open(file_name, 'r') as f:
+                self.assertEqual(json.load(f), expected)
@@ -0,0 +1,132 @@
+"""
+Tests for the finite_difference.py file
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from unittest import TestCase
+
+import numpy as np
+
+from fitbenchmarking.parsing.finite_difference import (approx_jacobian,
+                                                       FD_METHODS)
+from fitbenchmarking.parsing.fitting_problem import FittingProblem
+from fitbenchmarking.parsing.nist_data_functions import nist_func_definition
+from fitbenchmarking.utils.exceptions import FittingProblemError
+
+
+def residuals(p, x):
+    """
+    Residuals of b1*exp(-b2*x) against zero
+    """
+    return p[0] * np.exp(-p[1] * x)
+
+
+def batch_residuals(p_matrix, x):
+    """
+    residuals evaluated for each row of p_matrix
+    """
+    return p_matrix[:, [0]] * np.exp(-p_matrix[:, [1]] * x)
+
+
+class ApproxJacobianTests(TestCase):
+    """
+    Tests for approx_jacobian
+    """
+
+    def setUp(self):
+        self.x = np.linspace(0.0, 3.0, 7)
+        self.params = [2.0, 0.5]
+        self.expected = np.column_stack(
+            [np.exp(-0.5 * self.x), -2.0 * self.x * np.exp(-0.5 * self.x)])
+
+    def test_methods(self):
+        """
+        Test that each scheme approximates the Jacobian, and that the batched
+        and column by column evaluations are the same
+        """
+        kwargs = {'x': self.x}
+        for method in FD_METHODS:
+            columns = approx_jacobian(residuals, self.params, method=method,
+                                      kwargs=kwargs)
+            batched = approx_jacobian(residuals, self.params, method=method,
+                                      batch_func=batch_residuals,
+                                      kwargs=kwargs)
+            np.testing.assert_allclose(columns, self.expected,
+                                       rtol=1e-6, atol=1e-8)
+            np.testing.assert_array_equal(columns, batched)
+
+    def test_func_accepts_out(self):
+        """
+        Test that functions which accept an output array write into the rows
+        of the matrix of values, and give the same Jacobian
+        """
+        outputs = []
+
+        def func(p, x, out=None):
+            outputs.append(out)
+            values = residuals(p, x)
+            if out is None:
+                return values
+            out[...] = values
+            return out
+
+        kwargs = {'x': self.x}
+        for method in FD_METHODS:
+            del outputs[:]
+            expected = approx_jacobian(residuals, self.params, method=method,
+                                       kwargs=kwargs)
+            jac = approx_jacobian(func, self.params, method=method,
+                                  kwargs=kwargs, func_accepts_out=True)
+            np.testing.assert_array_equal(jac, expected)
+            self.assertIsNotNone(outputs[-1])
+
+    def test_forward_reuses_f0(self):
+        """
+        Test that the forward scheme does not evaluate the base point if it
+        is given
+        """
+        calls = []
+
+        def func(p):
+            calls.append(p)
+            return residuals(p, self.x)
+
+        f0 = residuals(np.array(self.params), self.x)
+        jac = approx_jacobian(func, self.params, method='forward', f0=f0)
+        self.assertEqual(len(calls), 2)
+        np.testing.assert_allclose(jac, self.expected, rtol=1e-6, atol=1e-7)
+
+    def test_scalar_function(self):
+        """
+        Test that the Jacobian of a scalar function is a 1D gradient
+        """
+        grad = approx_jacobian(lambda p: np.dot(p, p), [1.0, -2.0],
+                              method='central')
+        self.assertEqual(grad.shape, (2,))
+        np.testing.assert_allclose(grad, [2.0, -4.0])
+
+    def test_unknown_method(self):
+        """
+        Test that an unknown scheme raises an error
+        """
+        self.assertRaises(FittingProblemError, approx_jacobian,
+                          residuals, self.params, method='backward')
+
+    def test_problem_uses_batch(self):
+        """
+        Test that eval_j evaluates the residuals of vectorised functions in a
+        single batch
+        """
+        problem = FittingProblem()
+        problem.function = nist_func_definition('b1*exp(-b2*x)',
+                                                ['b1', 'b2'])
+        problem.data_x = self.x
+        problem.data_y = np.zeros(len(self.x))
+        problem.use_dual_numbers = False
+        problem.jacobian_method = 'central'
+        problem.correct_data(False)
+
+        jac = problem.eval_j(self.params)
+        self.assertEqual(problem.eval_counts['eval_r_batch'], 1)
+        self.assertEqual(problem.eval_counts['eval_f'], 4)
+        np.testing.assert_allclose(jac, -self.expected, rtol=1e-6, atol=1e-8)
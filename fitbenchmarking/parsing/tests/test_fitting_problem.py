@@ -7,6 +7,7 @@ import numpy as np
 from unittest import TestCase
 
 from fitbenchmarking.parsing.fitting_problem import FittingProblem
+from fitbenchmarking.parsing.nist_data_functions import nist_func_definition
 from fitbenchmarking.utils import exceptions
 
 
@@ -155,6 +156,259 @@ class TestFittingProblem(TestCase):
         actual = J(x=fitting_problem.data_x, p=params)
         self.assertTrue(np.isclose(actual, eval_result).all())
 
+        fitting_problem.use_dual_numbers = False
+        eval_result = fitting_problem.eval_j(params=params)
+        self.assertTrue(np.isclose(actual, eval_result).all())
+
+    def test_eval_j_dual_numbers(self):
+        """
+        Test that eval_j differentiates numpy functions with dual numbers
+        """
+        fitting_problem = FittingProblem()
+        fitting_problem.function = nist_func_definition('p1*exp(p2*x)',
+                                                        ['p1', 'p2'])
+        fitting_problem.data_x = np.array([1.0, 2.0, 3.0])
+        fitting_problem.data_y = np.array([1.0, 2.0, 4.0])
+
+        eval_result = fitting_problem.eval_j(params=[6.0, 0.1])
+        expected = np.column_stack((-np.exp(0.1 * fitting_problem.data_x),
+                                    -fitting_problem.data_x * 6.0
+                                    * np.exp(0.1 * fitting_problem.data_x)))
+        np.testing.assert_allclose(eval_result, expected, rtol=1e-14)
+        self.assertEqual(fitting_problem.eval_counts['eval_f'], 0)
+
+    def test_eval_j_no_dual_numbers(self):
+        """
+        Test that eval_j uses finite differences for functions which can not
+        be evaluated with dual numbers
+        """
+        def function(x, p1):
+            return x * float(p1)
+        function.supports_dual_numbers = True
+
+        fitting_problem = FittingProblem()
+        fitting_problem.function = function
+        fitting_problem.data_x = np.array([1.0, 2.0, 3.0])
+        fitting_problem.data_y = np.array([1.0, 2.0, 4.0])
+
+        for _ in range(2):
+            eval_result = fitting_problem.eval_j(params=[2.0])
+            np.testing.assert_allclose(eval_result,
+                                       -fitting_problem.data_x[:, None])
+        # The function is only evaluated with dual numbers once
+        self.assertIsNone(fitting_problem._dual_jacobian[1])
+
+    def test_eval_j_unsupported_dual_numbers(self):
+        """
+        Test that eval_j does not pass dual numbers to functions which are
+        not marked as supporting them
+        """
+        params = []
+
+        def function(x, p1):
+            params.append(p1)
+            return x * p1
+
+        fitting_problem = FittingProblem()
+        fitting_problem.function = function
+        fitting_problem.data_x = np.array([1.0, 2.0, 3.0])
+        fitting_problem.data_y = np.array([1.0, 2.0, 4.0])
+
+        eval_result = fitting_problem.eval_j(params=[2.0])
+        np.testing.assert_allclose(eval_result,
+                                   -fitting_problem.data_x[:, None])
+        self.assertTrue(all(np.isscalar(p) for p in params))
+
+    def test_eval_stats(self):
+        """
+        Test that the evaluations are counted and timed
+        """
+        fitting_problem = FittingProblem()
+        fitting_problem.function = lambda x, p1: x + p1
+        fitting_problem.data_x = np.array([1, 2, 3])
+        fitting_problem.data_y = np.array([2, 3, 4])
+        fitting_problem.use_dual_numbers = False
+
+        fitting_problem.eval_r_norm(params=[1])
+        fitting_problem.eval_j(params=[1])
+        self.assertEqual(fitting_problem.eval_counts['eval_r_norm'], 1)
+        # The model is evaluated once for each residual evaluation,
+        # including those for the Jacobian, which are not in the cache
+        stats = fitting_problem.eval_stats()
+        self.assertGreater(stats['nfev'], 1)
+        self.assertEqual(stats['nfev'],
+                         fitting_problem.eval_counts['eval_r']
+                         + fitting_problem.eval_counts['eval_r_norm']
+                         - stats['residual_cache_hits'])
+        self.assertEqual(stats['njev'], 1)
+        self.assertGreater(stats['model_time'], 0)
+        self.assertGreaterEqual(fitting_problem.eval_times['eval_r']
+                                + fitting_problem.eval_times['eval_r_norm'],
+                                stats['model_time'])
+
+        self.assertGreaterEqual(stats['callback_time'],
+                                stats['model_time'] + stats['jacobian_time'])
+
+        fitting_problem.reset_eval_stats()
+        self.assertEqual(fitting_problem.eval_stats(),
+                         {'nfev': 0, 'njev': 0, 'model_time': 0.0,
+                          'jacobian_time': 0.0, 'callback_time': 0.0,
+                          'residual_cache_hits': 0,
+                          'residual_cache_misses': 0})
+
+    def test_residual_cache(self):
+        """
+        Test that repeated residual evaluations are cached
+        """
+        fitting_problem = FittingProblem()
+        fitting_problem.function = lambda x, p1: x + p1
+        fitting_problem.data_x = np.array([1.0, 2.0, 3.0])
+        fitting_problem.data_y = np.array([2.0, 3.0, 5.0])
+        fitting_problem.residual_cache_size = 2
+
+        first = fitting_problem.eval_r(params=[1.0])
+        first[0] = 100.0
+        second = fitting_problem.eval_r(params=np.array([1.0]))
+        self.assertTrue(all(second == np.array([0.0, 0.0, 1.0])))
+        self.assertEqual(fitting_problem.residual_cache_hits, 1)
+        self.assertEqual(fitting_problem.residual_cache_misses, 1)
+        self.assertEqual(fitting_problem.eval_counts['eval_f'], 1)
+
+        # The least recently used residuals are removed
+        fitting_problem.eval_r(params=[2.0])
+        fitting_problem.eval_r(params=[3.0])
+        fitting_problem.eval_r(params=[1.0])
+        self.assertEqual(fitting_problem.residual_cache_hits, 1)
+
+        # Other data is not cached, and new data clears the cache
+        fitting_problem.eval_r(params=[1.0], x=fitting_problem.data_x,
+                               y=np.array([1.0, 1.0, 1.0]))
+        fitting_problem.data_e = np.array([2.0, 2.0, 2.0])
+        third = fitting_problem.eval_r(params=[1.0])
+        self.assertTrue(all(third == np.array([0.0, 0.0, 0.5])))
+        self.assertEqual(fitting_problem.residual_cache_hits, 1)
+
+    def test_residual_cache_jacobian(self):
+        """
+        Test that the residuals evaluated to approximate the Jacobian are
+        not cached, and that the forward scheme uses the cached residuals
+        at the parameters
+        """
+        fitting_problem = FittingProblem()
+        fitting_problem.function = lambda x, p1: x + p1
+        fitting_problem.data_x = np.array([1.0, 2.0, 3.0])
+        fitting_problem.data_y = np.array([2.0, 3.0, 5.0])
+        fitting_problem.residual_cache_size = 2
+        fitting_problem.use_dual_numbers = False
+        fitting_problem.jacobian_method = 'central'
+
+        fitting_problem.eval_r(params=[1.0])
+        fitting_problem.eval_j(params=[1.0])
+        self.assertEqual(fitting_problem.eval_counts['eval_f'], 3)
+        self.assertEqual(len(fitting_problem._residual_cache), 1)
+        self.assertEqual(fitting_problem.residual_cache_hits, 0)
+        self.assertEqual(fitting_problem.residual_cache_misses, 1)
+
+        fitting_problem.jacobian_method = 'forward'
+        jac = fitting_problem.eval_j(params=[1.0])
+        np.testing.assert_allclose(jac, -np.ones((3, 1)))
+        self.assertEqual(fitting_problem.eval_counts['eval_f'], 4)
+        self.assertEqual(len(fitting_problem._residual_cache), 1)
+        self.assertEqual(fitting_problem.residual_cache_hits, 1)
+        self.assertEqual(fitting_problem.residual_cache_misses, 1)
+
+    def test_eval_r_out(self):
+        """
+        Test that residuals can be written into a given array, using the
+        weights precomputed by correct_data
+        """
+        fitting_problem = FittingProblem()
+        fitting_problem.function = lambda x, p1: x + p1
+        fitting_problem.data_x = np.array([1.0, 2.0, 3.0])
+        fitting_problem.data_y = np.array([2.0, 3.0, 5.0])
+        fitting_problem.data_e = np.array([2.0, 4.0, 0.5])
+        fitting_problem.correct_data(True)
+        np.testing.assert_array_equal(fitting_problem.inv_data_e,
+                                      [0.5, 0.25, 2.0])
+
+        expected = np.array([0.0, 0.0, 2.0])
+        out = np.empty(3)
+        for params in [[1.0], [1.0]]:
+            result = fitting_problem.eval_r(params=params, out=out)
+            self.assertIs(result, out)
+            np.testing.assert_allclose(out, expected)
+        self.assertEqual(fitting_problem.residual_cache_hits, 1)
+
+        # Other errors are divided by
+        out = fitting_problem.eval_r(params=[1.0],
+                                     x=fitting_problem.data_x,
+                                     y=fitting_problem.data_y,
+                                     e=np.array([1.0, 1.0, 4.0]),
+                                     out=out)
+        np.testing.assert_allclose(out, [0.0, 0.0, 0.25])
+
+    def test_eval_r_norm_buffer(self):
+        """
+        Test that eval_r_norm matches the residuals and reuses its buffer
+        """
+        fitting_problem = FittingProblem()
+        fitting_problem.function = lambda x, p1: x * p1
+        fitting_problem.data_x = np.array([1.0, 2.0, 3.0])
+        fitting_problem.data_y = np.array([2.0, 3.0, 5.0])
+        fitting_problem.data_e = np.array([1.0, 2.0, 4.0])
+        fitting_problem.residual_cache_size = 0
+
+        for params in [[1.0], [2.0]]:
+            r = fitting_problem.eval_r(params=params)
+            self.assertAlmostEqual(fitting_problem.eval_r_norm(params=params),
+                                   np.dot(r, r))
+        buffer = fitting_problem._norm_buffer
+        fitting_problem.eval_r_norm(params=[3.0])
+        self.assertIs(fitting_problem._norm_buffer, buffer)
+
+    def test_eval_f_batch(self):
+        """
+        Test that several parameter vectors are evaluated in one call, with
+        and without broadcasting
+        """
+        params_matrix = np.array([[1.0, 2.0], [3.0, 0.5], [0.0, 1.0]])
+        fitting_problem = FittingProblem()
+        fitting_problem.data_x = np.array([0.0, 1.0, 2.0, 3.0])
+        fitting_problem.data_y = np.array([1.0, 2.0, 4.0, 8.0])
+        expected = np.array([fitting_problem.data_x * p[1] + p[0]
+                             for p in params_matrix])
+
+        fitting_problem.function = nist_func_definition('b1 + b2*x',
+                                                        ['b1', 'b2'])
+        np.testing.assert_allclose(
+            fitting_problem.eval_f_batch(params_matrix), expected)
+        fitting_problem.function = lambda x, p1, p2: float(p1) + float(p2)*x
+        np.testing.assert_allclose(
+            fitting_problem.eval_f_batch(params_matrix), expected)
+        self.assertEqual(fitting_problem.eval_counts['eval_f'], 6)
+
+        # Expressions which do not depend on x are broadcast
+        fitting_problem.function = nist_func_definition('b1', ['b1'])
+        self.assertEqual(
+            fitting_problem.eval_f_batch(params_matrix[:, :1]).shape, (3, 4))
+
+    def test_eval_r_batch(self):
+        """
+        Test that the batched residuals match eval_r
+        """
+        params_matrix = np.array([[1.0, 2.0], [3.0, 0.5]])
+        fitting_problem = FittingProblem()
+        fitting_problem.function = nist_func_definition('b1*exp(-b2*x)',
+                                                        ['b1', 'b2'])
+        fitting_problem.data_x = np.array([0.0, 1.0, 2.0])
+        fitting_problem.data_y = np.array([1.0, 2.0, 4.0])
+        fitting_problem.data_e = np.array([1.0, 0.5, 2.0])
+        fitting_problem.correct_data(True)
+
+        residuals = fitting_problem.eval_r_batch(params_matrix)
+        for params, r in zip(params_matrix, residuals):
+            np.testing.assert_allclose(r, fitting_problem.eval_r(params))
+
     def test_eval_starting_params(self):
         """
         Test that eval_starting_params returns the correct result
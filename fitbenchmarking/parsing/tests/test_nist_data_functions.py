@@ -0,0 +1,83 @@
+"""
+Tests for the nist_data_functions.py file
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from unittest import TestCase
+
+import numpy as np
+
+from fitbenchmarking.parsing.fitting_problem import FittingProblem
+from fitbenchmarking.parsing.nist_data_functions import \
+    nist_func_definition, nist_jacobian_definition
+from fitbenchmarking.utils.exceptions import ParsingError
+
+
+class NISTJacobianTests(TestCase):
+    """
+    Tests for nist_jacobian_definition
+    """
+
+    def setUp(self):
+        self.x = np.array([0.5, 1.0, 2.0, 4.0])
+
+    def test_derivatives(self):
+        """
+        Test the derivatives of expressions using each of the supported
+        operations and functions
+        """
+        b1, b2 = 1.5, 0.25
+        x = self.x
+        cases = {
+            'b1 + b2*x': [np.ones_like(x), x],
+            'b1*(1-exp(-b2*x))': [1 - np.exp(-b2 * x),
+                                  b1 * x * np.exp(-b2 * x)],
+            'b1 / (b2 + x)': [1 / (b2 + x), -b1 / (b2 + x)**2],
+            'b1*x**b2': [x**b2, b1 * x**b2 * np.log(x)],
+            '(b1+x)**(-1/b2)': [-1 / b2 * (b1 + x)**(-1 / b2 - 1),
+                                (b1 + x)**(-1 / b2) * np.log(b1 + x)
+                                / b2**2],
+            'b1*cos(2*pi*x/12) + sin(b2*x)': [np.cos(2 * np.pi * x / 12),
+                                              x * np.cos(b2 * x)],
+            'tan(b1*x) - b2': [x / np.cos(b1 * x)**2, -np.ones_like(x)],
+        }
+        for equation, expected in cases.items():
+            jacobian = nist_jacobian_definition(equation, ['b1', 'b2'])
+            np.testing.assert_allclose(jacobian(x, b1, b2),
+                                       np.column_stack(expected),
+                                       err_msg=equation)
+
+    def test_unused_parameter(self):
+        """
+        Test that parameters which do not appear have zero derivatives
+        """
+        jacobian = nist_jacobian_definition('b1*x', ['b1', 'b2'])
+        np.testing.assert_array_equal(jacobian(self.x, 2.0, 3.0),
+                                      np.column_stack([self.x,
+                                                       np.zeros(4)]))
+
+    def test_unsafe(self):
+        """
+        Test that expressions which are not safe are rejected
+        """
+        self.assertRaises(ParsingError, nist_jacobian_definition,
+                          'b1*x; import os', ['b1'])
+
+    def test_eval_j(self):
+        """
+        Test that eval_j uses the exact Jacobian, weighted by the errors
+        """
+        problem = FittingProblem()
+        problem.function = nist_func_definition('b1*exp(-b2*x)', ['b1', 'b2'])
+        problem.jacobian = nist_jacobian_definition('b1*exp(-b2*x)',
+                                                    ['b1', 'b2'])
+        problem.data_x = self.x
+        problem.data_y = np.zeros(4)
+        problem.data_e = np.array([1.0, 2.0, 4.0, 0.5])
+        problem.correct_data(True)
+
+        jac = problem.eval_j([2.0, 0.5])
+        expected = -np.column_stack([np.exp(-0.5 * self.x),
+                                     -2.0 * self.x * np.exp(-0.5 * self.x)])
+        np.testing.assert_allclose(jac, expected / problem.data_e[:, None])
+        self.assertEqual(problem.eval_counts['eval_f'], 0)
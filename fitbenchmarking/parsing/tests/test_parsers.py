@@ -9,7 +9,9 @@ import numpy as np
 import os
 from unittest import TestCase
 
+from fitbenchmarking.parsing import nist_parser
 from fitbenchmarking.parsing.base_parser import Parser
+from fitbenchmarking.parsing.dual_numbers import dual_jacobian
 from fitbenchmarking.parsing.fitting_problem import FittingProblem
 from fitbenchmarking.parsing.parser_factory import \
     ParserFactory, parse_problem_file
@@ -273,3 +275,86 @@ class TestParserFactory(TestCase):
                                 'basic.dat')
         fitting_problem = parse_problem_file(filename)
         self.assertEqual(fitting_problem.name, 'basic')
+
+
+class TestNISTFallback(TestCase):
+    """
+    Tests for NIST problems whose equation can not be compiled
+    """
+
+    def setUp(self):
+        self.filename = os.path.join(os.path.dirname(__file__),
+                                     'nist',
+                                     'basic.dat')
+        self.from_equation = nist_parser.CompiledExpression.from_equation
+
+        def from_equation(*args, **kwargs):
+            raise exceptions.ParsingError('Not compiled')
+        nist_parser.CompiledExpression.from_equation = from_equation
+
+    def tearDown(self):
+        nist_parser.CompiledExpression.from_equation = self.from_equation
+
+    def test_fallback(self):
+        """
+        Tests that the equation is evaluated and differentiated without
+        compiling it
+        """
+        fitting_problem = parse_problem_file(self.filename)
+        self.assertNotIsInstance(fitting_problem.function,
+                                 nist_parser.CompiledExpression)
+        self.assertIsNotNone(fitting_problem.jacobian)
+
+        x = np.linspace(0.5, 4.0, 10)
+        jacobian = fitting_problem.jacobian(x, 1.5, 0.25)
+        expected = dual_jacobian(fitting_problem.function)(x, 1.5, 0.25)
+        np.testing.assert_allclose(jacobian, expected)
+
+    def test_fallback_not_differentiated(self):
+        """
+        Tests that dual numbers are used if the equation can not be
+        differentiated either
+        """
+        jacobian_definition = nist_parser.nist_jacobian_definition
+
+        def nist_jacobian_definition(*args, **kwargs):
+            raise exceptions.ParsingError('Not differentiated')
+        nist_parser.nist_jacobian_definition = nist_jacobian_definition
+        try:
+            fitting_problem = parse_problem_file(self.filename)
+        finally:
+            nist_parser.nist_jacobian_definition = jacobian_definition
+        self.assertIsNone(fitting_problem.jacobian)
+        self.assertTrue(fitting_problem.function.supports_dual_numbers)
+
+
+class TestSasviewFunction(TestCase):
+    """
+    Tests for the function created for SasView problems, which reuses the
+    sasmodels kernel and data between evaluations.
+    """
+
+    def setUp(self):
+        self.filename = os.path.join(os.path.dirname(__file__),
+                                     'fitbenchmark',
+                                     'sasview_basic_eval.txt')
+        self.function = parse_problem_file(self.filename).function
+
+    def test_repeated_evaluations(self):
+        """
+        Tests that evaluating with new parameters or x values gives the same
+        results as a newly parsed function, and does not change earlier
+        results.
+        """
+        x1 = np.linspace(0.01, 0.3, 20)
+        x2 = np.linspace(0.02, 0.4, 30)
+
+        first = self.function(x1, 20.0, 400.0)
+        first_copy = first.copy()
+        evaluations = [(x1, [30.0, 300.0]), (x2, [30.0, 300.0]),
+                       (x1, [20.0, 400.0])]
+        for x, params in evaluations:
+            expected = parse_problem_file(self.filename).function(x, *params)
+            np.testing.assert_allclose(self.function(x, *params), expected)
+
+        np.testing.assert_array_equal(first, first_copy)
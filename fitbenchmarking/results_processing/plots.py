@@ -5,8 +5,15 @@ guess plot.
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+import numpy as np
 import os
 
+from fitbenchmarking.utils.fitbm_result import OVERHEAD_COLOURS
+
+# The largest chi squared value shown in trace plots with a log scale, as
+# the ticks of log axes overflow for values not far above it
+MAX_LOG_TRACE_VALUE = 1e200
+
 
 class Plot(object):
     """
@@ -214,3 +221,84 @@ class Plot(object):
         file_name = os.path.join(self.figures_dir, file)
         self.fig.savefig(file_name)
         return file
+
+    def plot_overhead(self, minimizer, overhead):
+        """
+        Plots the overhead breakdown of a fit as a stacked bar and stores it
+        in a file
+
+        :param minimizer: name of the fit minimizer
+        :type minimizer: str
+        :param overhead: time spent in each part of the fit, as stored in
+                         FittingResult.overhead
+        :type overhead: dict
+
+        :return: path to the saved file
+        :rtype: str
+        """
+        fig = plt.figure(figsize=(6.4, 2.4))
+        ax = fig.add_subplot(1, 1, 1)
+        left = 0.0
+        for part, value in overhead.items():
+            ax.barh(0, value, left=left, color=OVERHEAD_COLOURS[part],
+                    edgecolor='black', label=part)
+            left += value
+        ax.set_yticks([])
+        ax.set_xlabel("Time (s)")
+        ax.set_title("{0} {1} ({2})".format(self.problem.name, self.count,
+                                            minimizer),
+                     fontsize=self.title_size)
+        ax.legend(loc='center left', bbox_to_anchor=(1.0, 0.5))
+        fig.set_tight_layout(True)
+        file = "{}_overhead_for_{}_{}.png".format(
+            minimizer, self.problem.sanitised_name, self.count)
+        file_name = os.path.join(self.figures_dir, file)
+        fig.savefig(file_name)
+        plt.close(fig)
+        return file
+
+    def plot_trace(self, minimizer, trace):
+        """
+        Plots the chi squared value of each evaluation in a fit against the
+        time it was evaluated, with the best value so far, and stores it in a
+        file
+
+        :param minimizer: name of the fit minimizer
+        :type minimizer: str
+        :param trace: the convergence trace of the fit
+        :type trace: fitbenchmarking.utils.convergence_trace.ConvergenceTrace
+
+        :return: path to the saved file
+        :rtype: str
+        """
+        # Evaluations which overflowed or failed can't be plotted
+        finite = np.isfinite(trace.chi_sq)
+        time = trace.time[finite]
+        chi_sq = trace.chi_sq[finite]
+        best_so_far = trace.best_so_far()[finite]
+
+        fig = plt.figure()
+        ax = fig.add_subplot(1, 1, 1)
+        ax.plot(time, chi_sq, label="Evaluations",
+                color=self.fit_plot_options["color"], marker="x",
+                linestyle='')
+        ax.step(time, best_so_far, where='post',
+                label="Best so far", color=self.best_fit_plot_options["color"],
+                linewidth=2)
+        if chi_sq.size and (chi_sq > 0).all():
+            ax.set_yscale('log')
+            if chi_sq.max() > MAX_LOG_TRACE_VALUE:
+                ax.set_ylim(top=MAX_LOG_TRACE_VALUE)
+        ax.set_xlabel("Time (s)")
+        ax.set_ylabel("Chi squared")
+        ax.set_title("{0} {1} ({2})".format(self.problem.name, self.count,
+                                            minimizer),
+                     fontsize=self.title_size)
+        ax.legend(loc="upper right")
+        fig.set_tight_layout(True)
+        file = "{}_trace_for_{}_{}.png".format(
+            minimizer, self.problem.sanitised_name, self.count)
+        file_name = os.path.join(self.figures_dir, file)
+        fig.savefig(file_name)
+        plt.close(fig)
+        return file
@@ -72,6 +72,8 @@ def create_prob_group(prob_results, group_name, support_pages_dir,
         # Bool for print message/insert image
         fit_success = init_success = options.make_plots
 
+        overhead_success = trace_success = options.make_plots
+
         if options.make_plots:
             fig_fit, fig_start = get_figure_paths(result, count)
             if fig_fit == '':
@@ -80,9 +82,19 @@ def create_prob_group(prob_results, group_name, support_pages_dir,
             if fig_start == '':
                 fig_start = result.figure_error
                 init_success = False
+            fig_overhead = get_figure_path(result.overhead_figure_link)
+            if fig_overhead == '':
+                fig_overhead = 'No timings are available for this fit'
+                overhead_success = False
+            fig_trace = get_figure_path(result.trace_figure_link)
+            if fig_trace == '':
+                fig_trace = 'Re-run with record_trace set to yes in the ' \
+                            'ini file to record the convergence of the fit.'
+                trace_success = False
         else:
-            fig_fit = fig_start = 'Re-run with make_plots set to yes in the ' \
-                                  'ini file to generate plots.'
+            fig_fit = fig_start = fig_overhead = fig_trace = \
+                'Re-run with make_plots set to yes in the ini file to ' \
+                'generate plots.'
 
         root = os.path.dirname(inspect.getfile(fitbenchmarking))
         template_dir = os.path.join(root, "templates")
@@ -101,12 +113,20 @@ def create_prob_group(prob_results, group_name, support_pages_dir,
                 equation=result.problem.equation,
                 initial_guess=result.ini_function_params,
                 minimiser=result.minimizer,
+                nfev=result.nfev,
+                njev=result.njev,
+                residual_cache_hits=result.residual_cache_hits,
+                residual_cache_misses=result.residual_cache_misses,
                 is_best_fit=result.is_best_fit,
                 initial_plot_available=init_success,
                 initial_plot=fig_start,
                 min_params=result.fin_function_params,
                 fitted_plot_available=fit_success,
-                fitted_plot=fig_fit))
+                fitted_plot=fig_fit,
+                overhead_plot_available=overhead_success,
+                overhead_plot=fig_overhead,
+                trace_plot_available=trace_success,
+                trace_plot=fig_trace))
 
         result.support_page_link = file_path
 
@@ -136,3 +156,18 @@ def get_figure_paths(result, count):
             output.append(path)
 
     return output[0], output[1]
+
+
+def get_figure_path(link):
+    """
+    Get the path to a figure used in the support page.
+
+    :param link: The name of the figure file, or '' if there is no figure
+    :type link: str
+
+    :return: the path to the figure, or '' if there is no figure
+    :rtype: str
+    """
+    if link == '':
+        return ''
+    return os.path.join("figures", link)
@@ -15,9 +15,11 @@ import fitbenchmarking
 ERROR_OPTIONS = {0: "Successfully converged",
                  1: "Software reported maximum number of iterations exceeded",
                  2: "Software run but didn't converge to solution",
-                 3: "Software raised an exception"}
+                 3: "Software raised an exception",
+                 4: "Fit did not finish within the timeout"}
 
-SORTED_TABLE_NAMES = ["compare", "acc", "runtime", "local_min"]
+SORTED_TABLE_NAMES = ["compare", "acc", "runtime", "nfev", "model_time",
+                      "overhead", "time_to_target", "local_min"]
 
 
 def create_results_tables(options, results, best_results, group_name,
@@ -183,7 +185,18 @@ def render_pandas_dataframe(table_dict, best_results, table_names,
         Colour mapping for visualisation of table
         '''
         colour = value.colour
-        if isinstance(colour, list):
+        if isinstance(colour, list) and isinstance(colour[0], tuple):
+            # Stacked bar of (colour, fraction of the cell) pairs
+            stops = []
+            position = 0.0
+            for part_colour, fraction in colour:
+                stops.append('{0} {1:.1f}%'.format(part_colour, position))
+                position += 100.0 * fraction
+                stops.append('{0} {1:.1f}%'.format(part_colour, position))
+            colour_output = \
+                'background-image: linear-gradient(to right,{0})'.format(
+                    ','.join(stops))
+        elif isinstance(colour, list):
             # Use 4 colours in gradient to make gradient only change in centre
             # of cell
             colour_output = \
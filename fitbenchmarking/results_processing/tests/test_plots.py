@@ -1,11 +1,78 @@
 from __future__ import (absolute_import, division, print_function)
+import inspect
+import os
+import shutil
+import tempfile
 import unittest
 
-import fitbenchmarking.results_processing.plots
+import numpy as np
+
+from fitbenchmarking import mock_problems
+from fitbenchmarking.parsing.parser_factory import parse_problem_file
+from fitbenchmarking.results_processing.plots import Plot
+from fitbenchmarking.utils.convergence_trace import ConvergenceTrace
+from fitbenchmarking.utils.options import Options
 
 
 class PlotTests(unittest.TestCase):
-    pass
+
+    def setUp(self):
+        bench_prob_dir = os.path.dirname(inspect.getfile(mock_problems))
+        problem = parse_problem_file(os.path.join(bench_prob_dir,
+                                                  'cubic.dat'))
+        problem.correct_data(True)
+        self.figures_dir = tempfile.mkdtemp()
+        self.plot = Plot(problem=problem,
+                         options=Options(),
+                         count=1,
+                         figures_dir=self.figures_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.figures_dir)
+
+    def make_trace(self, chi_sq):
+        trace = ConvergenceTrace()
+        trace.start()
+        for i, value in enumerate(chi_sq):
+            trace.append(i + 1, value)
+        trace.stop()
+        return trace
+
+    def test_plot_trace(self):
+        trace = self.make_trace([10.0, 5.0, 7.0, 1.0])
+        file_name = self.plot.plot_trace('min', trace)
+        self.assertTrue(os.path.isfile(os.path.join(self.figures_dir,
+                                                    file_name)))
+
+    def test_plot_trace_not_finite(self):
+        """
+        Evaluations which overflowed are left out of the plot
+        """
+        trace = self.make_trace([0.92, 2.04, 2.29e4, 2.37e4, np.inf])
+        file_name = self.plot.plot_trace('min', trace)
+        self.assertTrue(os.path.isfile(os.path.join(self.figures_dir,
+                                                    file_name)))
+
+        trace = self.make_trace([np.nan, 10.0, 5.0, np.inf, 1.0])
+        file_name = self.plot.plot_trace('min', trace)
+        self.assertTrue(os.path.isfile(os.path.join(self.figures_dir,
+                                                    file_name)))
+
+    def test_plot_trace_large(self):
+        """
+        Evaluations with very large chi squared values do not overflow the
+        ticks of the log scale
+        """
+        trace = self.make_trace([1e3, 8e266, 83.0, 90.0])
+        file_name = self.plot.plot_trace('min', trace)
+        self.assertTrue(os.path.isfile(os.path.join(self.figures_dir,
+                                                    file_name)))
+
+    def test_plot_trace_no_finite(self):
+        trace = self.make_trace([np.inf, np.nan])
+        file_name = self.plot.plot_trace('min', trace)
+        self.assertTrue(os.path.isfile(os.path.join(self.figures_dir,
+                                                    file_name)))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,142 @@
+"""
+Journal of finished fits, used to resume a benchmarking run which was
+interrupted.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import os
+import pickle
+
+from fitbenchmarking.utils.logging_setup import logger
+
+
+class Checkpoint(object):
+    """
+    An on-disk journal with a record for each finished fit.
+
+    Each record is appended to the file as soon as the fit finishes, so that
+    a run which crashes or is interrupted can be resumed without repeating
+    the fits which had already finished.
+    """
+
+    def __init__(self, file_name, resume=False):
+        """
+        Open the journal, replaying it if resuming.
+
+        :param file_name: The path to the journal file
+        :type file_name: str
+        :param resume: Whether to replay the records from a previous run,
+                       otherwise the file is cleared
+        :type resume: bool
+        """
+        self.file_name = file_name
+        self.group_name = None
+        self._results = {}
+
+        if not resume:
+            if os.path.isfile(file_name):
+                os.remove(file_name)
+            return
+
+        if os.path.isfile(file_name):
+            with open(file_name, 'rb') as f:
+                while True:
+                    try:
+                        key, result = pickle.load(f)
+                    except EOFError:
+                        break
+                    # The last record is incomplete if the run was killed
+                    # while it was being written
+                    # pylint: disable=broad-except
+                    except Exception:
+                        logger.warning('Ignoring an incomplete record at the '
+                                       'end of %s.', file_name)
+                        break
+                    self._results[key] = result
+            print('Resuming from {0} finished fits in {1}'.format(
+                len(self._results), file_name))
+
+    def start_group(self, group_name):
+        """
+        Set the problem group that the following records belong to.
+
+        :param group_name: The name (label) of the group
+        :type group_name: str
+        """
+        self.group_name = group_name
+
+    def _key(self, problem_name, parameter_set, software, minimizer):
+        """
+        Create the key used to store a result.
+
+        :param problem_name: The name of the problem
+        :type problem_name: str
+        :param parameter_set: The index of the starting values
+        :type parameter_set: int
+        :param software: The software used to fit the problem
+        :type software: str
+        :param minimizer: The minimizer used to fit the problem
+        :type minimizer: str
+
+        :return: The key for the fit
+        :rtype: tuple
+        """
+        return (self.group_name, problem_name, parameter_set, software,
+                minimizer)
+
+    def get(self, problem, parameter_set, software, minimizer, options):
+        """
+        Get the result of a fit which finished in a previous run.
+
+        :param problem: The problem that was fitted
+        :type problem: fitbenchmarking.parsing.fitting_problem.FittingProblem
+        :param parameter_set: The index of the starting values
+        :type parameter_set: int
+        :param software: The software used to fit the problem
+        :type software: str
+        :param minimizer: The minimizer used to fit the problem
+        :type minimizer: str
+        :param options: All the information specified by the user
+        :type options: fitbenchmarking.utils.options.Options
+
+        :return: The result or None if the fit has not been recorded
+        :rtype: fitbenchmarking.utils.fitbm_result.FittingResult or None
+        """
+        key = self._key(problem.name, parameter_set, software, minimizer)
+        result = self._results.get(key)
+        if result is not None:
+            result.problem = problem
+            result.options = options
+        return result
+
+    def add(self, parameter_set, software, result):
+        """
+        Append the result of a finished fit to the journal.
+
+        The problem and options are not written, as they are available when
+        the journal is replayed.
+
+        :param parameter_set: The index of the starting values
+        :type parameter_set: int
+        :param software: The software used to fit the problem
+        :type software: str
+        :param result: The result of the fit
+        :type result: fitbenchmarking.utils.fitbm_result.FittingResult
+        """
+        key = self._key(result.problem.name, parameter_set, software,
+                        result.minimizer)
+        problem, options = result.problem, result.options
+        result.problem, result.options = None, None
+        try:
+            record = pickle.dumps((key, result), protocol=2)
+        finally:
+            result.problem, result.options = problem, options
+
+        dir_name = os.path.dirname(self.file_name)
+        if dir_name and not os.path.exists(dir_name):
+            os.makedirs(dir_name)
+        with open(self.file_name, 'ab') as f:
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,160 @@
+"""
+Storage for the convergence trace of a fit: the chi squared value after each
+evaluation of the residuals, and when it was evaluated.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import timeit
+
+import numpy as np
+
+# The number of evaluations the buffers initially have space for
+INITIAL_CAPACITY = 256
+
+
+class ConvergenceTrace(object):
+    """
+    A growable record of (evaluation index, wall time, chi squared).
+
+    The values are stored in preallocated numpy buffers, which double in size
+    when they are full, so that recording is cheap and the memory used for
+    long fits is a few bytes per evaluation.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        """
+        Create an empty trace.
+
+        :param capacity: The number of evaluations to allocate space for
+        :type capacity: int
+        """
+        self._index = np.empty(capacity, dtype=np.int64)
+        self._time = np.empty(capacity, dtype=np.float64)
+        self._chi_sq = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+        self._start = None
+
+        #: *bool* Whether evaluations are currently being recorded
+        self.recording = False
+
+    def __len__(self):
+        return self._size
+
+    def __getstate__(self):
+        """
+        Only pickle the recorded part of the buffers.
+        """
+        state = self.__dict__.copy()
+        for name in ['_index', '_time', '_chi_sq']:
+            state[name] = state[name][:self._size].copy()
+        state['recording'] = False
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    @property
+    def index(self):
+        """
+        :return: The number of function evaluations made before each
+                 evaluation was recorded, including it
+        :rtype: numpy array
+        """
+        return self._index[:self._size]
+
+    @property
+    def time(self):
+        """
+        :return: The wall time in seconds from the start of the fit to each
+                 evaluation
+        :rtype: numpy array
+        """
+        return self._time[:self._size]
+
+    @property
+    def chi_sq(self):
+        """
+        :return: The chi squared value of each evaluation
+        :rtype: numpy array
+        """
+        return self._chi_sq[:self._size]
+
+    def start(self):
+        """
+        Clear the trace and start recording, with times relative to now.
+        The buffers are kept, so a trace can be reused for each run of a fit.
+        """
+        self._size = 0
+        self.recording = True
+        self._start = timeit.default_timer()
+
+    def stop(self):
+        """
+        Stop recording.
+        """
+        self.recording = False
+
+    def append(self, index, chi_sq):
+        """
+        Record an evaluation, if recording.
+
+        :param index: The number of function evaluations so far
+        :type index: int
+        :param chi_sq: The chi squared value of the evaluation
+        :type chi_sq: float
+        """
+        if not self.recording:
+            return
+        elapsed = timeit.default_timer() - self._start
+        if self._size == len(self._index):
+            self._grow()
+        i = self._size
+        self._index[i] = index
+        self._time[i] = elapsed
+        self._chi_sq[i] = chi_sq
+        self._size = i + 1
+
+    def _grow(self):
+        """
+        Double the size of the buffers.
+        """
+        capacity = max(2 * len(self._index), 1)
+        for name in ['_index', '_time', '_chi_sq']:
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def copy(self):
+        """
+        Copy the recorded evaluations into a new trace, which is not
+        recording.
+
+        :return: The copy
+        :rtype: ConvergenceTrace
+        """
+        trace = ConvergenceTrace(capacity=max(self._size, 1))
+        trace.__setstate__(self.__getstate__())
+        return trace
+
+    def best_so_far(self):
+        """
+        :return: The smallest chi squared value found up to each evaluation,
+                 ignoring evaluations which are nan
+        :rtype: numpy array
+        """
+        return np.fmin.accumulate(self.chi_sq)
+
+    def save(self, file_name):
+        """
+        Write the trace to a text file, with a row for each evaluation.
+
+        :param file_name: The path to the file
+        :type file_name: str
+        """
+        np.savetxt(file_name,
+                   np.column_stack([self.index, self.time, self.chi_sq]),
+                   fmt=['%d', '%.9g', '%.17g'],
+                   delimiter=',',
+                   header='evaluation,time,chi_sq')
@@ -86,6 +86,23 @@ def figures(support_pages_dir):
     return figures_dir
 
 
+def traces(group_results_dir):
+    """
+    Creates the traces directory in the group results directory.
+
+    :param group_results_dir: path to the group results directory
+    :type group_results_dir: str
+
+    :return: path to the traces directory
+    :rtype: str
+    """
+    traces_dir = os.path.join(group_results_dir, "traces")
+    if not os.path.exists(traces_dir):
+        os.makedirs(traces_dir)
+
+    return traces_dir
+
+
 def del_contents_of_dir(directory):
     """
     Delete contents of a directory, including other directories.
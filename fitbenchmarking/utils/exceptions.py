@@ -125,3 +125,14 @@ class FittingProblemError(FitBenchmarkException):
 
         self._class_message = 'Fitting Problem raised and exception.'
         self.error_code = 10
+
+
+class FitTimeoutError(FitBenchmarkException):
+    """
+    Indicates that a fit did not finish within the time allowed.
+    """
+    def __init__(self, message=''):
+        super(FitTimeoutError, self).__init__(message)
+
+        self._class_message = 'Fit timed out.'
+        self.error_code = 11
@@ -1,5 +1,6 @@
 from __future__ import (absolute_import, division, print_function)
 
+from collections import OrderedDict
 import os
 
 import numpy as np
@@ -7,6 +8,13 @@ import numpy as np
 GRAD_TOL = 1e-1
 RES_TOL = 1e-8
 
+# The parts of the runtime in the overhead breakdown, with the colour used
+# for each in the tables and plots
+OVERHEAD_COLOURS = OrderedDict([('model', '#a6cee3'),
+                                ('jacobian', '#b2df8a'),
+                                ('harness', '#fdbf6f'),
+                                ('solver', '#cab2d6')])
+
 
 class FittingResult(object):
     """
@@ -31,6 +39,45 @@ class FittingResult(object):
         self.runtime = runtime
         self._min_runtime = None
 
+        # The time taken by each run of the fit for each timer (wall,
+        # process and thread), the runtimes from the timer used for runtime,
+        # the number of runs, and the confidence interval of the mean
+        # runtime (lower, upper)
+        self.timings = None
+        self.runtimes = None
+        self.num_runs = None
+        self.runtime_ci = None
+
+        # The number of function and Jacobian evaluations and the time spent
+        # evaluating the model in a fit, which are infinite if the fit
+        # failed, and the values of these for each run
+        self.nfev = np.inf
+        self._min_nfev = None
+        self.njev = np.inf
+        # The number of residual evaluations found and not found in the
+        # problem's residual cache during the fit
+        self.residual_cache_hits = 0
+        self.residual_cache_misses = 0
+        self.model_time = np.inf
+        self._min_model_time = None
+        self.eval_stats = None
+
+        # The mean time in seconds spent in each part of OVERHEAD_COLOURS,
+        # None if the fit failed
+        self.overhead = None
+
+        # The convergence trace of the last run of the fit, if recorded
+        self.trace = None
+
+        # The wall time and number of function evaluations the fit took to
+        # get within options.target_tolerance of min_chi_sq, found from the
+        # trace when min_chi_sq is set. These are infinite if the fit did
+        # not get there or there is no trace.
+        self.time_to_target = np.inf
+        self._min_time_to_target = None
+        self.nfev_to_target = np.inf
+        self._min_nfev_to_target = None
+
         # Minimizer for a certain problem and its function definition
         self.minimizer = minimizer
         self.ini_function_params = ini_function_params
@@ -45,6 +92,9 @@ class FittingResult(object):
         self.colour = None
         self.colour_runtime = None
         self.colour_acc = None
+        self.colour_nfev = None
+        self.colour_model_time = None
+        self.colour_time_to_target = None
 
         # Defines the type of table to be produced
         self._table_type = None
@@ -56,6 +106,8 @@ class FittingResult(object):
         self.support_page_link = ''
         self.start_figure_link = ''
         self.figure_link = ''
+        self.overhead_figure_link = ''
+        self.trace_figure_link = ''
 
         # Links will be displayed relative to this dir
         self.relative_dir = os.path.abspath(os.sep)
@@ -75,6 +127,7 @@ class FittingResult(object):
         # norm(J^T r), norm(J^T r)/norm(r) and/or norm(r) are smaller
         # than a set tolerance
         self._local_min = None
+        self.norm_rel = None
 
     @property
     def local_min(self):
@@ -85,9 +138,14 @@ class FittingResult(object):
         :return: Whether the result is a minimum or not
         :rtype: bool
         """
+        # The result cannot change once it has been found
+        if self.norm_rel is not None:
+            return self._local_min
         if self.params is not None:
+            # Pass the residuals to eval_j so that a forward difference
+            # Jacobian does not evaluate them again
             r = self.problem.eval_r(self.params)
-            min_test = np.matmul(self.problem.eval_j(self.params).T, r)
+            min_test = np.matmul(self.problem.eval_j(self.params, f0=r).T, r)
             norm_r = np.linalg.norm(r)
             norm_min_test = np.linalg.norm(min_test)
             self.norm_rel = norm_min_test / norm_r
@@ -144,10 +202,12 @@ class FittingResult(object):
         comp_mode = self.options.comparison_mode
         result_template = self.output_string_type[comp_mode]
 
+        ci_index = None
         if value == "runtime":
             abs_value = [self.runtime]
             rel_value = [self.norm_runtime]
             self.colour = self.colour_runtime
+            ci_index = 0
         elif value == "acc":
             abs_value = [self.chi_sq]
             rel_value = [self.norm_acc]
@@ -156,8 +216,30 @@ class FittingResult(object):
             abs_value = [self.chi_sq, self.runtime]
             rel_value = [self.norm_acc, self.norm_runtime]
             self.colour = [self.colour_acc, self.colour_runtime]
-
-        if value == "local_min":
+            ci_index = 1
+        elif value == "nfev":
+            abs_value = [self.nfev]
+            rel_value = [self.norm_nfev]
+            self.colour = self.colour_nfev
+        elif value == "model_time":
+            abs_value = [self.model_time]
+            rel_value = [self.norm_model_time]
+            self.colour = self.colour_model_time
+        elif value == "time_to_target":
+            abs_value = [self.time_to_target, self.nfev_to_target]
+            rel_value = [self.norm_time_to_target, self.norm_nfev_to_target]
+            self.colour = self.colour_time_to_target
+
+        if value == "overhead":
+            self.table_output = self.overhead_string(comp_mode)
+            if self.overhead is None:
+                self.colour = self.options.colour_scale[-1][1]
+            else:
+                total = sum(self.overhead.values())
+                self.colour = [
+                    (OVERHEAD_COLOURS[k], v / total if total > 0 else 0.0)
+                    for k, v in self.overhead.items()]
+        elif value == "local_min":
             output = self.local_min
             self.table_output = output + " (" +\
                 self.output_string_type['abs'].format(self.norm_rel) + ")"
@@ -175,6 +257,58 @@ class FittingResult(object):
                     '<br>'.join([result_template.format(v1, v2)
                                  for v1, v2 in zip(abs_value, rel_value)])
 
+            if ci_index is not None and self.options.show_runtime_ci:
+                lines = self.table_output.split('<br>')
+                lines[ci_index] += self.runtime_ci_string(
+                    normalised=comp_mode != "abs")
+                self.table_output = '<br>'.join(lines)
+
+    def overhead_string(self, comp_mode):
+        """
+        Format the overhead breakdown for the tables, as the parts in the
+        order of OVERHEAD_COLOURS separated by slashes.
+
+        :param comp_mode: The comparison mode, the times are shown in seconds
+                          for 'abs', as percentages of the total for 'rel',
+                          and as both for 'both'
+        :type comp_mode: str
+
+        :return: The breakdown, or 'N/A' if it is not available
+        :rtype: str
+        """
+        if self.overhead is None:
+            return 'N/A'
+        total = sum(self.overhead.values())
+        parts = []
+        for value in self.overhead.values():
+            percent = 100.0 * value / total if total > 0 else 0.0
+            if comp_mode == "abs":
+                parts.append('{:.4g}'.format(value))
+            elif comp_mode == "rel":
+                parts.append('{:.3g}%'.format(percent))
+            else:
+                parts.append('{0:.4g} ({1:.3g}%)'.format(value, percent))
+        return ' / '.join(parts)
+
+    def runtime_ci_string(self, normalised):
+        """
+        Format the confidence interval of the runtime for the tables.
+
+        :param normalised: Whether to divide the interval by min_runtime
+        :type normalised: bool
+
+        :return: The interval as ' [lower, upper]', or an empty string if it
+                 is not available
+        :rtype: str
+        """
+        if self.runtime_ci is None or not np.all(np.isfinite(self.runtime_ci)):
+            return ''
+        lower, upper = self.runtime_ci
+        if normalised:
+            lower = _normalise(lower, self.min_runtime)
+            upper = _normalise(upper, self.min_runtime)
+        return ' [{0:.4g}, {1:.4g}]'.format(lower, upper)
+
     def set_colour_scale(self):
         """
         Utility function set colour rendering for html tables
@@ -186,11 +320,22 @@ class FittingResult(object):
         html_colours = [colour[1] for colour in colour_scale]
         self.colour_runtime = colour_scale[-1]
         self.colour_acc = colour_scale[-1]
+        self.colour_nfev = colour_scale[-1]
+        self.colour_model_time = colour_scale[-1]
+        self.colour_time_to_target = colour_scale[-1]
         for i in range(len(colour_bounds) - 1):
             if colour_bounds[i] < self.norm_runtime <= colour_bounds[i + 1]:
                 self.colour_runtime = html_colours[i]
             if colour_bounds[i] < self.norm_acc <= colour_bounds[i + 1]:
                 self.colour_acc = html_colours[i]
+            if colour_bounds[i] < self.norm_nfev <= colour_bounds[i + 1]:
+                self.colour_nfev = html_colours[i]
+            if colour_bounds[i] < self.norm_model_time \
+                    <= colour_bounds[i + 1]:
+                self.colour_model_time = html_colours[i]
+            if colour_bounds[i] < self.norm_time_to_target \
+                    <= colour_bounds[i + 1]:
+                self.colour_time_to_target = html_colours[i]
 
     @property
     def min_chi_sq(self):
@@ -208,6 +353,23 @@ class FittingResult(object):
         if not self.chi_sq > 0:
             self.chi_sq = np.inf
         self.norm_acc = self.chi_sq / self.min_chi_sq
+        self.find_time_to_target()
+
+    def find_time_to_target(self):
+        """
+        Find the first evaluation in the trace whose chi squared value is
+        within options.target_tolerance of min_chi_sq, and set
+        time_to_target and nfev_to_target from it.
+        """
+        self.time_to_target = np.inf
+        self.nfev_to_target = np.inf
+        if self.trace is None or self.min_chi_sq is None:
+            return
+        target = (1 + self.options.target_tolerance) * self.min_chi_sq
+        reached = np.flatnonzero(self.trace.chi_sq <= target)
+        if reached.size > 0:
+            self.time_to_target = float(self.trace.time[reached[0]])
+            self.nfev_to_target = int(self.trace.index[reached[0]])
 
     @property
     def min_runtime(self):
@@ -222,4 +384,90 @@ class FittingResult(object):
         :type value: float
         """
         self._min_runtime = value
-        self.norm_runtime = self.runtime / self.min_runtime
+        self.norm_runtime = _normalise(self.runtime, self.min_runtime)
+
+    @property
+    def min_nfev(self):
+        return self._min_nfev
+
+    @min_nfev.setter
+    def min_nfev(self, value):
+        """
+        Stores the min number of function evaluations and updates the
+        normalised value
+
+        :param value: New value for min_nfev
+        :type value: float
+        """
+        self._min_nfev = value
+        self.norm_nfev = _normalise(self.nfev, self.min_nfev)
+
+    @property
+    def min_model_time(self):
+        return self._min_model_time
+
+    @min_model_time.setter
+    def min_model_time(self, value):
+        """
+        Stores the min model time and updates the normalised value
+
+        :param value: New value for min_model_time
+        :type value: float
+        """
+        self._min_model_time = value
+        self.norm_model_time = _normalise(self.model_time,
+                                          self.min_model_time)
+
+    @property
+    def min_time_to_target(self):
+        return self._min_time_to_target
+
+    @min_time_to_target.setter
+    def min_time_to_target(self, value):
+        """
+        Stores the min time to target and updates the normalised value
+
+        :param value: New value for min_time_to_target
+        :type value: float
+        """
+        self._min_time_to_target = value
+        self.norm_time_to_target = _normalise(self.time_to_target,
+                                              self.min_time_to_target)
+
+    @property
+    def min_nfev_to_target(self):
+        return self._min_nfev_to_target
+
+    @min_nfev_to_target.setter
+    def min_nfev_to_target(self, value):
+        """
+        Stores the min number of function evaluations to target and updates
+        the normalised value
+
+        :param value: New value for min_nfev_to_target
+        :type value: float
+        """
+        self._min_nfev_to_target = value
+        self.norm_nfev_to_target = _normalise(self.nfev_to_target,
+                                              self.min_nfev_to_target)
+
+
+def _normalise(value, min_value):
+    """
+    Divide a value by the best value, where the best value can be zero (e.g.
+    no function evaluations were recorded for any minimizer).
+
+    :param value: The value to normalise
+    :type value: float
+    :param min_value: The best value
+    :type min_value: float
+
+    :return: The normalised value, 1 if both values are zero and infinite
+             if the value is infinite
+    :rtype: float
+    """
+    if np.isinf(value):
+        return np.inf
+    if min_value > 0:
+        return value / min_value
+    return 1.0 if value == min_value else np.inf
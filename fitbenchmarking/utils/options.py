@@ -6,7 +6,9 @@ import configparser
 
 import os
 
+from fitbenchmarking.parsing.finite_difference import FD_METHODS
 from fitbenchmarking.utils.exceptions import OptionsError
+from fitbenchmarking.utils.timing import RUNTIME_STATISTICS, TIMERS
 
 
 class Options(object):
@@ -51,6 +53,55 @@ class Options(object):
             self.use_errors = fitting.getboolean('use_errors')
         except ValueError:
             error_message.append(template.format('use_errors', "boolean"))
+        self.timer = fitting.getstr('timer')
+        if self.timer not in TIMERS:
+            error_message.append(
+                'The option \'timer\' must be one of {}.'.format(
+                    ', '.join(TIMERS)))
+        try:
+            self.adaptive_runs = fitting.getboolean('adaptive_runs')
+        except ValueError:
+            error_message.append(template.format('adaptive_runs', "boolean"))
+        try:
+            self.min_runs = fitting.getint('min_runs')
+        except ValueError:
+            error_message.append(template.format('min_runs', "int"))
+        else:
+            if self.min_runs < 1:
+                error_message.append('The option \'min_runs\' must be at '
+                                     'least 1.')
+        try:
+            self.max_runs = fitting.getint('max_runs')
+        except ValueError:
+            error_message.append(template.format('max_runs', "int"))
+        else:
+            # min_runs is not set if it is not an int
+            if self.max_runs < getattr(self, 'min_runs', 1):
+                error_message.append('The option \'max_runs\' must be at '
+                                     'least min_runs.')
+        try:
+            self.target_ci_width = fitting.getfloat('target_ci_width')
+        except ValueError:
+            error_message.append(template.format('target_ci_width', "float"))
+        try:
+            self.timing_budget = fitting.getfloat('timing_budget')
+        except ValueError:
+            error_message.append(template.format('timing_budget', "float"))
+        try:
+            self.record_trace = fitting.getboolean('record_trace')
+        except ValueError:
+            error_message.append(template.format('record_trace', "boolean"))
+        try:
+            self.mantid_output_workspaces = fitting.getboolean(
+                'mantid_output_workspaces')
+        except ValueError:
+            error_message.append(template.format('mantid_output_workspaces',
+                                                 "boolean"))
+        self.jacobian_method = fitting.getstr('jacobian_method')
+        if self.jacobian_method not in FD_METHODS:
+            error_message.append(
+                'The option \'jacobian_method\' must be one of {}.'.format(
+                    ', '.join(sorted(FD_METHODS))))
 
         plotting = config['PLOTTING']
         try:
@@ -65,6 +116,67 @@ class Options(object):
         self.comparison_mode = plotting.getstr('comparison_mode')
         self.table_type = plotting.getlist('table_type')
         self.results_dir = plotting.getstr('results_dir')
+        self.runtime_statistic = plotting.getstr('runtime_statistic')
+        if self.runtime_statistic not in RUNTIME_STATISTICS:
+            error_message.append(
+                'The option \'runtime_statistic\' must be one of {}.'.format(
+                    ', '.join(sorted(RUNTIME_STATISTICS))))
+        try:
+            self.show_runtime_ci = plotting.getboolean('show_runtime_ci')
+        except ValueError:
+            error_message.append(template.format('show_runtime_ci',
+                                                 "boolean"))
+        try:
+            self.target_tolerance = plotting.getfloat('target_tolerance')
+        except ValueError:
+            error_message.append(template.format('target_tolerance', "float"))
+        else:
+            if self.target_tolerance < 0:
+                error_message.append('The option \'target_tolerance\' must '
+                                     'not be negative.')
+        if 'time_to_target' in self.table_type and not self.record_trace:
+            error_message.append('The table type \'time_to_target\' needs '
+                                 'record_trace to be set.')
+
+        execution = config['EXECUTION']
+        try:
+            self.num_workers = execution.getint('num_workers')
+        except ValueError:
+            error_message.append(template.format('num_workers', "int"))
+        else:
+            if self.num_workers < 1:
+                error_message.append('The option \'num_workers\' must be '
+                                     'at least 1.')
+        self.runtime_history = execution.getstr('runtime_history')
+        self.checkpoint_file = execution.getstr('checkpoint_file')
+        try:
+            self.fit_timeout = execution.getfloat('fit_timeout')
+        except ValueError:
+            error_message.append(template.format('fit_timeout', "float"))
+        try:
+            self.max_tasks_per_worker = execution.getint(
+                'max_tasks_per_worker')
+        except ValueError:
+            error_message.append(template.format('max_tasks_per_worker',
+                                                 "int"))
+        try:
+            self.max_worker_memory = execution.getfloat('max_worker_memory')
+        except ValueError:
+            error_message.append(template.format('max_worker_memory',
+                                                 "float"))
+        try:
+            self.use_cache = execution.getboolean('use_cache')
+        except ValueError:
+            error_message.append(template.format('use_cache', "boolean"))
+        self.cache_dir = execution.getstr('cache_dir')
+        try:
+            self.max_cache_size = execution.getfloat('max_cache_size')
+        except ValueError:
+            error_message.append(template.format('max_cache_size', "float"))
+        try:
+            self.max_cache_age = execution.getfloat('max_cache_age')
+        except ValueError:
+            error_message.append(template.format('max_cache_age', "float"))
 
         # sys.exit() will be addressed in future FitBenchmarking
         # error handling issue
@@ -94,8 +206,18 @@ class Options(object):
 
         config['MINIMIZERS'] = {k: list_to_string(m)
                                 for k, m in self.minimizers.items()}
-        config['FITTING'] = {'num_runs': self.num_runs,
+        config['FITTING'] = {'adaptive_runs': self.adaptive_runs,
+                             'jacobian_method': self.jacobian_method,
+                             'mantid_output_workspaces':
+                                 self.mantid_output_workspaces,
+                             'max_runs': self.max_runs,
+                             'min_runs': self.min_runs,
+                             'num_runs': self.num_runs,
+                             'record_trace': self.record_trace,
                              'software': list_to_string(self.software),
+                             'target_ci_width': self.target_ci_width,
+                             'timer': self.timer,
+                             'timing_budget': self.timing_budget,
                              'use_errors': self.use_errors}
         cs = list_to_string(['{0}, {1}'.format(*pair)
                              for pair in self.colour_scale])
@@ -103,7 +225,21 @@ class Options(object):
                               'comparison_mode': self.comparison_mode,
                               'make_plots': self.make_plots,
                               'results_dir': self.results_dir,
+                              'runtime_statistic': self.runtime_statistic,
+                              'show_runtime_ci': self.show_runtime_ci,
+                              'target_tolerance': self.target_tolerance,
                               'table_type': list_to_string(self.table_type)}
+        config['EXECUTION'] = {'cache_dir': self.cache_dir,
+                               'checkpoint_file': self.checkpoint_file,
+                               'fit_timeout': self.fit_timeout,
+                               'max_cache_age': self.max_cache_age,
+                               'max_cache_size': self.max_cache_size,
+                               'max_tasks_per_worker':
+                                   self.max_tasks_per_worker,
+                               'max_worker_memory': self.max_worker_memory,
+                               'num_workers': self.num_workers,
+                               'runtime_history': self.runtime_history,
+                               'use_cache': self.use_cache}
 
         with open(file_name, 'w') as f:
             config.write(f)
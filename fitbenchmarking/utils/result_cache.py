@@ -0,0 +1,239 @@
+"""
+Cache of fit results which is kept between runs, so that fits which have not
+changed since a previous run do not need to be repeated.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import hashlib
+import inspect
+import os
+import pickle
+import time
+
+import numpy as np
+
+from fitbenchmarking.controllers.controller_factory import ControllerFactory
+from fitbenchmarking.utils.logging_setup import logger
+
+try:
+    import pkg_resources
+    VERSION = pkg_resources.get_distribution('fitbenchmarking').version
+# pylint: disable=broad-except
+except Exception:
+    VERSION = 'unknown'
+
+# The error flags of results which are cached. Fits which raised an
+# exception or timed out are always repeated.
+CACHED_FLAGS = [0, 1, 2]
+
+
+def problem_hash(problem):
+    """
+    Create a hash of the definition and data of a problem.
+
+    :param problem: The parsed problem
+    :type problem: fitbenchmarking.parsing.fitting_problem.FittingProblem
+
+    :return: The hex digest of the problem
+    :rtype: str
+    """
+    h = hashlib.sha256()
+    definition = [problem.name,
+                  problem.equation,
+                  problem._mantid_equation,
+                  [list(s.items()) for s in problem.starting_values],
+                  sorted(problem.value_ranges.items())
+                  if problem.value_ranges else None,
+                  problem.start_x,
+                  problem.end_x]
+    h.update(repr(definition).encode('utf-8'))
+    for data in [problem.data_x, problem.data_y, problem.data_e]:
+        if data is None:
+            h.update(b'None')
+        else:
+            h.update(np.ascontiguousarray(data, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+class ResultCache(object):
+    """
+    A directory of fit results, with one file per fit named by a hash of
+    everything which affects the result.
+
+    Entries are evicted when they are older than max_age days, and the least
+    recently used are evicted when the cache is larger than max_size MB.
+    """
+
+    def __init__(self, cache_dir, max_size=0, max_age=0,
+                 force_recompute=False):
+        """
+        Open the cache, evicting old entries.
+
+        :param cache_dir: The directory the results are stored in
+        :type cache_dir: str
+        :param max_size: The maximum size of the cache in MB, 0 for no limit
+        :type max_size: float
+        :param max_age: The maximum age of an entry in days, 0 for no limit
+        :type max_age: float
+        :param force_recompute: Whether to ignore the cached results. New
+                                results are still stored.
+        :type force_recompute: bool
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.max_age = max_age
+        self.force_recompute = force_recompute
+        self._controller_hashes = {}
+
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        self.evict()
+
+    def _controller_hash(self, software):
+        """
+        Create a hash of the source of the controller for a software, so that
+        changes to the controller invalidate its results.
+
+        :param software: The name of the software
+        :type software: str
+
+        :return: The hex digest of the controller module
+        :rtype: str
+        """
+        if software not in self._controller_hashes:
+            controller_cls = ControllerFactory.create_controller(software)
+            with open(inspect.getsourcefile(controller_cls), 'rb') as f:
+                self._controller_hashes[software] = \
+                    hashlib.sha256(f.read()).hexdigest()
+        return self._controller_hashes[software]
+
+    def _file_name(self, problem, parameter_set, software, minimizer,
+                   options):
+        """
+        Get the path of the cache entry for a fit.
+
+        :param problem: The problem that was fitted
+        :type problem: fitbenchmarking.parsing.fitting_problem.FittingProblem
+        :param parameter_set: The index of the starting values
+        :type parameter_set: int
+        :param software: The software used to fit the problem
+        :type software: str
+        :param minimizer: The minimizer used to fit the problem
+        :type minimizer: str
+        :param options: All the information specified by the user
+        :type options: fitbenchmarking.utils.options.Options
+
+        :return: The path to the entry
+        :rtype: str
+        """
+        if options.adaptive_runs:
+            runs = [options.min_runs, options.max_runs,
+                    options.target_ci_width, options.timing_budget]
+        else:
+            runs = options.num_runs
+        key = [problem_hash(problem), parameter_set, software, minimizer,
+               VERSION, self._controller_hash(software), runs,
+               options.use_errors, options.record_trace,
+               options.jacobian_method, options.fit_timeout,
+               options.mantid_output_workspaces]
+        digest = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.pkl')
+
+    def get(self, problem, parameter_set, software, minimizer, options):
+        """
+        Get the cached result of a fit.
+
+        :param problem: The problem that was fitted
+        :type problem: fitbenchmarking.parsing.fitting_problem.FittingProblem
+        :param parameter_set: The index of the starting values
+        :type parameter_set: int
+        :param software: The software used to fit the problem
+        :type software: str
+        :param minimizer: The minimizer used to fit the problem
+        :type minimizer: str
+        :param options: All the information specified by the user
+        :type options: fitbenchmarking.utils.options.Options
+
+        :return: The result or None if the fit is not cached
+        :rtype: fitbenchmarking.utils.fitbm_result.FittingResult or None
+        """
+        if self.force_recompute:
+            return None
+        file_name = self._file_name(problem, parameter_set, software,
+                                    minimizer, options)
+        try:
+            with open(file_name, 'rb') as f:
+                result = pickle.load(f)
+        except (IOError, OSError):
+            return None
+        # Entries can be incomplete if a run was killed while writing them
+        # pylint: disable=broad-except
+        except Exception:
+            logger.warning('Ignoring the unreadable cache entry %s.',
+                           file_name)
+            return None
+
+        # Mark the entry as recently used
+        os.utime(file_name, None)
+        result.problem = problem
+        result.options = options
+        return result
+
+    def add(self, parameter_set, software, result):
+        """
+        Store the result of a fit.
+
+        :param parameter_set: The index of the starting values
+        :type parameter_set: int
+        :param software: The software used to fit the problem
+        :type software: str
+        :param result: The result of the fit
+        :type result: fitbenchmarking.utils.fitbm_result.FittingResult
+        """
+        if result.error_flag not in CACHED_FLAGS:
+            return
+        problem, options = result.problem, result.options
+        file_name = self._file_name(problem, parameter_set, software,
+                                    result.minimizer, options)
+        result.problem, result.options = None, None
+        try:
+            record = pickle.dumps(result, protocol=2)
+        finally:
+            result.problem, result.options = problem, options
+
+        # Write to a temporary file first so that a partly written entry is
+        # never read
+        tmp_file_name = '{0}.{1}.tmp'.format(file_name, os.getpid())
+        with open(tmp_file_name, 'wb') as f:
+            f.write(record)
+        # os.rename does not overwrite on Windows, os.replace is python3 only
+        getattr(os, 'replace', os.rename)(tmp_file_name, file_name)
+
+    def evict(self):
+        """
+        Remove entries older than max_age, then the least recently used
+        entries until the cache is smaller than max_size. Files in
+        subdirectories, such as the compiled expressions (see
+        fitbenchmarking.parsing.expression_compiler), are entries too.
+        """
+        entries = []
+        now = time.time()
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                if 0 < self.max_age < (now - stat.st_mtime) / 86400.0:
+                    os.remove(path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+        if self.max_size <= 0:
+            return
+        total_size = sum(e[1] for e in entries)
+        max_bytes = self.max_size * 1024.0**2
+        for _, size, path in sorted(entries):
+            if total_size <= max_bytes:
+                break
+            os.remove(path)
+            total_size -= size
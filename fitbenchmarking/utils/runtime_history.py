@@ -0,0 +1,100 @@
+"""
+Persistent record of the runtimes of previous fits, used to estimate how long
+a fit will take.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+import json
+import os
+
+import numpy as np
+
+from fitbenchmarking.utils.logging_setup import logger
+
+
+class RuntimeHistory(object):
+    """
+    A store of the most recent runtime of each problem, software and
+    minimizer combination, which is saved to a json file between runs.
+    """
+
+    def __init__(self, file_name):
+        """
+        Load the history from a file if it exists.
+
+        :param file_name: The path to the history file
+        :type file_name: str
+        """
+        self.file_name = file_name
+        self._runtimes = {}
+
+        if os.path.isfile(file_name):
+            try:
+                with open(file_name, 'r') as f:
+                    self._runtimes = json.load(f)
+            except ValueError:
+                logger.warning('Could not read the runtime history from %s, '
+                               'it will be overwritten.', file_name)
+
+    @staticmethod
+    def _key(problem_name, software, minimizer):
+        """
+        Create the key used to store a runtime.
+
+        :param problem_name: The name of the problem
+        :type problem_name: str
+        :param software: The software used to fit the problem
+        :type software: str
+        :param minimizer: The minimizer used to fit the problem
+        :type minimizer: str
+
+        :return: The key for the combination
+        :rtype: str
+        """
+        return '{0}|{1}|{2}'.format(problem_name, software, minimizer)
+
+    def get(self, problem_name, software, minimizer):
+        """
+        Get the last recorded runtime for a combination.
+
+        :param problem_name: The name of the problem
+        :type problem_name: str
+        :param software: The software used to fit the problem
+        :type software: str
+        :param minimizer: The minimizer used to fit the problem
+        :type minimizer: str
+
+        :return: The runtime in seconds or None if it has not been recorded
+        :rtype: float or None
+        """
+        return self._runtimes.get(self._key(problem_name, software, minimizer))
+
+    def add(self, problem_name, software, minimizer, runtime):
+        """
+        Record the runtime for a combination.
+        Runtimes from failed fits (inf) are not recorded.
+
+        :param problem_name: The name of the problem
+        :type problem_name: str
+        :param software: The software used to fit the problem
+        :type software: str
+        :param minimizer: The minimizer used to fit the problem
+        :type minimizer: str
+        :param runtime: The runtime of the fit in seconds
+        :type runtime: float
+        """
+        if runtime is None or not np.isfinite(runtime):
+            return
+        self._runtimes[self._key(problem_name, software, minimizer)] = \
+            float(runtime)
+
+    def save(self):
+        """
+        Write the history to its file.
+        """
+        dir_name = os.path.dirname(self.file_name)
+        if dir_name and not os.path.exists(dir_name):
+            os.makedirs(dir_name)
+        with open(self.file_name, 'w') as f:
+            json.dump(self._runtimes, f, indent=1, sort_keys=True)
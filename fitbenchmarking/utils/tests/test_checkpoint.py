@@ -0,0 +1,81 @@
+"""
+Tests for the checkpoint.py file
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from collections import OrderedDict
+import os
+import shutil
+import tempfile
+import unittest
+
+from fitbenchmarking.parsing.fitting_problem import FittingProblem
+from fitbenchmarking.utils.checkpoint import Checkpoint
+from fitbenchmarking.utils.fitbm_result import FittingResult
+from fitbenchmarking.utils.options import Options
+
+
+class CheckpointTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.tmp_dir, 'sub', 'checkpoint.pkl')
+        self.options = Options()
+        self.problem = FittingProblem()
+        self.problem.name = 'prob'
+        self.problem.starting_values = [OrderedDict([('p1', 1.0)])]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_result(self, group_name='group', minimizer='trf'):
+        checkpoint = Checkpoint(self.file_name)
+        checkpoint.start_group(group_name)
+        result = FittingResult(options=self.options, problem=self.problem,
+                               chi_sq=2.0, runtime=1.0, minimizer=minimizer,
+                               error_flag=0)
+        checkpoint.add(parameter_set=0, software='scipy', result=result)
+        return result
+
+    def get_result(self, checkpoint, group_name='group', minimizer='trf'):
+        checkpoint.start_group(group_name)
+        return checkpoint.get(problem=self.problem, parameter_set=0,
+                              software='scipy', minimizer=minimizer,
+                              options=self.options)
+
+    def test_add_keeps_problem(self):
+        result = self.write_result()
+        self.assertIs(result.problem, self.problem)
+        self.assertIs(result.options, self.options)
+
+    def test_resume(self):
+        self.write_result()
+        checkpoint = Checkpoint(self.file_name, resume=True)
+        result = self.get_result(checkpoint)
+        self.assertEqual(result.chi_sq, 2.0)
+        self.assertEqual(result.minimizer, 'trf')
+        self.assertIs(result.problem, self.problem)
+        self.assertIs(result.options, self.options)
+
+    def test_resume_other_fit(self):
+        self.write_result()
+        checkpoint = Checkpoint(self.file_name, resume=True)
+        self.assertIsNone(self.get_result(checkpoint, minimizer='dogbox'))
+        self.assertIsNone(self.get_result(checkpoint, group_name='other'))
+
+    def test_no_resume_clears_file(self):
+        self.write_result()
+        Checkpoint(self.file_name)
+        checkpoint = Checkpoint(self.file_name, resume=True)
+        self.assertIsNone(self.get_result(checkpoint))
+
+    def test_incomplete_record(self):
+        self.write_result()
+        with open(self.file_name, 'ab') as f:
+            f.write(b'\x80\x02(X')
+        checkpoint = Checkpoint(self.file_name, resume=True)
+        self.assertEqual(self.get_result(checkpoint).chi_sq, 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for the convergence_trace.py file
+"""
+
+from __future__ import (absolute_import, division, print_function)
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from fitbenchmarking.parsing.fitting_problem import FittingProblem
+from fitbenchmarking.utils.convergence_trace import ConvergenceTrace
+
+
+class ConvergenceTraceTests(unittest.TestCase):
+
+    def test_not_recording(self):
+        trace = ConvergenceTrace()
+        trace.append(1, 2.0)
+        self.assertEqual(len(trace), 0)
+
+    def test_grows(self):
+        trace = ConvergenceTrace(capacity=2)
+        trace.start()
+        for i in range(5):
+            trace.append(i, 10.0 - i)
+        trace.stop()
+        trace.append(5, 0.0)
+        self.assertEqual(len(trace), 5)
+        np.testing.assert_array_equal(trace.index, np.arange(5))
+        np.testing.assert_array_equal(trace.chi_sq, 10.0 - np.arange(5))
+        self.assertTrue((np.diff(trace.time) >= 0).all())
+
+    def test_start_clears(self):
+        trace = ConvergenceTrace()
+        trace.start()
+        trace.append(1, 2.0)
+        trace.start()
+        self.assertEqual(len(trace), 0)
+
+    def test_best_so_far(self):
+        trace = ConvergenceTrace()
+        trace.start()
+        for i, chi_sq in enumerate([3.0, 4.0, 1.0, 2.0]):
+            trace.append(i, chi_sq)
+        np.testing.assert_array_equal(trace.best_so_far(),
+                                      [3.0, 3.0, 1.0, 1.0])
+
+    def test_best_so_far_not_finite(self):
+        trace = ConvergenceTrace()
+        trace.start()
+        for i, chi_sq in enumerate([np.nan, 4.0, np.inf, np.nan, 2.0]):
+            trace.append(i, chi_sq)
+        np.testing.assert_array_equal(trace.best_so_far(),
+                                      [np.nan, 4.0, 4.0, 4.0, 2.0])
+
+    def test_pickle_and_copy(self):
+        trace = ConvergenceTrace(capacity=100)
+        trace.start()
+        trace.append(1, 2.0)
+        for other in [pickle.loads(pickle.dumps(trace)), trace.copy()]:
+            self.assertEqual(len(other._chi_sq), 1)
+            self.assertFalse(other.recording)
+            np.testing.assert_array_equal(other.chi_sq, [2.0])
+
+    def test_save(self):
+        trace = ConvergenceTrace()
+        trace.start()
+        trace.append(1, 2.0)
+        trace.append(3, 1.5)
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join(tmp_dir, 'trace.csv')
+            trace.save(file_name)
+            saved = np.loadtxt(file_name, delimiter=',')
+        finally:
+            shutil.rmtree(tmp_dir)
+        np.testing.assert_array_equal(saved[:, 0], [1, 3])
+        np.testing.assert_array_equal(saved[:, 2], [2.0, 1.5])
+
+    def test_problem_records_residuals(self):
+        problem = FittingProblem()
+        problem.function = lambda x, p1: x + p1
+        problem.data_x = np.array([1.0, 2.0, 3.0])
+        problem.data_y = np.array([2.0, 3.0, 5.0])
+        problem.trace = ConvergenceTrace()
+        problem.trace.start()
+
+        problem.eval_r(params=[1.0])
+        # The evaluations made to approximate the Jacobian are not recorded
+        problem.eval_j(params=[1.0])
+        problem.eval_r_norm(params=[2.0])
+
+        self.assertEqual(len(problem.trace), 2)
+        np.testing.assert_array_equal(problem.trace.chi_sq, [1.0, 2.0])
+        self.assertEqual(problem.trace.index[0], 1)
+        self.assertEqual(problem.trace.index[1],
+                         problem.eval_counts['eval_f'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,7 @@ import shutil
 import unittest
 
 from fitbenchmarking.utils.create_dirs import (figures, group_results, results,
-                                               support_pages)
+                                               support_pages, traces)
 
 
 class CreateDirsTests(unittest.TestCase):
@@ -72,6 +72,19 @@ class CreateDirsTests(unittest.TestCase):
 
         shutil.rmtree(results_dir)
 
+    def test_traces_create_correct_dir(self):
+
+        results_dir = results(self.results_dir)
+        group_results_dir = group_results(results_dir, "test_group")
+
+        traces_dir = traces(group_results_dir)
+        traces_dir_expected = os.path.join(group_results_dir, 'traces')
+
+        self.assertEqual(traces_dir_expected, traces_dir)
+        self.assertTrue(os.path.exists(traces_dir_expected))
+
+        shutil.rmtree(results_dir)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+"""
+Tests for the fitbm_result.py file
+"""
+
+from __future__ import (absolute_import, division, print_function)
+import unittest
+
+import numpy as np
+
+from fitbenchmarking.utils.convergence_trace import ConvergenceTrace
+from fitbenchmarking.utils.fitbm_result import FittingResult
+from fitbenchmarking.utils.options import Options
+
+
+class TimeToTargetTests(unittest.TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.options.target_tolerance = 0.1
+        self.result = FittingResult(options=self.options, chi_sq=1.0)
+        trace = ConvergenceTrace()
+        trace.start()
+        for i, chi_sq in enumerate([10.0, 2.0, 1.05, 1.0]):
+            trace.append(i + 1, chi_sq)
+        trace._time[:4] = [0.1, 0.2, 0.3, 0.4]
+        self.result.trace = trace
+
+    def test_reached(self):
+        self.result.min_chi_sq = 1.0
+        self.assertEqual(self.result.time_to_target, 0.3)
+        self.assertEqual(self.result.nfev_to_target, 3)
+
+    def test_not_reached(self):
+        self.result.min_chi_sq = 0.5
+        self.assertEqual(self.result.time_to_target, np.inf)
+        self.assertEqual(self.result.nfev_to_target, np.inf)
+
+    def test_no_trace(self):
+        self.result.trace = None
+        self.result.min_chi_sq = 1.0
+        self.assertEqual(self.result.time_to_target, np.inf)
+
+    def test_normalised(self):
+        self.result.min_chi_sq = 1.0
+        self.result.min_time_to_target = 0.15
+        self.result.min_nfev_to_target = 3
+        self.assertAlmostEqual(self.result.norm_time_to_target, 2.0)
+        self.assertEqual(self.result.norm_nfev_to_target, 1.0)
+
+    def test_normalised_not_reached(self):
+        self.result.min_chi_sq = 0.5
+        self.result.min_time_to_target = np.inf
+        self.assertEqual(self.result.norm_time_to_target, np.inf)
+
+
+class MinRuntimeTests(unittest.TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.options.runtime_statistic = 'iqr'
+        self.result = FittingResult(options=self.options)
+
+    def test_single_run(self):
+        """
+        The interquartile range of a single run is zero, so the best runtime
+        can be zero
+        """
+        self.result.runtime = 0.0
+        self.result.min_runtime = 0.0
+        self.assertEqual(self.result.norm_runtime, 1.0)
+
+    def test_zero_min_runtime(self):
+        self.result.runtime = 0.5
+        self.result.min_runtime = 0.0
+        self.assertEqual(self.result.norm_runtime, np.inf)
+
+
+if __name__ == "__main__":
+    unittest.main()
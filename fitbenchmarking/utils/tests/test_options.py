@@ -25,6 +25,15 @@ class OptionsTests(unittest.TestCase):
             num_runs: 2
             software: foo
                       bar
+            timer: process
+            adaptive_runs: yes
+            min_runs: 4
+            max_runs: 50
+            target_ci_width: 0.1
+            timing_budget: 20
+            record_trace: yes
+            mantid_output_workspaces: no
+            jacobian_method: central
 
             [PLOTTING]
             make_plots: no
@@ -34,26 +43,82 @@ class OptionsTests(unittest.TestCase):
             table_type: acc
                         runtime
             results_dir: new_results
+            runtime_statistic: median
+            show_runtime_ci: yes
+            target_tolerance: 0.01
+
+            [EXECUTION]
+            num_workers: 4
+            runtime_history: history.json
+            checkpoint_file: journal.pkl
+            fit_timeout: 30
+            max_tasks_per_worker: 10
+            max_worker_memory: 512
+            use_cache: yes
+            cache_dir: results_cache
+            max_cache_size: 100
+            max_cache_age: 7
             """
         incorrect_config_str = """
             [FITTING]
             use_errors: correct
             num_runs: two
+            timer: sundial
+            adaptive_runs: sometimes
+            min_runs: few
+            max_runs: many
+            target_ci_width: narrow
+            timing_budget: short
+            record_trace: always
+            mantid_output_workspaces: sometimes
             [PLOTTING]
             make_plots: incorrect_falue
+            runtime_statistic: average
+            show_runtime_ci: maybe
+            target_tolerance: close
+            [EXECUTION]
+            num_workers: all
+            fit_timeout: never
+            max_tasks_per_worker: some
+            max_worker_memory: lots
+            use_cache: sometimes
+            max_cache_size: big
+            max_cache_age: old
             """
         opts = {'MINIMIZERS': {'scipy': ['nonesense',
                                          'another_fake_minimizer'],
                                'dfogn': ['test']},
                 'FITTING': {'use_errors': False,
                             'num_runs': 2,
-                            'software': ['foo', 'bar']},
+                            'software': ['foo', 'bar'],
+                            'timer': 'process',
+                            'adaptive_runs': True,
+                            'min_runs': 4,
+                            'max_runs': 50,
+                            'target_ci_width': 0.1,
+                            'timing_budget': 20.0,
+                            'record_trace': True,
+                            'mantid_output_workspaces': False,
+                            'jacobian_method': 'central'},
                 'PLOTTING': {'make_plots': False,
                              'colour_scale': [(17.1, 'b_string?'),
                                               (float('inf'), 'final_string')],
                              'comparison_mode': 'abs',
                              'table_type': ['acc', 'runtime'],
-                             'results_dir': 'new_results'}
+                             'results_dir': 'new_results',
+                             'runtime_statistic': 'median',
+                             'show_runtime_ci': True,
+                             'target_tolerance': 0.01},
+                'EXECUTION': {'num_workers': 4,
+                              'runtime_history': 'history.json',
+                              'checkpoint_file': 'journal.pkl',
+                              'fit_timeout': 30.0,
+                              'max_tasks_per_worker': 10,
+                              'max_worker_memory': 512.0,
+                              'use_cache': True,
+                              'cache_dir': 'results_cache',
+                              'max_cache_size': 100.0,
+                              'max_cache_age': 7.0}
                 }
 
         opts_file = 'test_options_tests_{}.txt'.format(
@@ -73,6 +138,31 @@ class OptionsTests(unittest.TestCase):
         os.remove(self.options_file)
         os.remove(self.options_file_incorrect)
 
+    def check_invalid(self, section, config_str, option=None):
+        """
+        Check that an options file containing only the given options raises
+        an error for the option under test.
+
+        :param section: The section the options are in
+        :type section: str
+        :param config_str: The options, one per line
+        :type config_str: str
+        :param option: The option which is invalid, defaults to the first
+        :type option: str
+        """
+        if option is None:
+            option = config_str.split(':', 1)[0]
+        opts_file = 'test_invalid_options_tests_{}.txt'.format(
+            datetime.datetime.now())
+        with open(opts_file, 'w') as f:
+            f.write('[{0}]\n{1}\n'.format(section, config_str))
+        try:
+            with self.assertRaises(exceptions.OptionsError) as context:
+                Options(file_name=opts_file)
+        finally:
+            os.remove(opts_file)
+        self.assertIn("'{}'".format(option), str(context.exception))
+
     def test_from_file(self):
         options = Options(file_name=self.options_file)
         for key in self.options['MINIMIZERS']:
@@ -114,6 +204,26 @@ class OptionsTests(unittest.TestCase):
         plotting_opts = self.options['PLOTTING']
         self.assertEqual(plotting_opts['make_plots'], options.make_plots)
 
+    def test_runtime_statistic_invalid_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_runtime_statistic_valid_value(self):
+        options = Options(file_name=self.options_file)
+        plotting_opts = self.options['PLOTTING']
+        self.assertEqual(plotting_opts['runtime_statistic'],
+                         options.runtime_statistic)
+
+    def test_show_runtime_ci_non_bool_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_show_runtime_ci_bool_value(self):
+        options = Options(file_name=self.options_file)
+        plotting_opts = self.options['PLOTTING']
+        self.assertEqual(plotting_opts['show_runtime_ci'],
+                         options.show_runtime_ci)
+
     def test_use_errors_false(self):
         with self.assertRaises(exceptions.OptionsError):
             Options(file_name=self.options_file_incorrect)
@@ -132,6 +242,193 @@ class OptionsTests(unittest.TestCase):
         plotting_opts = self.options['FITTING']
         self.assertEqual(plotting_opts['num_runs'], options.num_runs)
 
+    def test_timer_invalid_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_timer_valid_value(self):
+        options = Options(file_name=self.options_file)
+        fitting_opts = self.options['FITTING']
+        self.assertEqual(fitting_opts['timer'], options.timer)
+
+    def test_adaptive_runs_non_bool_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_adaptive_runs_bool_value(self):
+        options = Options(file_name=self.options_file)
+        fitting_opts = self.options['FITTING']
+        self.assertEqual(fitting_opts['adaptive_runs'], options.adaptive_runs)
+
+    def test_min_runs_non_int_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_min_runs_too_small(self):
+        self.check_invalid('FITTING', 'min_runs: 0')
+
+    def test_min_runs_int_value(self):
+        options = Options(file_name=self.options_file)
+        fitting_opts = self.options['FITTING']
+        self.assertEqual(fitting_opts['min_runs'], options.min_runs)
+
+    def test_max_runs_non_int_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_max_runs_less_than_min_runs(self):
+        self.check_invalid('FITTING', 'min_runs: 10\nmax_runs: 5',
+                           'max_runs')
+
+    def test_max_runs_int_value(self):
+        options = Options(file_name=self.options_file)
+        fitting_opts = self.options['FITTING']
+        self.assertEqual(fitting_opts['max_runs'], options.max_runs)
+
+    def test_target_ci_width_non_float_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_target_ci_width_float_value(self):
+        options = Options(file_name=self.options_file)
+        fitting_opts = self.options['FITTING']
+        self.assertEqual(fitting_opts['target_ci_width'],
+                         options.target_ci_width)
+
+    def test_timing_budget_non_float_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_timing_budget_float_value(self):
+        options = Options(file_name=self.options_file)
+        fitting_opts = self.options['FITTING']
+        self.assertEqual(fitting_opts['timing_budget'], options.timing_budget)
+
+    def test_record_trace_non_bool_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_record_trace_bool_value(self):
+        options = Options(file_name=self.options_file)
+        fitting_opts = self.options['FITTING']
+        self.assertEqual(fitting_opts['record_trace'], options.record_trace)
+
+    def test_mantid_output_workspaces_non_bool_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_mantid_output_workspaces_bool_value(self):
+        options = Options(file_name=self.options_file)
+        fitting_opts = self.options['FITTING']
+        self.assertEqual(fitting_opts['mantid_output_workspaces'],
+                         options.mantid_output_workspaces)
+
+    def test_jacobian_method_invalid_value(self):
+        self.check_invalid('FITTING', 'jacobian_method: backward')
+
+    def test_jacobian_method_valid_value(self):
+        options = Options(file_name=self.options_file)
+        fitting_opts = self.options['FITTING']
+        self.assertEqual(fitting_opts['jacobian_method'],
+                         options.jacobian_method)
+
+    def test_target_tolerance_non_float_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_target_tolerance_float_value(self):
+        options = Options(file_name=self.options_file)
+        plotting_opts = self.options['PLOTTING']
+        self.assertEqual(plotting_opts['target_tolerance'],
+                         options.target_tolerance)
+
+    def test_num_workers_non_int_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_num_workers_too_small(self):
+        self.check_invalid('EXECUTION', 'num_workers: 0')
+
+    def test_num_workers_int_value(self):
+        options = Options(file_name=self.options_file)
+        execution_opts = self.options['EXECUTION']
+        self.assertEqual(execution_opts['num_workers'], options.num_workers)
+
+    def test_runtime_history(self):
+        options = Options(file_name=self.options_file)
+        execution_opts = self.options['EXECUTION']
+        self.assertEqual(execution_opts['runtime_history'],
+                         options.runtime_history)
+
+    def test_checkpoint_file(self):
+        options = Options(file_name=self.options_file)
+        execution_opts = self.options['EXECUTION']
+        self.assertEqual(execution_opts['checkpoint_file'],
+                         options.checkpoint_file)
+
+    def test_fit_timeout_non_float_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_fit_timeout_float_value(self):
+        options = Options(file_name=self.options_file)
+        execution_opts = self.options['EXECUTION']
+        self.assertEqual(execution_opts['fit_timeout'], options.fit_timeout)
+
+    def test_max_tasks_per_worker_non_int_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_max_tasks_per_worker_int_value(self):
+        options = Options(file_name=self.options_file)
+        execution_opts = self.options['EXECUTION']
+        self.assertEqual(execution_opts['max_tasks_per_worker'],
+                         options.max_tasks_per_worker)
+
+    def test_max_worker_memory_non_float_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_max_worker_memory_float_value(self):
+        options = Options(file_name=self.options_file)
+        execution_opts = self.options['EXECUTION']
+        self.assertEqual(execution_opts['max_worker_memory'],
+                         options.max_worker_memory)
+
+    def test_use_cache_non_bool_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_use_cache_bool_value(self):
+        options = Options(file_name=self.options_file)
+        execution_opts = self.options['EXECUTION']
+        self.assertEqual(execution_opts['use_cache'], options.use_cache)
+
+    def test_cache_dir(self):
+        options = Options(file_name=self.options_file)
+        execution_opts = self.options['EXECUTION']
+        self.assertEqual(execution_opts['cache_dir'], options.cache_dir)
+
+    def test_max_cache_size_non_float_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_max_cache_size_float_value(self):
+        options = Options(file_name=self.options_file)
+        execution_opts = self.options['EXECUTION']
+        self.assertEqual(execution_opts['max_cache_size'],
+                         options.max_cache_size)
+
+    def test_max_cache_age_non_float_value(self):
+        with self.assertRaises(exceptions.OptionsError):
+            Options(file_name=self.options_file_incorrect)
+
+    def test_max_cache_age_float_value(self):
+        options = Options(file_name=self.options_file)
+        execution_opts = self.options['EXECUTION']
+        self.assertEqual(execution_opts['max_cache_age'],
+                         options.max_cache_age)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,171 @@
+"""
+Tests for the result_cache.py file
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from collections import OrderedDict
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from fitbenchmarking.parsing.fitting_problem import FittingProblem
+from fitbenchmarking.utils.fitbm_result import FittingResult
+from fitbenchmarking.utils.options import Options
+from fitbenchmarking.utils.result_cache import ResultCache, problem_hash
+
+
+def make_problem():
+    """
+    Create a minimal problem.
+    """
+    problem = FittingProblem()
+    problem.name = 'prob'
+    problem.equation = 'a*x'
+    problem.starting_values = [OrderedDict([('a', 1.0)])]
+    problem.data_x = np.array([1.0, 2.0, 3.0])
+    problem.data_y = np.array([2.0, 4.0, 6.0])
+    return problem
+
+
+class ProblemHashTests(unittest.TestCase):
+
+    def test_same_problem(self):
+        self.assertEqual(problem_hash(make_problem()),
+                         problem_hash(make_problem()))
+
+    def test_changed_data(self):
+        problem = make_problem()
+        problem.data_y[1] = 5.0
+        self.assertNotEqual(problem_hash(make_problem()),
+                            problem_hash(problem))
+
+    def test_changed_starting_values(self):
+        problem = make_problem()
+        problem.starting_values[0]['a'] = 2.0
+        self.assertNotEqual(problem_hash(make_problem()),
+                            problem_hash(problem))
+
+    def test_changed_mantid_equation(self):
+        problem = make_problem()
+        problem._mantid_equation = 'name=LinearBackground, A0=0, A1=1, ' \
+            'ties=(A0=0)'
+        other = make_problem()
+        other._mantid_equation = 'name=LinearBackground, A0=0, A1=1'
+        self.assertNotEqual(problem_hash(other), problem_hash(problem))
+
+
+class ResultCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.options = Options()
+        self.problem = make_problem()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def add_result(self, cache, minimizer='trf', error_flag=0):
+        result = FittingResult(options=self.options, problem=self.problem,
+                               chi_sq=2.0, runtime=1.0, minimizer=minimizer,
+                               error_flag=error_flag)
+        cache.add(parameter_set=0, software='scipy', result=result)
+        return result
+
+    def get_result(self, cache, minimizer='trf'):
+        return cache.get(problem=self.problem, parameter_set=0,
+                         software='scipy', minimizer=minimizer,
+                         options=self.options)
+
+    def test_add_and_get(self):
+        self.add_result(ResultCache(self.cache_dir))
+        result = self.get_result(ResultCache(self.cache_dir))
+        self.assertEqual(result.chi_sq, 2.0)
+        self.assertIs(result.problem, self.problem)
+        self.assertIs(result.options, self.options)
+
+    def test_other_minimizer(self):
+        cache = ResultCache(self.cache_dir)
+        self.add_result(cache)
+        self.assertIsNone(self.get_result(cache, minimizer='dogbox'))
+
+    def test_changed_options(self):
+        cache = ResultCache(self.cache_dir)
+        self.add_result(cache)
+        self.options.num_runs += 1
+        self.assertIsNone(self.get_result(cache))
+
+    def test_changed_jacobian_method(self):
+        cache = ResultCache(self.cache_dir)
+        self.add_result(cache)
+        self.options.jacobian_method = 'central'
+        self.assertIsNone(self.get_result(cache))
+
+    def test_changed_fit_timeout(self):
+        cache = ResultCache(self.cache_dir)
+        self.add_result(cache)
+        self.options.fit_timeout += 10
+        self.assertIsNone(self.get_result(cache))
+
+    def test_changed_mantid_output_workspaces(self):
+        cache = ResultCache(self.cache_dir)
+        self.add_result(cache)
+        self.options.mantid_output_workspaces = \
+            not self.options.mantid_output_workspaces
+        self.assertIsNone(self.get_result(cache))
+
+    def test_failed_fit_not_cached(self):
+        cache = ResultCache(self.cache_dir)
+        self.add_result(cache, error_flag=3)
+        self.assertIsNone(self.get_result(cache))
+
+    def test_force_recompute(self):
+        self.add_result(ResultCache(self.cache_dir))
+        cache = ResultCache(self.cache_dir, force_recompute=True)
+        self.assertIsNone(self.get_result(cache))
+
+    def test_evict_by_age(self):
+        self.add_result(ResultCache(self.cache_dir))
+        file_name = os.path.join(self.cache_dir,
+                                 os.listdir(self.cache_dir)[0])
+        two_days_ago = time.time() - 2 * 86400
+        os.utime(file_name, (two_days_ago, two_days_ago))
+
+        cache = ResultCache(self.cache_dir, max_age=1)
+        self.assertIsNone(self.get_result(cache))
+
+    def test_evict_by_size(self):
+        cache = ResultCache(self.cache_dir)
+        self.add_result(cache, minimizer='trf')
+        self.add_result(cache, minimizer='dogbox')
+        trf_file = cache._file_name(self.problem, 0, 'scipy', 'trf',
+                                    self.options)
+        entry_size = os.path.getsize(trf_file)
+        # Make the trf result the least recently used
+        an_hour_ago = time.time() - 3600
+        os.utime(trf_file, (an_hour_ago, an_hour_ago))
+
+        cache = ResultCache(self.cache_dir,
+                            max_size=1.5 * entry_size / 1024.0**2)
+        self.assertIsNone(self.get_result(cache, minimizer='trf'))
+        self.assertIsNotNone(self.get_result(cache, minimizer='dogbox'))
+
+    def test_evict_subdirectory(self):
+        plan_dir = os.path.join(self.cache_dir, 'expressions')
+        os.makedirs(plan_dir)
+        file_name = os.path.join(plan_dir, 'plan.json')
+        with open(file_name, 'w') as f:
+            f.write('{}')
+        two_days_ago = time.time() - 2 * 86400
+        os.utime(file_name, (two_days_ago, two_days_ago))
+
+        ResultCache(self.cache_dir, max_age=1)
+        self.assertFalse(os.path.exists(file_name))
+
+
+if __name__ == "__main__":
+    unittest.main()
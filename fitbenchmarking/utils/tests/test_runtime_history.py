@@ -0,0 +1,54 @@
+"""
+Tests for the runtime_history.py file
+"""
+
+from __future__ import (absolute_import, division, print_function)
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from fitbenchmarking.utils.runtime_history import RuntimeHistory
+
+
+class RuntimeHistoryTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.tmp_dir, 'sub', 'history.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_missing_entry(self):
+        history = RuntimeHistory(self.file_name)
+        self.assertIsNone(history.get('prob', 'scipy', 'trf'))
+
+    def test_save_and_load(self):
+        history = RuntimeHistory(self.file_name)
+        history.add('prob', 'scipy', 'trf', 0.5)
+        history.add('prob', 'scipy', 'lm-scipy', 0.25)
+        history.save()
+
+        loaded = RuntimeHistory(self.file_name)
+        self.assertEqual(loaded.get('prob', 'scipy', 'trf'), 0.5)
+        self.assertEqual(loaded.get('prob', 'scipy', 'lm-scipy'), 0.25)
+
+    def test_failed_runtime_not_recorded(self):
+        history = RuntimeHistory(self.file_name)
+        history.add('prob', 'scipy', 'trf', 0.5)
+        history.add('prob', 'scipy', 'trf', np.inf)
+        self.assertEqual(history.get('prob', 'scipy', 'trf'), 0.5)
+
+    def test_corrupt_file(self):
+        os.makedirs(os.path.dirname(self.file_name))
+        with open(self.file_name, 'w') as f:
+            f.write('{not json')
+        history = RuntimeHistory(self.file_name)
+        self.assertIsNone(history.get('prob', 'scipy', 'trf'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Tests for the timing.py file
+"""
+
+from __future__ import (absolute_import, division, print_function)
+import time
+import unittest
+
+import numpy as np
+
+from fitbenchmarking.utils import timing
+from fitbenchmarking.utils.options import Options
+
+
+class TimeCallTests(unittest.TestCase):
+
+    def test_sleep(self):
+        timings = timing.time_call(lambda: time.sleep(0.05))
+        self.assertEqual(sorted(timings), ['process', 'thread', 'wall'])
+        self.assertGreaterEqual(timings['wall'], 0.05)
+        # Sleeping does not use CPU time
+        self.assertLess(timings['process'], 0.04)
+
+    def test_busy(self):
+        def busy():
+            start = time.time()
+            while time.time() - start < 0.05:
+                pass
+        timings = timing.time_call(busy)
+        self.assertGreater(timings['process'], 0.02)
+        self.assertGreater(timings['thread'], 0.02)
+
+
+class ConfidenceIntervalTests(unittest.TestCase):
+
+    def test_interval(self):
+        low, high = timing.confidence_interval([1.0, 2.0, 3.0])
+        # t(0.975, 2) = 4.3027, standard error = 1/sqrt(3)
+        half_width = 4.302653 / np.sqrt(3)
+        self.assertAlmostEqual(low, 2.0 - half_width, places=5)
+        self.assertAlmostEqual(high, 2.0 + half_width, places=5)
+
+    def test_single_runtime(self):
+        low, high = timing.confidence_interval([1.0])
+        self.assertTrue(np.isnan(low))
+        self.assertTrue(np.isnan(high))
+
+    def test_relative_width(self):
+        self.assertAlmostEqual(
+            timing.relative_width((0.9, 1.1), [1.0, 1.0]), 0.2)
+
+    def test_relative_width_undefined(self):
+        self.assertEqual(timing.relative_width((np.nan, np.nan), [1.0]),
+                         np.inf)
+
+
+class SummariseTests(unittest.TestCase):
+
+    def setUp(self):
+        self.runtimes = [4.0, 1.0, 2.0, 3.0, 100.0]
+
+    def test_mean(self):
+        self.assertEqual(timing.summarise(self.runtimes, 'mean'), 22.0)
+
+    def test_median(self):
+        self.assertEqual(timing.summarise(self.runtimes, 'median'), 3.0)
+
+    def test_min(self):
+        self.assertEqual(timing.summarise(self.runtimes, 'min'), 1.0)
+
+    def test_iqr(self):
+        self.assertEqual(timing.summarise(self.runtimes, 'iqr'), 2.0)
+
+
+class RunsFinishedTests(unittest.TestCase):
+
+    def setUp(self):
+        self.options = Options()
+        self.options.num_runs = 3
+        self.options.adaptive_runs = True
+        self.options.min_runs = 3
+        self.options.max_runs = 10
+        self.options.target_ci_width = 0.05
+        self.options.timing_budget = 60
+
+    def test_fixed_runs(self):
+        self.options.adaptive_runs = False
+        self.assertFalse(timing.runs_finished([1.0, 1.0], 0, self.options))
+        self.assertTrue(timing.runs_finished([1.0] * 3, 0, self.options))
+
+    def test_min_runs(self):
+        self.assertFalse(timing.runs_finished([1.0, 1.0], 0, self.options))
+
+    def test_narrow_interval(self):
+        runtimes = [1.0, 1.001, 0.999]
+        self.assertTrue(timing.runs_finished(runtimes, 0, self.options))
+
+    def test_wide_interval(self):
+        runtimes = [1.0, 2.0, 3.0]
+        self.assertFalse(timing.runs_finished(runtimes, 0, self.options))
+
+    def test_max_runs(self):
+        runtimes = [1.0, 2.0] * 5
+        self.assertTrue(timing.runs_finished(runtimes, 0, self.options))
+
+    def test_timing_budget(self):
+        self.assertFalse(timing.runs_finished([], 100, self.options))
+        self.assertTrue(timing.runs_finished([50.0, 50.0], 100,
+                                             self.options))
+
+
+if __name__ == "__main__":
+    unittest.main()
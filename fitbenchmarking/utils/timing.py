@@ -0,0 +1,193 @@
+"""
+Functions for timing fits, deciding how many times to repeat a fit when
+timing it, and for summarising the runtimes.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+from collections import OrderedDict
+import gc
+import time
+import timeit
+
+import numpy as np
+from scipy import stats
+
+
+def _clock_ns(name, fallback):
+    """
+    Get a clock which returns the time in nanoseconds.
+
+    :param name: The name of the clock in the time module, the nanosecond
+                 version (name + '_ns') is used if it is available
+    :type name: str
+    :param fallback: A clock returning seconds, used if the time module does
+                     not have the clock (python < 3.7)
+    :type fallback: callable
+
+    :return: The clock
+    :rtype: callable
+    """
+    clock = getattr(time, name + '_ns', None)
+    if clock is not None:
+        return clock
+    clock = getattr(time, name, fallback)
+    return lambda: clock() * 1e9
+
+
+_WALL_CLOCK = _clock_ns('perf_counter', timeit.default_timer)
+# time.clock is the process time on Unix in python 2
+_PROCESS_CLOCK = _clock_ns('process_time', getattr(time, 'clock', None))
+_THREAD_CLOCK = _clock_ns('thread_time', _PROCESS_CLOCK)
+
+# The clocks which are recorded for each fit:
+# wall - elapsed real time
+# process - CPU time of all threads in the process
+# thread - CPU time of the thread running the fit
+TIMERS = OrderedDict([('wall', _WALL_CLOCK),
+                      ('process', _PROCESS_CLOCK),
+                      ('thread', _THREAD_CLOCK)])
+
+# The confidence level of the runtime confidence intervals
+CONFIDENCE_LEVEL = 0.95
+
+
+def _iqr(runtime_list):
+    """
+    Get the interquartile range of the runtimes.
+
+    :param runtime_list: The runtimes
+    :type runtime_list: list of float
+
+    :return: The interquartile range
+    :rtype: float
+    """
+    return np.subtract(*np.percentile(runtime_list, [75, 25]))
+
+
+# The statistics which can be used to summarise the runtimes of a fit
+RUNTIME_STATISTICS = {'mean': np.mean,
+                      'median': np.median,
+                      'min': np.min,
+                      'iqr': _iqr}
+
+
+def time_call(func):
+    """
+    Call a function and time it with each of the TIMERS.
+    As in timeit, garbage collection is disabled while timing.
+
+    :param func: The function to time
+    :type func: callable
+
+    :return: The time taken in seconds for each timer
+    :rtype: dict
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        # The wall clock is read closest to the call
+        start_process = _PROCESS_CLOCK()
+        start_thread = _THREAD_CLOCK()
+        start_wall = _WALL_CLOCK()
+        func()
+        end_wall = _WALL_CLOCK()
+        end_thread = _THREAD_CLOCK()
+        end_process = _PROCESS_CLOCK()
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {'wall': (end_wall - start_wall) * 1e-9,
+            'process': (end_process - start_process) * 1e-9,
+            'thread': (end_thread - start_thread) * 1e-9}
+
+
+def summarise(runtime_list, statistic):
+    """
+    Reduce the runtimes of a fit to a single value.
+
+    :param runtime_list: The runtime of each fit
+    :type runtime_list: list of float
+    :param statistic: The statistic to use, one of RUNTIME_STATISTICS
+    :type statistic: str
+
+    :return: The summarised runtime
+    :rtype: float
+    """
+    return float(RUNTIME_STATISTICS[statistic](runtime_list))
+
+
+def confidence_interval(runtime_list):
+    """
+    Calculate the confidence interval of the mean runtime, using the
+    t-distribution.
+
+    :param runtime_list: The runtime of each fit
+    :type runtime_list: list of float
+
+    :return: The lower and upper bound of the interval, which are nan if
+             there are fewer than two runtimes
+    :rtype: tuple(float, float)
+    """
+    n = len(runtime_list)
+    if n < 2:
+        return np.nan, np.nan
+    mean = np.mean(runtime_list)
+    sem = np.std(runtime_list, ddof=1) / np.sqrt(n)
+    half_width = stats.t.ppf(0.5 + CONFIDENCE_LEVEL / 2, n - 1) * sem
+    return float(mean - half_width), float(mean + half_width)
+
+
+def relative_width(interval, runtime_list):
+    """
+    Calculate the width of a confidence interval relative to the mean.
+
+    :param interval: The lower and upper bound of the interval
+    :type interval: tuple(float, float)
+    :param runtime_list: The runtime of each fit
+    :type runtime_list: list of float
+
+    :return: The relative width, inf if it cannot be calculated
+    :rtype: float
+    """
+    mean = np.mean(runtime_list) if runtime_list else 0.0
+    width = interval[1] - interval[0]
+    if mean <= 0 or not np.isfinite(width):
+        return np.inf
+    return width / mean
+
+
+def runs_finished(runtime_list, elapsed, options):
+    """
+    Decide whether a fit has been repeated enough times.
+
+    With a fixed number of runs this is options.num_runs. With adaptive runs
+    the fit is repeated until the relative width of the confidence interval
+    is below options.target_ci_width, bounded by options.min_runs and
+    options.max_runs. Once options.timing_budget seconds have been spent no
+    more runs are started.
+
+    :param runtime_list: The runtime of each fit so far
+    :type runtime_list: list of float
+    :param elapsed: The total time spent so far, including the setup of each
+                    fit
+    :type elapsed: float
+    :param options: all the information specified by the user
+    :type options: fitbenchmarking.utils.options.Options
+
+    :return: Whether to stop repeating the fit
+    :rtype: bool
+    """
+    n = len(runtime_list)
+    if not options.adaptive_runs:
+        return n >= options.num_runs
+    if n == 0:
+        return False
+    if n >= options.max_runs:
+        return True
+    if 0 < options.timing_budget <= elapsed:
+        return True
+    if n < options.min_runs:
+        return False
+    interval = confidence_interval(runtime_list)
+    return relative_width(interval, runtime_list) <= options.target_ci_width